@@ -1,7 +1,7 @@
 from django.contrib import admin
 from import_export.admin import ImportExportModelAdmin
 
-from configuration.models import GraphImage
+from configuration.models import GraphImage, OutboxEmail
 
 
 # Register your models here.
@@ -12,3 +12,12 @@ class GraphImagesAdmin(ImportExportModelAdmin):
 
 
 admin.site.register(GraphImage, GraphImagesAdmin)
+
+
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ("subject", "recipient", "status", "attempts", "created_at", "sent_at")
+    list_filter = ("status",)
+    readonly_fields = ("attempts", "last_error", "created_at", "sent_at")
+
+
+admin.site.register(OutboxEmail, OutboxEmailAdmin)
@@ -1,6 +1,88 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_save, post_delete, m2m_changed
+
+# Models whose changes affect the graphs data, for both sites
+DATASET_MODELS = [
+    "studies.Study",
+    "studies.Experiment",
+    "studies.FindingTag",
+    "studies.Interpretation",
+    "studies.Sample",
+    "studies.Stimulus",
+    "studies.Task",
+    "studies.Measure",
+    "studies.ConsciousnessMeasure",
+    "uncontrast_studies.UnConExperiment",
+    "uncontrast_studies.UnConFinding",
+    "uncontrast_studies.UnConSample",
+    "uncontrast_studies.UnConTask",
+    "uncontrast_studies.UnConSuppressedStimulus",
+    "uncontrast_studies.UnConTargetStimulus",
+    "uncontrast_studies.UnConsciousnessMeasure",
+    "uncontrast_studies.UnConProcessingDomain",
+    "uncontrast_studies.UnConSuppressionMethod",
+]
+
+# The relations that are edited with add / remove, without saving their owner
+DATASET_M2M_FIELDS = [
+    ("studies.Experiment", "techniques"),
+    ("studies.Experiment", "paradigms"),
+    ("studies.Experiment", "theory_driven_theories"),
+    ("studies.FindingTag", "AAL_atlas_tags"),
+]
+
+# The options the configuration endpoints serve, also the names the graphs break down by
+CONFIGURATION_MODELS = [
+    "configuration.GraphImage",
+    "studies.Technique",
+    "studies.Theory",
+    "studies.Paradigm",
+    "studies.FindingTagType",
+    "studies.FindingTagFamily",
+    "studies.AALAtlasTag",
+    "studies.MeasureType",
+    "studies.TaskType",
+    "studies.ConsciousnessMeasureType",
+    "studies.ConsciousnessMeasurePhaseType",
+    "studies.ModalityType",
+    "studies.StimulusCategory",
+    "studies.StimulusSubCategory",
+    "uncontrast_studies.UnConSpecificParadigm",
+    "uncontrast_studies.UnConMainParadigm",
+    "uncontrast_studies.UnConsciousnessMeasurePhase",
+    "uncontrast_studies.UnConsciousnessMeasureType",
+    "uncontrast_studies.UnConsciousnessMeasureSubType",
+    "uncontrast_studies.UnConTaskType",
+    "uncontrast_studies.UnConModalityType",
+    "uncontrast_studies.UnConStimulusCategory",
+    "uncontrast_studies.UnConStimulusSubCategory",
+    "uncontrast_studies.UnConProcessingMainDomain",
+    "uncontrast_studies.UnConSuppressionMethodType",
+    "uncontrast_studies.UnConSuppressionMethodSubType",
+    "uncontrast_studies.UnConOutcome",
+]
+
+
+def bump_dataset_version(sender, instance, **kwargs):
+    # Imported here because else it would run before the models are ready
+    from configuration.models import DatasetVersion
+
+    DatasetVersion.bump()
+
+
+def bump_dataset_version_via_m2m(sender, instance, action, **kwargs):
+    if action in ["post_add", "post_remove", "post_clear"]:
+        bump_dataset_version(sender, instance, **kwargs)
 
 
 class ConfigurationConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "configuration"
+
+    def ready(self):
+        for model in DATASET_MODELS + CONFIGURATION_MODELS:
+            post_save.connect(receiver=bump_dataset_version, sender=model)
+            post_delete.connect(receiver=bump_dataset_version, sender=model)
+        for model, field_name in DATASET_M2M_FIELDS:
+            through_model = getattr(self.apps.get_model(model), field_name).through
+            m2m_changed.connect(receiver=bump_dataset_version_via_m2m, sender=through_model)
@@ -0,0 +1,54 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from configuration.models import DatasetVersion
+from contrast_api.technical_services.graphs_benchmark import run_graphs_benchmark
+from studies.models import Experiment
+from uncontrast_studies.models import UnConExperiment
+
+
+class Command(BaseCommand):
+    help = (
+        "Run every registered graph processor and breakdown against the current data (see generate_synthetic_corpus), "
+        "and write their p50/p95 latency and queries count to a JSON file to diff between commits"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", type=str, default="graphs_benchmark.json")
+        parser.add_argument("--sites", nargs="+", choices=["contrast", "uncontrast"], default=["contrast", "uncontrast"])
+        parser.add_argument("--graphs", nargs="+", default=None, help="Only these graph types")
+        parser.add_argument("--repeat", type=int, default=5, help="Measured runs per graph")
+        parser.add_argument("--warmup", type=int, default=1, help="Unmeasured runs per graph, to warm the caches")
+
+    def handle(self, *args, **options):
+        results = run_graphs_benchmark(
+            options["sites"],
+            repeat=options["repeat"],
+            warmup=options["warmup"],
+            graphs=options["graphs"],
+            report=self.stdout.write,
+        )
+        report = dict(
+            corpus=dict(
+                contrast_experiments=Experiment.objects.count(),
+                uncontrast_experiments=UnConExperiment.objects.count(),
+                dataset_version=DatasetVersion.current(),
+                database_vendor=connection.vendor,
+            ),
+            settings=dict(
+                GRAPHS_USE_EXPERIMENT_FACTS=settings.GRAPHS_USE_EXPERIMENT_FACTS,
+                GRAPHS_USE_FREE_QUERIES_SNAPSHOT=settings.GRAPHS_USE_FREE_QUERIES_SNAPSHOT,
+            ),
+            repeat=options["repeat"],
+            graphs=results,
+        )
+        with open(options["output"], "w") as output_file:
+            json.dump(report, output_file, indent=2, sort_keys=True)
+
+        failed = [key for key, result in results.items() if "error" in result]
+        if failed:
+            self.stdout.write(self.style.WARNING(f"{len(failed)} graphs failed: {', '.join(failed)}"))
+        self.stdout.write(self.style.SUCCESS(f"{len(results)} graphs benchmarked, written to {options['output']}"))
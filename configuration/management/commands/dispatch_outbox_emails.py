@@ -0,0 +1,41 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from contrast_api.technical_services.email import OutboxDispatcher
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Send the pending emails of the outbox in batches, retrying failed ones with backoff"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep polling the outbox instead of exiting")
+        parser.add_argument("--interval", type=float, default=None, help="Seconds to wait when the outbox is empty")
+        parser.add_argument("--batch-size", type=int, default=None)
+
+    def handle(self, *args, **options):
+        dispatcher = OutboxDispatcher(batch_size=options["batch_size"])
+        interval = options["interval"] or settings.EMAIL_OUTBOX_POLL_INTERVAL
+        while True:
+            # as done around each request, else a connection the database dropped would fail every later poll
+            close_old_connections()
+            try:
+                handled = dispatcher.dispatch_batch()
+            except Exception:
+                # e.g. the database is unreachable, the batch's transaction is rolled back and retried on the next poll
+                if not options["loop"]:
+                    raise
+                logger.exception("Failing to dispatch an outbox batch")
+                time.sleep(interval)
+                continue
+            if handled:
+                self.stdout.write(f"Handled {handled} outbox emails")
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(interval)
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from studies.models import Study
+from studies.services.synthetic_corpus_svc import SYNTHETIC_DOI_PREFIX, generate_contrast_corpus
+from uncontrast_studies.services.synthetic_corpus_svc import generate_uncon_corpus
+
+
+class Command(BaseCommand):
+    help = "Generate approved synthetic ConTraSt and UnConTrust corpora for benchmarking, e.g. 1000, 10000 or 100000"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--contrast", type=int, default=1000, help="Number of ConTraSt experiments")
+        parser.add_argument("--uncontrast", type=int, default=1000, help="Number of UnConTrust experiments")
+        parser.add_argument("--seed", type=int, default=0, help="The same seed generates the same corpus")
+        parser.add_argument("--batch-size", type=int, default=500, help="Experiments per bulk insert transaction")
+        parser.add_argument("--clear", action="store_true", help="Delete previously generated synthetic studies first")
+
+    def handle(self, *args, **options):
+        synthetic_studies = Study.objects.filter(DOI__startswith=SYNTHETIC_DOI_PREFIX)
+        if options["clear"]:
+            deleted, _ = synthetic_studies.delete()
+            self.stdout.write(f"Deleted {deleted} synthetic rows")
+        elif synthetic_studies.exists():
+            raise CommandError("Synthetic studies already exist, use --clear to replace them")
+
+        if options["contrast"]:
+            experiment_ids = generate_contrast_corpus(
+                options["contrast"], options["seed"], options["batch_size"], report=self.stdout.write
+            )
+            self.stdout.write(self.style.SUCCESS(f"Generated {len(experiment_ids)} contrast experiments"))
+        if options["uncontrast"]:
+            experiment_ids = generate_uncon_corpus(
+                options["uncontrast"], options["seed"], options["batch_size"], report=self.stdout.write
+            )
+            self.stdout.write(self.style.SUCCESS(f"Generated {len(experiment_ids)} uncontrast experiments"))
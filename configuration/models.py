@@ -1,7 +1,67 @@
 from django.db import models
+from django.db.models import F
+from django.utils import timezone
+
+from contrast_api.choices import OutboxEmailStatusChoices
 
 
 # Create your models here.
 class GraphImage(models.Model):
     key = models.CharField(max_length=50, null=False, blank=False, unique=True)
     image = models.FileField(upload_to="graph_images/")
+
+
+class DatasetVersion(models.Model):
+    """
+    Single row counter, bumped whenever data feeding the graphs might have changed
+    Cached graph responses are keyed by it, so a bump makes all older entries unreachable across all workers
+    """
+
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    SINGLETON_ID = 1
+
+    def __str__(self):
+        return f"dataset version {self.version}"
+
+    @classmethod
+    def get(cls) -> "DatasetVersion":
+        instance, created = cls.objects.get_or_create(id=cls.SINGLETON_ID)
+        return instance
+
+    @classmethod
+    def current(cls) -> int:
+        return cls.get().version
+
+    @classmethod
+    def bump(cls):
+        updated = cls.objects.filter(id=cls.SINGLETON_ID).update(version=F("version") + 1, updated_at=timezone.now())
+        if not updated:
+            cls.objects.get_or_create(id=cls.SINGLETON_ID, defaults=dict(version=1))
+
+
+class OutboxEmail(models.Model):
+    """
+    Emails are written here in the transaction that triggers them, and sent by the dispatch_outbox_emails worker
+    so an email is sent only if its transaction committed, and requests never wait on the mail provider
+    """
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "next_attempt_at"], name="outbox_email_due_idx")]
+
+    recipient = models.EmailField()
+    from_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    html_text = models.TextField()
+    status = models.CharField(
+        choices=OutboxEmailStatusChoices.choices, default=OutboxEmailStatusChoices.PENDING, max_length=10
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.subject} to {self.recipient} ({self.status})"
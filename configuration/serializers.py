@@ -13,7 +13,6 @@ from studies.models import (
     ConsciousnessMeasurePhaseType,
     ConsciousnessMeasureType,
     TaskType,
-    Author,
 )
 from studies.models.finding_tag import AALAtlasTag
 from studies.models.stimulus import StimulusSubCategory, ModalityType, StimulusCategory
@@ -89,12 +88,6 @@ class StimulusSubCategorySerializer(serializers.ModelSerializer):
         fields = ("name", "parent", "id")
 
 
-class ConfigurationAuthorSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Author
-        fields = ("name", "id")
-
-
 class TaskTypeSerializer(serializers.ModelSerializer):
     class Meta:
         model = TaskType
@@ -173,7 +166,6 @@ class UnConStimulusSubCategorySerializer(serializers.ModelSerializer):
 
 
 class UnConStudiesConfigurationSerializer(serializers.Serializer):
-    available_authors = ConfigurationAuthorSerializer(many=True)
     existing_journals = serializers.ListSerializer(child=serializers.CharField())
     approved_experiments_count = serializers.IntegerField()
     available_populations_types = serializers.ListSerializer(child=serializers.CharField())
@@ -219,7 +211,6 @@ class StudiesConfigurationSerializer(serializers.Serializer):
     available_stimulus_modality_type = ModalityTypeSerializer(many=True)
     available_stimulus_category_type = StimulusCategorySerializer(many=True)
     available_stimulus_sub_category_type = StimulusSubCategorySerializer(many=True)
-    available_authors = ConfigurationAuthorSerializer(many=True)
     existing_journals = serializers.ListSerializer(child=serializers.CharField())
     approved_studies_count = serializers.IntegerField(default=0)
     approved_experiments_count = serializers.IntegerField()
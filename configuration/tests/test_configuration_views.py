@@ -1,8 +1,10 @@
+from django.test import override_settings
 from rest_framework import status
 
 from contrast_api.tests.base import BaseTestCase
 from contrast_api.choices import ReportingChoices, InterpretationsChoices
 from studies.models import FindingTagFamily, FindingTagType
+from studies.tests.test_graphs_cache import GRAPHS_CACHE_ENABLED
 
 
 class ConfigurationViewsTestCase(BaseTestCase):
@@ -151,6 +153,40 @@ class ConfigurationViewsTestCase(BaseTestCase):
         self.assertIn("available_parent_theories_including_all", res.data)
         self.assertIn("ALL", res.data["available_parent_theories_including_all"])
 
+    def test_configuration_studies_endpoint_conditional_get(self):
+        url = self.reverse_with_query_params("configuration-studies-form")
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("ETag", res.headers)
+        self.assertIn("Last-Modified", res.headers)
+
+        # revalidation is answered before the configuration is queried
+        with self.assertNumQueries(1):
+            not_modified_res = self.client.get(url, HTTP_IF_NONE_MATCH=res.headers["ETag"])
+        self.assertEqual(not_modified_res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.given_technique_exists("a_new_technique")
+        res_after_change = self.client.get(url, HTTP_IF_NONE_MATCH=res.headers["ETag"])
+        self.assertEqual(res_after_change.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res_after_change.headers["ETag"], res.headers["ETag"])
+
+    @override_settings(CACHES=GRAPHS_CACHE_ENABLED)
+    def test_configuration_studies_endpoint_is_served_from_snapshot(self):
+        url = self.reverse_with_query_params("configuration-studies-form")
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        # only the dataset version lookup is expected
+        with self.assertNumQueries(1):
+            snapshot_res = self.client.get(url)
+        self.assertEqual(snapshot_res.data, res.data)
+
+        self.given_technique_exists("a_new_technique")
+        res_after_change = self.client.get(url)
+        self.assertIn(
+            "a_new_technique", [technique["name"] for technique in res_after_change.data["available_techniques"]]
+        )
+
     def test_configuration_registration_form_endpoint(self):
         url = self.reverse_with_query_params("configuration-registration-form")
         res = self.client.get(url)
@@ -0,0 +1,111 @@
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from configuration.models import OutboxEmail
+from contrast_api.choices import OutboxEmailStatusChoices
+from contrast_api.technical_services.email import OutboxEmailService, OutboxDispatcher
+from contrast_api.tests.base import BaseTestCase
+
+
+class EmailOutboxTestCase(BaseTestCase):
+    def _given_outbox_email(self, recipient="submitter@test.com"):
+        OutboxEmailService().send_email(
+            recipient=recipient, from_email="from@test.com", subject="Submission approved", html_text="<p>approved</p>"
+        )
+        return OutboxEmail.objects.get(recipient=recipient)
+
+    def test_outbox_emails_are_sent_by_the_dispatcher(self):
+        outbox_email = self._given_outbox_email()
+        self.assertEqual(outbox_email.status, OutboxEmailStatusChoices.PENDING)
+        self.assertEqual(len(mail.outbox), 0)
+
+        handled = OutboxDispatcher(batch_size=10, max_attempts=3, retry_backoff=60).dispatch_batch()
+        self.assertEqual(handled, 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["submitter@test.com"])
+        outbox_email.refresh_from_db()
+        self.assertEqual(outbox_email.status, OutboxEmailStatusChoices.SENT)
+        self.assertIsNotNone(outbox_email.sent_at)
+
+        # nothing is left to send
+        self.assertEqual(OutboxDispatcher(batch_size=10, max_attempts=3, retry_backoff=60).dispatch_batch(), 0)
+
+    def test_failing_emails_are_retried_with_backoff_until_max_attempts(self):
+        outbox_email = self._given_outbox_email()
+        dispatcher = OutboxDispatcher(batch_size=10, max_attempts=2, retry_backoff=60)
+
+        with mock.patch("django.core.mail.EmailMultiAlternatives.send", side_effect=ConnectionError("smtp is down")):
+            dispatcher.dispatch_batch()
+            outbox_email.refresh_from_db()
+            self.assertEqual(outbox_email.status, OutboxEmailStatusChoices.PENDING)
+            self.assertEqual(outbox_email.attempts, 1)
+            self.assertGreater(outbox_email.next_attempt_at, timezone.now())
+            self.assertEqual(outbox_email.last_error, "smtp is down")
+
+            # not due yet
+            self.assertEqual(dispatcher.dispatch_batch(), 0)
+
+            OutboxEmail.objects.filter(id=outbox_email.id).update(next_attempt_at=timezone.now())
+            dispatcher.dispatch_batch()
+            outbox_email.refresh_from_db()
+            self.assertEqual(outbox_email.status, OutboxEmailStatusChoices.FAILED)
+            self.assertEqual(outbox_email.attempts, 2)
+
+    def test_a_failing_connection_is_a_failed_attempt_for_the_whole_batch(self):
+        first_email = self._given_outbox_email(recipient="first@test.com")
+        second_email = self._given_outbox_email(recipient="second@test.com")
+        dispatcher = OutboxDispatcher(batch_size=10, max_attempts=3, retry_backoff=60)
+
+        with mock.patch("contrast_api.technical_services.email.get_connection") as get_connection:
+            get_connection.return_value.open.side_effect = ConnectionError("smtp is down")
+            self.assertEqual(dispatcher.dispatch_batch(), 2)
+
+        self.assertEqual(len(mail.outbox), 0)
+        for outbox_email in [first_email, second_email]:
+            outbox_email.refresh_from_db()
+            self.assertEqual(outbox_email.status, OutboxEmailStatusChoices.PENDING)
+            self.assertEqual(outbox_email.attempts, 1)
+            self.assertGreater(outbox_email.next_attempt_at, timezone.now())
+            self.assertEqual(outbox_email.last_error, "smtp is down")
+
+
+class EmailOutboxDispatchLoopTestCase(TransactionTestCase):
+    # the loop closes the connections between batches, which a test case transaction wouldn't survive
+    def test_the_dispatch_loop_reconnects_after_the_database_connection_broke(self):
+        OutboxEmailService().send_email(
+            recipient="submitter@test.com", from_email="from@test.com", subject="Approved", html_text="<p>approved</p>"
+        )
+        broken = []
+
+        def break_connection_once(execute, sql, params, many, context):
+            if not broken:
+                broken.append(sql)
+                # the server side of the connection went away
+                context["connection"].connection.close()
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(break_connection_once), mock.patch(
+            "configuration.management.commands.dispatch_outbox_emails.time.sleep", side_effect=[None, KeyboardInterrupt]
+        ):
+            with self.assertRaises(KeyboardInterrupt):
+                call_command("dispatch_outbox_emails", "--loop", stdout=StringIO())
+
+        self.assertTrue(broken)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(OutboxEmail.objects.get().status, OutboxEmailStatusChoices.SENT)
+
+    def test_the_dispatch_loop_survives_a_failing_batch(self):
+        with mock.patch(
+            "configuration.management.commands.dispatch_outbox_emails.OutboxDispatcher.dispatch_batch",
+            side_effect=[OperationalError("database is down"), 1, KeyboardInterrupt],
+        ) as dispatch_batch, mock.patch("configuration.management.commands.dispatch_outbox_emails.time.sleep"):
+            with self.assertRaises(KeyboardInterrupt):
+                call_command("dispatch_outbox_emails", "--loop", stdout=StringIO())
+        self.assertEqual(dispatch_batch.call_count, 3)
+
@@ -0,0 +1,46 @@
+from approval_process.choices import ApprovalChoices
+from contrast_api.technical_services.graphs_benchmark import run_graphs_benchmark
+from contrast_api.tests.base import BaseTestCase
+from studies.models import Experiment, Study, FindingTag
+from studies.services.synthetic_corpus_svc import generate_contrast_corpus
+from uncontrast_studies.models import UnConExperiment
+from uncontrast_studies.services.synthetic_corpus_svc import generate_uncon_corpus
+
+
+class GraphsBenchmarkTestCase(BaseTestCase):
+    def test_synthetic_corpus_is_generated_with_related_data(self):
+        progress = []
+        contrast_ids = generate_contrast_corpus(20, seed=1, batch_size=8, report=progress.append)
+        uncon_ids = generate_uncon_corpus(20, seed=1, batch_size=8, report=progress.append)
+
+        self.assertEqual(progress[2], "20 of 20 contrast experiments generated")
+        self.assertEqual(progress[-1], "20 of 20 uncontrast experiments generated")
+
+        self.assertEqual(Experiment.objects.filter(id__in=contrast_ids).count(), 20)
+        self.assertEqual(UnConExperiment.objects.filter(id__in=uncon_ids).count(), 20)
+        self.assertFalse(Study.objects.exclude(approval_status=ApprovalChoices.APPROVED).exists())
+        self.assertFalse(Experiment.objects.filter(finding_tags__isnull=True).exists())
+        self.assertFalse(Experiment.objects.filter(aggregated_theories__isnull=True).exists())
+        self.assertFalse(UnConExperiment.objects.filter(findings__isnull=True).exists())
+        spatial_finding_tags = FindingTag.objects.filter(family__name="Spatial Areas")
+        self.assertFalse(spatial_finding_tags.filter(AAL_atlas_tags__isnull=True).exists())
+
+    def test_graphs_benchmark_reports_latency_and_queries_per_breakdown(self):
+        progress = []
+        generate_contrast_corpus(10, seed=1, report=progress.append)
+        generate_uncon_corpus(10, seed=1, report=progress.append)
+
+        results = run_graphs_benchmark(
+            ["contrast", "uncontrast"],
+            repeat=2,
+            warmup=0,
+            graphs=["journals", "parameters_distribution_pie"],
+            report=progress.append,
+        )
+
+        self.assertIn("contrast:parameters_distribution_pie:paradigm", results)
+        self.assertIn("uncontrast:journals", results)
+        for key, result in results.items():
+            self.assertNotIn("error", result, key)
+            self.assertGreater(result["queries"], 0)
+            self.assertLessEqual(result["p50_ms"], result["p95_ms"])
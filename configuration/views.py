@@ -1,3 +1,4 @@
+from django.http import QueryDict
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny
@@ -12,6 +13,8 @@ from configuration.serializers import (
     RegistrationConfigurationSerializer,
     UnConStudiesConfigurationSerializer,
 )
+from contrast_api.technical_services.conditional_get import dataset_conditional_get, get_request_dataset_version
+from contrast_api.technical_services.graphs_cache import GraphsCacheService
 from contrast_api.choices import (
     SampleChoices,
     TheoryDrivenChoices,
@@ -33,7 +36,6 @@ from studies.models import (
     TaskType,
     ConsciousnessMeasureType,
     ConsciousnessMeasurePhaseType,
-    Author,
     ModalityType,
     Experiment,
 )
@@ -64,6 +66,8 @@ from users.choices import GenderChoices, AcademicStageChoices
 class ConfigurationView(GenericViewSet):
     queryset = Study.objects.none()
     permission_classes = (AllowAny,)
+    # the forms configuration only changes with the dataset, so it's served from a snapshot per dataset version
+    snapshots_cache = GraphsCacheService(namespace="configuration")
 
     def get_serializer_class(self):
         if self.action == "studies_form":
@@ -81,7 +85,11 @@ class ConfigurationView(GenericViewSet):
         serializer_class=UnConStudiesConfigurationSerializer,
         permission_classes=[AllowAny],
     )
+    @dataset_conditional_get
     def uncon_studies_form(self, request, **kwargs):
+        return self.get_snapshot_response(request, self.get_uncon_studies_form_data)
+
+    def get_uncon_studies_form_data(self):
         existing_journals = (
             Study.objects.values("abbreviated_source_title")
             .order_by("abbreviated_source_title")
@@ -100,7 +108,6 @@ class ConfigurationView(GenericViewSet):
         available_processing_main_domain_types = UnConProcessingMainDomain.objects.all()
         available_specific_paradigm_type = UnConSpecificParadigm.objects.all()
         available_main_paradigm_type = UnConMainParadigm.objects.all()
-        available_authors = Author.objects.all()
         available_stimulus_modality_type = UnConModalityType.objects.all()
         available_stimulus_category_type = UnConStimulusCategory.objects.all()
         available_stimulus_sub_category_type = UnConStimulusSubCategory.objects.all()
@@ -120,7 +127,6 @@ class ConfigurationView(GenericViewSet):
             available_consciousness_measure_phase_type=available_consciousness_measure_phase_type,
             available_consciousness_measure_type=available_consciousness_measure_type,
             available_consciousness_measure_sub_type=available_consciousness_measure_sub_type,
-            available_authors=available_authors,
             available_stimulus_modality_type=available_stimulus_modality_type,
             available_stimulus_category_type=available_stimulus_category_type,
             available_stimulus_sub_category_type=available_stimulus_sub_category_type,
@@ -135,14 +141,16 @@ class ConfigurationView(GenericViewSet):
             are_participants_excluded_options=are_participants_excluded_options,
             approved_experiments_count=approved_experiments_count,
         )
-
-        serializer = self.get_serializer(instance=configuration_data)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return configuration_data
 
     @action(
         detail=False, methods=["GET"], serializer_class=StudiesConfigurationSerializer, permission_classes=[AllowAny]
     )
+    @dataset_conditional_get
     def studies_form(self, request, **kwargs):
+        return self.get_snapshot_response(request, self.get_studies_form_data)
+
+    def get_studies_form_data(self):
         existing_journals = (
             Study.objects.values("abbreviated_source_title")
             .order_by("abbreviated_source_title")
@@ -166,7 +174,6 @@ class ConfigurationView(GenericViewSet):
         available_consciousness_measure_phase_type = ConsciousnessMeasurePhaseType.objects.all()
         available_analysis_measure_type = ConsciousnessMeasureType.objects.all()
         available_tasks_types = TaskType.objects.all()
-        available_authors = Author.objects.all()
         available_stimulus_modality_type = ModalityType.objects.all()
         available_stimulus_category_type = StimulusCategory.objects.all()
         available_stimulus_sub_category_type = StimulusSubCategory.objects.all()
@@ -193,20 +200,30 @@ class ConfigurationView(GenericViewSet):
             available_consciousness_measure_phase_type=available_consciousness_measure_phase_type,
             available_consciousness_measure_type=available_analysis_measure_type,
             available_analysis_measure_type=available_analysis_measure_type,
-            available_authors=available_authors,
             available_stimulus_modality_type=available_stimulus_modality_type,
             available_stimulus_category_type=available_stimulus_category_type,
             available_stimulus_sub_category_type=available_stimulus_sub_category_type,
             available_tasks_types=available_tasks_types,
             approved_experiments_count=approved_experiments_count,
         )
+        return configuration_data
 
-        serializer = self.get_serializer(instance=configuration_data)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+    def get_snapshot_response(self, request, get_configuration_data):
+        snapshot_key = self.snapshots_cache.build_key(
+            self.action, QueryDict(), get_request_dataset_version(request).version
+        )
+        snapshot = self.snapshots_cache.get(snapshot_key)
+        if snapshot is None:
+            serializer = self.get_serializer(instance=get_configuration_data())
+            snapshot = serializer.data
+            self.snapshots_cache.set(snapshot_key, snapshot)
+
+        return Response(snapshot, status=status.HTTP_200_OK)
 
     @action(
         detail=False, methods=["GET"], serializer_class=GraphsConfigurationSerializer, permission_classes=[AllowAny]
     )
+    @dataset_conditional_get
     def graphs(self, request, **kwargs):
         images = GraphImage.objects.all()
         available_parent_theories = (
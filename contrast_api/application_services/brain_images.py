@@ -6,22 +6,27 @@ import os
 import ssl
 import tarfile
 import tempfile
+import threading
 import urllib.request
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
 import pandas as pd
 import numpy as np
 from nilearn import datasets, image, surface, plotting
+from scipy import sparse
 from matplotlib.colors import LinearSegmentedColormap, to_rgba
 import matplotlib.pyplot as plt
 import nibabel as nib
+from django.conf import settings
 from configuration.initial_setup import ParentTheories
 
 logger = logging.getLogger(__name__)
 
 AAL_URL = "https://www.gin.cnrs.fr/wp-content/uploads/AAL3v2_for_SPM12.tar.gz"
-AAL_DATA_DIR = Path.home() / "nilearn_data" / "aal_3v2"
+AAL_DATASET_DIR_NAME = "aal_3v2"
+AAL_PROJECTION_FILE_NAME = "aal_3v2_to_fsaverage5_pial_left.npz"
 
 
 class BrainViews:
@@ -60,6 +65,14 @@ cross_version_mapping_one_to_many = {
 }
 
 
+def get_atlas_data_dir() -> Path:
+    return Path(settings.ATLAS_DATA_DIR)
+
+
+def is_aal_atlas_cached() -> bool:
+    return (get_atlas_data_dir() / AAL_DATASET_DIR_NAME / "AAL3" / "AAL3v1.nii").exists()
+
+
 def _ensure_aal_atlas():
     """Download and extract AAL atlas if not already cached.
 
@@ -67,12 +80,12 @@ def _ensure_aal_atlas():
     (e.g. Heroku). This pre-downloads the archive with SSL verification
     disabled so nilearn finds the cached files and skips its own download.
     """
-    expected_file = AAL_DATA_DIR / "AAL3" / "AAL3v1.nii"
-    if expected_file.exists():
+    if is_aal_atlas_cached():
         return
 
-    logger.info("AAL atlas not found at %s, downloading manually...", AAL_DATA_DIR)
-    AAL_DATA_DIR.mkdir(parents=True, exist_ok=True)
+    aal_data_dir = get_atlas_data_dir() / AAL_DATASET_DIR_NAME
+    logger.info("AAL atlas not found at %s, downloading manually...", aal_data_dir)
+    aal_data_dir.mkdir(parents=True, exist_ok=True)
 
     ctx = ssl.create_default_context()
     ctx.check_hostname = False
@@ -86,20 +99,140 @@ def _ensure_aal_atlas():
                 out_file.write(response.read())
         logger.info("AAL download complete, extracting...")
         with tarfile.open(tmp_path, "r:gz") as tar:
-            tar.extractall(path=AAL_DATA_DIR)
-        logger.info("Extracted AAL atlas to %s", AAL_DATA_DIR)
+            tar.extractall(path=aal_data_dir)
+        logger.info("Extracted AAL atlas to %s", aal_data_dir)
     finally:
         os.unlink(tmp_path)
 
 
-# @functools.cache
 def get_AAL_Atlas_datasets():
     _ensure_aal_atlas()
     fsaverage = datasets.fetch_surf_fsaverage(mesh="fsaverage5")
-    aal = datasets.fetch_atlas_aal(version="3v2")
+    aal = datasets.fetch_atlas_aal(version="3v2", data_dir=get_atlas_data_dir())
     return fsaverage.pial_left, fsaverage.sulc_left, aal
 
 
+def build_region_projection_matrix(pial_left, label_volume: np.ndarray, affine: np.ndarray):
+    """
+    vol_to_surf is linear in the volume values, and our volumes are always a value per AAL region
+    So projecting each region mask once gives a (vertices x regions) matrix, and the texture of any
+    region -> opacity assignment is that matrix times the opacities vector
+    """
+    region_codes = np.unique(label_volume)
+    region_codes = region_codes[region_codes != 0]
+    columns = []
+    for region_code in region_codes:
+        mask_img = nib.Nifti1Image((label_volume == region_code).astype(float), affine=affine)
+        region_texture = np.nan_to_num(surface.vol_to_surf(mask_img, pial_left))
+        columns.append(sparse.csc_matrix(region_texture.reshape(-1, 1)))
+    return sparse.hstack(columns).tocsr(), region_codes
+
+
+def get_region_projection_file() -> Path:
+    return get_atlas_data_dir() / AAL_PROJECTION_FILE_NAME
+
+
+def load_region_projection_matrix() -> Optional[Tuple[sparse.csr_matrix, np.ndarray]]:
+    projection_file = get_region_projection_file()
+    if not projection_file.exists():
+        return None
+    with np.load(projection_file) as stored:
+        projection = sparse.csr_matrix(
+            (stored["data"], stored["indices"], stored["indptr"]), shape=tuple(stored["shape"])
+        )
+        return projection, stored["region_codes"]
+
+
+def save_region_projection_matrix(projection: sparse.csr_matrix, region_codes: np.ndarray):
+    projection_file = get_region_projection_file()
+    projection_file.parent.mkdir(parents=True, exist_ok=True)
+    # written aside and moved into place, so concurrent workers never read a partial file
+    with tempfile.NamedTemporaryFile(dir=projection_file.parent, suffix=".npz", delete=False) as tmp:
+        np.savez(
+            tmp,
+            data=projection.data,
+            indices=projection.indices,
+            indptr=projection.indptr,
+            shape=np.array(projection.shape),
+            region_codes=region_codes,
+        )
+    os.replace(tmp.name, projection_file)
+
+
+def get_region_projection_matrix(pial_left, label_volume: np.ndarray, affine: np.ndarray):
+    """
+    The matrix only depends on the fixed mesh and atlas, it's built into the image / slug by load_atlas_data
+    Building it here (a few minutes of vol_to_surf) only happens when it wasn't, on the first brain images request
+    """
+    stored = load_region_projection_matrix()
+    if stored is not None:
+        return stored
+
+    logger.warning("The AAL regions projection matrix wasn't built with load_atlas_data, building it now")
+    projection, region_codes = build_region_projection_matrix(pial_left, label_volume, affine)
+    save_region_projection_matrix(projection, region_codes)
+    return projection, region_codes
+
+
+@dataclass(frozen=True)
+class LoadedAtlas:
+    pial_left: object  # in memory fsaverage5 left pial mesh
+    sulc_left: np.ndarray
+    region_codes: Dict[str, int]  # AAL label -> region code in the label volume
+    label_volume: np.ndarray  # AAL atlas volume as integer region codes
+    affine: np.ndarray
+    # vertices x regions, the surface texture of each region mask - see build_region_projection_matrix
+    region_projection: sparse.csr_matrix
+    projected_region_codes: np.ndarray  # the region code of each column in region_projection
+
+
+class AALAtlasRegistry:
+    """
+    Process wide registry of the atlas and surface data in memory, so renders don't fetch and parse them again
+    Warmed up when a gunicorn worker boots (see gunicorn.conf.py), else loaded lazily on first use
+    """
+
+    _atlas: Optional[LoadedAtlas] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls) -> LoadedAtlas:
+        if cls._atlas is None:
+            with cls._lock:
+                if cls._atlas is None:
+                    cls._atlas = cls._load()
+        return cls._atlas
+
+    @classmethod
+    def warm_up(cls):
+        # only from local files, downloading the atlas or building the matrix would outlast the worker boot timeout
+        if not (is_aal_atlas_cached() and get_region_projection_file().exists()):
+            logger.warning("AAL atlas or projection matrix missing, the atlas will be loaded on the first brain image")
+            return
+        cls.get()
+
+    @staticmethod
+    def _load() -> LoadedAtlas:
+        logger.info("Loading AAL atlas and fsaverage surfaces into memory")
+        pial_left, sulc_left, aal = get_AAL_Atlas_datasets()
+        aal_img = image.load_img(aal.maps)
+        label_volume = np.asarray(aal_img.dataobj).astype(np.int32)
+        label_volume.setflags(write=False)
+        pial_left_mesh = surface.load_surf_mesh(pial_left)
+        region_projection, projected_region_codes = get_region_projection_matrix(
+            pial_left_mesh, label_volume, aal_img.affine
+        )
+        return LoadedAtlas(
+            pial_left=pial_left_mesh,
+            sulc_left=surface.load_surf_data(sulc_left),
+            region_codes={label: int(index) for label, index in zip(aal.labels, aal.indices)},
+            label_volume=label_volume,
+            affine=aal_img.affine,
+            region_projection=region_projection,
+            projected_region_codes=projected_region_codes,
+        )
+
+
 class BrainImageCreatorService:
     def __init__(self, findings_df: pd.DataFrame, theory: str):
         self.findings_df = findings_df
@@ -110,7 +243,7 @@ class BrainImageCreatorService:
             ParentTheories.INTEGRATED_INFORMATION: "#ECE76D",
             ParentTheories.FIRST_ORDER_AND_PREDICTIVE_PROCESSING: "#60A7C2",
         }
-        self.fsaverage_pial_left, self.fsaverage_sulc_left, self.aal = get_AAL_Atlas_datasets()
+        self.atlas = AALAtlasRegistry.get()
 
     def create_brain_image(self) -> Dict:
         # process the dataframe
@@ -227,8 +360,6 @@ class BrainImageCreatorService:
         """
 
         logger.info(f"Starting to process brain image for {theory} and view {view} ")
-        aal_img = image.load_img(self.aal.maps)
-        affine = aal_img.affine
 
         theory_df = dataframe[dataframe["theory"] == theory]
         frequencies = theory_df["frequency"]
@@ -239,11 +370,9 @@ class BrainImageCreatorService:
         color_list = self.create_cmap(frequencies, theory, color)
         cmap = LinearSegmentedColormap.from_list(name=theory, colors=color_list)
 
-        combined_img = self.combine_image_data(theory, dataframe, aal_img)
-        new_combined_img = nib.Nifti1Image(combined_img, affine=affine)
-
-        # Project volumetric data to surface
-        texture = surface.vol_to_surf(new_combined_img, self.fsaverage_pial_left)
+        # Project the regions opacities to surface, a single sparse product instead of a volumetric projection
+        opacity_by_region_code = self.get_opacity_by_region_code(theory, dataframe)
+        texture = self.atlas.region_projection @ opacity_by_region_code[self.atlas.projected_region_codes]
         logger.info(f"Plotting {theory} for {view} view")
         result = self.create_brain_plot(view, texture, cmap, save_format)
         title = f"{theory}, N={total}"
@@ -276,34 +405,31 @@ class BrainImageCreatorService:
         else:
             name = "_".join([region, "L"])
 
-        try:
-            region_code = self.aal.indices[self.aal.labels.index(name)]
-        except ValueError:
-            if name in cross_version_mapping.keys():
-                try:
-                    region_code = self.aal.indices[self.aal.labels.index(cross_version_mapping[name])]
-                except ValueError:
-                    return {"name": name, "region code": 0}
-            else:
-                return {"name": name, "region code": 0}
+        region_code = self.atlas.region_codes.get(name)
+        if region_code is None and name in cross_version_mapping.keys():
+            region_code = self.atlas.region_codes.get(cross_version_mapping[name])
+        if region_code is None:
+            return {"name": name, "region code": 0}
 
-        return {"name": name, "region code": int(region_code)}
+        return {"name": name, "region code": region_code}
 
-    def combine_image_data(self, theory_name: str, frequencies_dataframe: pd.DataFrame, img):
+    def get_opacity_by_region_code(self, theory_name: str, frequencies_dataframe: pd.DataFrame) -> np.ndarray:
+        """
+        Lookup table from a region code to its opacity for the theory
+        """
         regions, opacities = self.get_areas_and_frequencies(theory_name, frequencies_dataframe)
-        left_hemisphere_regions = [self.get_aal_region_code_L(region)["region code"] for region in regions]
-
-        combined_img_data = np.zeros(img.shape)
-
-        # Loop through the defined regions and set them in the combined image
-        for region, opacity in zip(left_hemisphere_regions, opacities):
-            if region == 0:
-                continue
-            else:
-                mask = (img.get_fdata() == region).astype(float)
-                combined_img_data += mask * opacity
+        left_hemisphere_regions = np.array(
+            [self.get_aal_region_code_L(region)["region code"] for region in regions], dtype=np.int64
+        )
+        opacities = np.asarray(opacities, dtype=float)
 
-        return combined_img_data
+        max_region_code = int(self.atlas.projected_region_codes.max(initial=0))
+        lookup_table_size = max(max_region_code, int(left_hemisphere_regions.max(initial=0))) + 1
+        opacity_by_region_code = np.zeros(lookup_table_size)
+        # regions that can't be found are coded as 0, the background, which stays transparent
+        np.add.at(opacity_by_region_code, left_hemisphere_regions, opacities)
+        opacity_by_region_code[0] = 0
+        return opacity_by_region_code
 
     def create_brain_plot(self, view_type: str, texture, cmap, file_format="png"):
         """Helper function to create and set up a brain visualization figure."""
@@ -311,7 +437,7 @@ class BrainImageCreatorService:
         fig = plt.figure(figsize=(10, 10), dpi=90)
 
         plotting.plot_surf_stat_map(
-            self.fsaverage_pial_left,
+            self.atlas.pial_left,
             texture,
             hemi="left",
             view=view_type,
@@ -319,7 +445,7 @@ class BrainImageCreatorService:
             cmap=cmap,
             darkness=1,
             bg_on_data=False,
-            bg_map=self.fsaverage_sulc_left,
+            bg_map=self.atlas.sulc_left,
             threshold=None,
             title=title,
             figure=fig,
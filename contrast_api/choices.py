@@ -163,3 +163,29 @@ class SignificanceChoices(TextChoices):
     NEGATIVE = "Negative"
     POSITIVE = "Positive"
     MIXED = "Mixed"
+
+
+class ExperimentFactDimensionChoices(TextChoices):
+    PARADIGM_FAMILY = "paradigm_family"
+    PARADIGM = "paradigm"
+    POPULATION = "population"
+    FINDING_TAG = "finding_tag"
+    FINDING_TAG_FAMILY = "finding_tag_family"
+    REPORTING = "reporting"
+    THEORY_DRIVEN = "theory_driven"
+    TASK = "task"
+    STIMULI_CATEGORY = "stimuli_category"
+    MODALITY = "modality"
+    CONSCIOUSNESS_MEASURE_PHASE = "consciousness_measure_phase"
+    CONSCIOUSNESS_MEASURE_TYPE = "consciousness_measure_type"
+    TYPE_OF_CONSCIOUSNESS = "type_of_consciousness"
+    TECHNIQUE = "technique"
+    MEASURE = "measure"
+    COUNTRY = "country"
+    YEAR = "year"
+
+
+class OutboxEmailStatusChoices(TextChoices):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
@@ -1,9 +1,13 @@
+from collections import defaultdict
+
 from django.db import transaction
 from django.db.models import QuerySet
 from django.template.loader import render_to_string
+from simple_history.utils import bulk_update_with_history
 
 from approval_process.choices import ApprovalChoices
 from approval_process.models import ApprovalComment
+from configuration.models import DatasetVersion
 from contrast_api.application_services.notifier import NotifierService
 from contrast_api.choices import StudyTypeChoices
 from studies.models import Study
@@ -32,55 +36,57 @@ class StudyLifeCycleService:
         message = render_to_string("study_submitted.html", data)
         self.notifier.notify_site_manager(subject=site_manager_subject, message=message)
 
-    def approved(self, reviewer, studies: QuerySet[Study]):
-        for study in studies:
-            self._approve_study(reviewer, study)
-
-    def pending(self, reviewer, studies: QuerySet[Study]):
-        for study in studies:
-            self._pending_study(reviewer, study)
-
     @transaction.atomic
-    def _review_study(self, reviewer, study: Study):
-        study.approval_status = ApprovalChoices.AWAITING_REVIEW
-        study.save()
-        ApprovalComment.objects.create(
-            process=study.approval_process, reviewer=reviewer, text="Submission moved to review"
-        )
+    def approved(self, reviewer, studies: QuerySet[Study]):
+        studies = self._transition_studies(reviewer, studies, ApprovalChoices.APPROVED, "Submission approved")
+        self._notify_submitters(studies, "submission_approved.html", "submissions_approved.html")
 
     @transaction.atomic
-    def _pending_study(self, reviewer, study: Study):
-        study.approval_status = ApprovalChoices.PENDING
-        study.save()
+    def pending(self, reviewer, studies: QuerySet[Study]):
+        self._transition_studies(reviewer, studies, ApprovalChoices.PENDING)
 
     @transaction.atomic
-    def _approve_study(self, reviewer, study: Study):
-        study.approval_status = ApprovalChoices.APPROVED
-        study.save()
-        site_name = self.resolve_site_name_by_study_type(study.type)
-
-        ApprovalComment.objects.create(process=study.approval_process, reviewer=reviewer, text="Submission approved")
-        data = dict(study=study, username=study.submitter.username, site_name=site_name)
-        subject = f"Regarding your submission to {site_name} database"
-        message = render_to_string("submission_approved.html", data)
-        self.notifier.notify_recipient(subject=subject, recipient=study.submitter.email, message=message)
-
     def rejected(self, reviewer, studies: QuerySet[Study]):
-        for study in studies:
-            self._reject_study(reviewer, study)
+        studies = self._transition_studies(reviewer, studies, ApprovalChoices.REJECTED, "Submission rejected")
+        self._notify_submitters(studies, "submission_rejected.html", "submissions_rejected.html")
 
+    @transaction.atomic
     def reviewed(self, reviewer, studies: QuerySet[Study]):
+        self._transition_studies(reviewer, studies, ApprovalChoices.AWAITING_REVIEW, "Submission moved to review")
+
+    def _transition_studies(self, reviewer, studies: QuerySet[Study], approval_status, comment: str = None):
+        """
+        Moves all the studies to the status in one UPDATE, with their history rows and comments bulk created
+        """
+        studies = list(studies.select_related("submitter", "approval_process"))
+        if not studies:
+            return studies
         for study in studies:
-            self._review_study(reviewer, study)
-
-    @transaction.atomic
-    def _reject_study(self, reviewer, study: Study):
-        study.approval_status = ApprovalChoices.REJECTED
-        study.save()
-        ApprovalComment.objects.create(process=study.approval_process, reviewer=reviewer, text="Submission rejected")
-        site_name = self.resolve_site_name_by_study_type(study.type)
-
-        data = dict(study=study, username=study.submitter.username, site_name=site_name)
-        subject = f"Regarding your submission to {site_name} database"
-        message = render_to_string("submission_rejected.html", data)
-        self.notifier.notify_recipient(subject=subject, recipient=study.submitter.email, message=message)
+            study.approval_status = approval_status
+        bulk_update_with_history(studies, Study, ["approval_status"], default_user=reviewer)
+        if comment:
+            ApprovalComment.objects.bulk_create(
+                ApprovalComment(process=study.approval_process, reviewer=reviewer, text=comment)
+                for study in studies
+                if study.approval_process is not None
+            )
+        # the bulk update skips the per study signals
+        DatasetVersion.bump()
+        return studies
+
+    def _notify_submitters(self, studies: list[Study], study_template: str, studies_template: str):
+        # a single email per submitter and site, listing all of their studies
+        submitters_studies = defaultdict(list)
+        for study in studies:
+            if study.submitter is not None:
+                site_name = self.resolve_site_name_by_study_type(study.type)
+                submitters_studies[(study.submitter, site_name)].append(study)
+
+        for (submitter, site_name), submitter_studies in submitters_studies.items():
+            subject = f"Regarding your submission to {site_name} database"
+            data = dict(username=submitter.username, site_name=site_name)
+            if len(submitter_studies) == 1:
+                message = render_to_string(study_template, dict(study=submitter_studies[0], **data))
+            else:
+                message = render_to_string(studies_template, dict(studies=submitter_studies, **data))
+            self.notifier.notify_recipient(subject=subject, recipient=submitter.email, message=message)
@@ -1,12 +1,24 @@
+import logging
 import os
+import time
 from os import getenv
 
 from zoneinfo import ZoneInfo
 from django.utils import timezone
 from spa.middleware import SPAMiddleware
 from django.conf import settings
+from django.db import connection
 from django.urls import is_valid_path
 
+from contrast_api.technical_services.telemetry import (
+    endpoints_telemetry,
+    start_request_metrics,
+    pop_request_metrics,
+    sql_timing_wrapper,
+)
+
+logger = logging.getLogger(__name__)
+
 
 class TimezoneMiddleware:
     def __init__(self, get_response):
@@ -19,6 +31,59 @@ class TimezoneMiddleware:
         return self.get_response(request)
 
 
+class TelemetryMiddleware:
+    """
+    Records the queries count, SQL time, processor and serializer time, response time and size of each request
+    into the in process histograms of its resolved view, exposed by the telemetry endpoint
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.TELEMETRY_ENABLED:
+            return self.get_response(request)
+
+        start_request_metrics()
+        start = time.perf_counter()
+        try:
+            with connection.execute_wrapper(sql_timing_wrapper):
+                response = self.get_response(request)
+        finally:
+            metrics = pop_request_metrics()
+        metrics["response_time"] = time.perf_counter() - start
+        metrics.setdefault("queries", 0)
+        metrics.setdefault("sql_time", 0)
+
+        resolver_match = getattr(request, "resolver_match", None)
+        if resolver_match is None or not resolver_match.view_name:
+            # static files, SPA pages and unknown urls
+            return response
+        view_name = resolver_match.view_name
+        if response.streaming:
+            # the size is only known once the stream is consumed, so it's recorded then
+            response.streaming_content = self.measure_stream(response.streaming_content, view_name, metrics)
+            return response
+        metrics["response_size"] = len(response.content)
+        self.record(view_name, metrics)
+        return response
+
+    def measure_stream(self, streaming_content, view_name: str, metrics: dict):
+        metrics["response_size"] = 0
+        try:
+            for chunk in streaming_content:
+                metrics["response_size"] += len(chunk)
+                yield chunk
+        finally:
+            # also when the client went away mid stream, with the size sent until then
+            self.record(view_name, metrics)
+
+    def record(self, view_name: str, metrics: dict):
+        endpoints_telemetry.record(view_name, metrics)
+        if metrics["queries"] >= settings.TELEMETRY_LOG_MIN_QUERY_COUNT:
+            logger.info(f"{view_name} ran {metrics['queries']:.0f} queries in {metrics['sql_time'] * 1000:.0f}ms")
+
+
 class MultiSPAMiddleware(SPAMiddleware):
     static_url = settings.STATIC_URL
     spa_roots = {}
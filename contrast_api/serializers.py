@@ -1,3 +1,4 @@
+from django.http import QueryDict
 from django.utils.encoding import smart_str
 from rest_framework import serializers
 
@@ -70,6 +71,36 @@ class ComparisonNestedPieChartSerializer(serializers.Serializer):
     theories = PieChartSerializer(many=True)
 
 
+class GraphSpecSerializer(serializers.Serializer):
+    key = serializers.CharField(required=False, help_text="Key of the graph in the response, defaults to graph_type")
+    graph_type = serializers.CharField()
+    params = serializers.DictField(required=False, default=dict, help_text="The graph's query params")
+
+    def validate_params(self, params):
+        # the same shape the graph endpoint gets, a value or a list of values per param. CSV isn't batched
+        query_params = QueryDict(mutable=True)
+        for name, value in params.items():
+            if name == "is_csv":
+                continue
+            values = value if isinstance(value, list) else [value]
+            query_params.setlist(name, [str(item) for item in values])
+        return query_params
+
+    def validate(self, attrs):
+        attrs.setdefault("key", attrs["graph_type"])
+        return attrs
+
+
+class GraphsBatchSerializer(serializers.Serializer):
+    graphs = GraphSpecSerializer(many=True, allow_empty=False, max_length=20)
+
+    def validate_graphs(self, graphs):
+        keys = [graph["key"] for graph in graphs]
+        if len(keys) != len(set(keys)):
+            raise serializers.ValidationError("Graphs keys must be unique, set a key for repeated graph types")
+        return graphs
+
+
 class NullableIntegerField(serializers.IntegerField):
     def to_internal_value(self, data):
         """
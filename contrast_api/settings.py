@@ -93,7 +93,7 @@ class Base(Configuration):
         "django.contrib.messages.middleware.MessageMiddleware",
         "django.middleware.clickjacking.XFrameOptionsMiddleware",
         "contrast_api.middleware.TimezoneMiddleware",
-        "querycount.middleware.QueryCountMiddleware",
+        "contrast_api.middleware.TelemetryMiddleware",
         "admin_reorder.middleware.ModelAdminReorder",
         "simple_history.middleware.HistoryRequestMiddleware",
     ]
@@ -107,13 +107,10 @@ class Base(Configuration):
     DEFAULT_FROM_EMAIL = values.EmailValue()
     SITE_MANAGER_ADDRESS = values.EmailValue(default=DEFAULT_FROM_EMAIL)
 
-    QUERYCOUNT = {
-        "THRESHOLDS": {"MEDIUM": 50, "HIGH": 200, "MIN_TIME_TO_LOG": 0, "MIN_QUERY_COUNT_TO_LOG": 5},
-        "IGNORE_REQUEST_PATTERNS": [],
-        "IGNORE_SQL_PATTERNS": [],
-        "DISPLAY_DUPLICATES": None,
-        "RESPONSE_HEADER": None,
-    }
+    # per view queries, SQL, processing and response histograms, exposed to staff by the telemetry endpoint
+    TELEMETRY_ENABLED = values.BooleanValue(True)
+    # requests running at least this many queries are logged
+    TELEMETRY_LOG_MIN_QUERY_COUNT = values.IntegerValue(50)
     ADMIN_REORDER = (
         {"app": "studies", "label": "studies", "models": ("studies.Study", "studies.Author")},
         {
@@ -187,14 +184,49 @@ class Base(Configuration):
             "label": "user management and authorization",
             "models": ("auth.Group", "auth.User", "users.Profile", ""),
         },
-        {"app": "studies", "label": "aggregates", "models": ("studies.AggregatedInterpretation",)},
+        {
+            "app": "studies",
+            "label": "aggregates",
+            "models": ("studies.AggregatedInterpretation", "studies.BrainImage"),
+        },
         {"app": "approval_process"},
         {"app": "otp_totp", "label": "two factor auth config"},
     )
     # Device
 
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "graphs": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "graphs",
+            "OPTIONS": {"MAX_ENTRIES": 1000},
+        },
+    }
+    # entries are invalidated by the dataset version, so this only bounds memory for unpopular params combinations
+    GRAPHS_CACHE_TIMEOUT = values.IntegerValue(60 * 60 * 24)
+    # aggregate the parameters distribution graphs over the experiment facts table, run build_experiment_facts first
+    GRAPHS_USE_EXPERIMENT_FACTS = values.BooleanValue(False)
+    # evaluate the free queries graph over a per worker columnar snapshot, rebuilt when the dataset version is bumped
+    GRAPHS_USE_FREE_QUERIES_SNAPSHOT = values.BooleanValue(False)
+    # graphs of a batch request are processed sequentially unless more workers are set, each with its own db connection
+    GRAPHS_BATCH_MAX_WORKERS = values.IntegerValue(1)
+    # seconds for all the graphs of a batch, the statements still running then are cancelled by the database
+    GRAPHS_BATCH_TIMEOUT = values.FloatValue(30)
+    # a staff profile=true graph request runs EXPLAIN ANALYZE on at most this many of its statements
+    GRAPHS_PROFILE_MAX_EXPLAINED_STATEMENTS = values.IntegerValue(20)
+    # the AAL atlas and its regions to surface matrix, downloaded and built into the image / slug by load_atlas_data
+    ATLAS_DATA_DIR = values.Value(str(BASE_DIR / "atlas_data"))
+    AUTHORS_AUTOCOMPLETE_LIMIT = values.IntegerValue(20)
+    # part of the graphs and configuration ETags, bump it when a release changes these responses
+    CONDITIONAL_GET_REVISION = values.Value("1")
+
     ROOT_URLCONF = "contrast_api.urls"
-    EMAIL_SERVICE = "contrast_api.technical_services.email.EmailService"
+    # emails are written to an outbox in the request transaction, and sent by the dispatch_outbox_emails worker
+    EMAIL_SERVICE = "contrast_api.technical_services.email.OutboxEmailService"
+    EMAIL_OUTBOX_BATCH_SIZE = values.IntegerValue(50)
+    EMAIL_OUTBOX_MAX_ATTEMPTS = values.IntegerValue(5)
+    EMAIL_OUTBOX_RETRY_BACKOFF = values.IntegerValue(60)
+    EMAIL_OUTBOX_POLL_INTERVAL = values.FloatValue(5)
     TEMPLATES = [
         {
             "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -362,7 +394,15 @@ class Testing(Development):
         "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
     }
 
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        # tests rollback the dataset version between them, so caching graphs is opted in explicitly per test
+        "graphs": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+    }
+
     EMAIL_BACKEND = "anymail.backends.test.EmailBackend"
+    # tests assert on the sent mailbox right after the request
+    EMAIL_SERVICE = "contrast_api.technical_services.email.EmailService"
     DEFAULT_FROM_EMAIL = "from@test.com"
     SITE_MANAGER_ADDRESS = "to@test.com"
 
@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
+from configuration.models import DatasetVersion
+
+
+def get_request_dataset_version(request) -> DatasetVersion:
+    # looked up once per request, for the validators and the graphs cache key alike
+    if not hasattr(request, "_dataset_version"):
+        request._dataset_version = DatasetVersion.get()
+    return request._dataset_version
+
+
+def is_profile_request(request) -> bool:
+    # the graphs profiling responses are timings of the current run, they are never answered with a 304
+    return "profile" in request.GET
+
+
+def dataset_etag(request, *args, **kwargs) -> str | None:
+    if is_profile_request(request):
+        return None
+    # the revision is bumped manually when a deploy changes the responses shape, so clients don't keep stale payloads
+    return f'"{get_request_dataset_version(request).version}-{settings.CONDITIONAL_GET_REVISION}"'
+
+
+def dataset_last_modified(request, *args, **kwargs):
+    if is_profile_request(request):
+        return None
+    return get_request_dataset_version(request).updated_at
+
+
+# ETag and Last-Modified validators derived from the dataset version, for the public read only endpoints
+# a matching conditional GET is answered with a 304 before any processing or serializing
+dataset_conditional_get = method_decorator(condition(etag_func=dataset_etag, last_modified_func=dataset_last_modified))
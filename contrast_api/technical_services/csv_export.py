@@ -0,0 +1,41 @@
+import csv
+
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from import_export.resources import ModelResource
+
+
+class Echo:
+    """
+    Pseudo buffer for the csv writer, returning each formatted line instead of buffering it
+    """
+
+    def write(self, value):
+        return value
+
+
+def stream_resource_as_csv(resource: ModelResource, queryset: QuerySet):
+    """
+    Same rows as resource.export(queryset).csv, but formatted batch by batch instead of building the whole dataset
+    iter_queryset paginates by the resource chunk size, so each batch is fetched with its own prefetching
+    """
+    writer = csv.writer(Echo())
+    # headers go out on their own, so the first bytes are sent before any experiment is fetched
+    yield writer.writerow(resource.get_export_headers())
+
+    batch = []
+    for instance in resource.iter_queryset(queryset):
+        batch.append(writer.writerow(resource.export_resource(instance)))
+        if len(batch) >= resource.get_chunk_size():
+            yield "".join(batch)
+            batch = []
+    if batch:
+        yield "".join(batch)
+
+
+def create_csv_streaming_response(resource: ModelResource, queryset: QuerySet, filename: str = "export.csv"):
+    return StreamingHttpResponse(
+        stream_resource_as_csv(resource, queryset),
+        content_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,6 +1,12 @@
 import logging
+from datetime import timedelta
 
-from django.core.mail import send_mail
+from django.conf import settings
+from django.core.mail import send_mail, get_connection, EmailMultiAlternatives
+from django.db import transaction
+from django.utils import timezone
+
+from contrast_api.choices import OutboxEmailStatusChoices
 
 logger = logging.getLogger(__name__)
 
@@ -18,3 +24,90 @@ class EmailService:
         except Exception:
             logger.exception(f"Failing to send email with {subject} to {recipient} ")
             raise
+
+
+class OutboxEmailService:
+    """
+    Writes the email to the outbox in the current transaction, the outbox dispatcher sends it
+    """
+
+    def send_email(self, recipient, from_email, subject, html_text):
+        from configuration.models import OutboxEmail
+
+        OutboxEmail.objects.create(recipient=recipient, from_email=from_email, subject=subject, html_text=html_text)
+
+
+class OutboxDispatcher:
+    def __init__(self, batch_size: int = None, max_attempts: int = None, retry_backoff: int = None):
+        self.batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+        self.max_attempts = max_attempts or settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+        self.retry_backoff = retry_backoff or settings.EMAIL_OUTBOX_RETRY_BACKOFF
+
+    def get_next_attempt_at(self, attempts: int):
+        # exponential backoff: 1, 2, 4... times the base backoff
+        return timezone.now() + timedelta(seconds=self.retry_backoff * 2 ** (attempts - 1))
+
+    def record_failed_attempt(self, email, error: Exception):
+        email.attempts += 1
+        email.last_error = str(error)
+        if email.attempts >= self.max_attempts:
+            email.status = OutboxEmailStatusChoices.FAILED
+        else:
+            email.next_attempt_at = self.get_next_attempt_at(email.attempts)
+
+    def send(self, email, connection):
+        message = EmailMultiAlternatives(
+            subject=email.subject,
+            body=email.html_text,
+            from_email=email.from_email,
+            to=[email.recipient],
+            connection=connection,
+        )
+        message.attach_alternative(email.html_text, "text/html")
+        try:
+            message.send()
+        except Exception as error:
+            logger.exception(f"Failing to send email with {email.subject} to {email.recipient} ")
+            self.record_failed_attempt(email, error)
+            return
+        email.attempts += 1
+        email.status = OutboxEmailStatusChoices.SENT
+        email.sent_at = timezone.now()
+
+    @transaction.atomic
+    def dispatch_batch(self) -> int:
+        """
+        Sends a batch of due emails over a single connection, returns how many were handled
+        The rows are locked while sending, skipping ones locked by other dispatchers
+        """
+        from configuration.models import OutboxEmail
+
+        emails = list(
+            OutboxEmail.objects.filter(status=OutboxEmailStatusChoices.PENDING, next_attempt_at__lte=timezone.now())
+            .order_by("next_attempt_at", "id")
+            .select_for_update(skip_locked=True)[: self.batch_size]
+        )
+        if not emails:
+            return 0
+
+        connection = get_connection()
+        try:
+            connection.open()
+        except Exception as error:
+            # the batch's emails weren't sent either, so it's an attempt for each of them
+            logger.exception(f"Failing to open the email connection for {len(emails)} outbox emails")
+            for email in emails:
+                self.record_failed_attempt(email, error)
+        else:
+            for email in emails:
+                self.send(email, connection)
+            try:
+                connection.close()
+            except Exception:
+                # the emails are sent already, their status must still be saved
+                logger.exception("Failing to close the email connection")
+
+        OutboxEmail.objects.bulk_update(
+            emails, fields=["status", "attempts", "next_attempt_at", "last_error", "sent_at"]
+        )
+        return len(emails)
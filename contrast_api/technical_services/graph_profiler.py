@@ -0,0 +1,121 @@
+import time
+
+from django.conf import settings
+from django.db import connection, transaction, DatabaseError
+
+from contrast_api.technical_services.telemetry import (
+    measure_phase,
+    evaluate_graph_data,
+    get_request_metrics,
+    has_request_metrics,
+    start_request_metrics,
+    pop_request_metrics,
+)
+from contrast_api.utils import cast_as_boolean
+
+EXPLAINABLE_STATEMENTS = ("SELECT", "WITH")
+
+
+def is_profiling_requested(request) -> bool:
+    return cast_as_boolean(request.query_params.get("profile", False)) and request.user.is_staff
+
+
+def to_json_param(param):
+    if param is None or isinstance(param, (bool, int, float, str)):
+        return param
+    if isinstance(param, (list, tuple)):
+        return [to_json_param(item) for item in param]
+    return str(param)
+
+
+class GraphProfiler:
+    """
+    Captures every SQL statement run in its block with its timing, and the python phases timings (processor,
+    serializer). The read only statements are then explained with EXPLAIN (ANALYZE, BUFFERS), running them again
+    """
+
+    def __init__(self):
+        self.statements = []
+        self.phases = {}
+        self.total_time = 0
+
+    def capture_statement(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.statements.append(dict(sql=sql, params=params, many=many, time=time.perf_counter() - start))
+
+    def __enter__(self):
+        # the phases are measured into the request metrics, that exist only when the telemetry is enabled
+        self.owns_request_metrics = not has_request_metrics()
+        if self.owns_request_metrics:
+            start_request_metrics()
+        self.metrics_before = get_request_metrics()
+        self.statements_wrapper = connection.execute_wrapper(self.capture_statement)
+        self.statements_wrapper.__enter__()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.total_time = time.perf_counter() - self.start
+        self.statements_wrapper.__exit__(*exc_info)
+        metrics = get_request_metrics()
+        self.phases = {
+            metric: value - self.metrics_before.get(metric, 0)
+            for metric, value in metrics.items()
+            if metric.endswith("_time") and metric != "sql_time"
+        }
+        if self.owns_request_metrics:
+            pop_request_metrics()
+
+    def explain(self, sql: str, params) -> str:
+        try:
+            # a failing explain must not break the request transaction, if any
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {sql}", params)
+                return "\n".join(row[0] for row in cursor.fetchall())
+        except DatabaseError as error:
+            return f"explain failed: {error}"
+
+    def to_dict(self) -> dict:
+        sql_time = sum(statement["time"] for statement in self.statements)
+        explained = 0
+        statements = []
+        for statement in self.statements:
+            plan = None
+            is_read_only = statement["sql"].lstrip().upper().startswith(EXPLAINABLE_STATEMENTS)
+            is_explainable = is_read_only and not statement["many"]
+            if is_explainable and explained < settings.GRAPHS_PROFILE_MAX_EXPLAINED_STATEMENTS:
+                plan = self.explain(statement["sql"], statement["params"])
+                explained += 1
+            statements.append(
+                dict(
+                    sql=statement["sql"],
+                    params=to_json_param(statement["params"]),
+                    time_ms=round(statement["time"] * 1000, 3),
+                    plan=plan,
+                )
+            )
+        return dict(
+            total_ms=round(self.total_time * 1000, 3),
+            sql_ms=round(sql_time * 1000, 3),
+            python_ms=round((self.total_time - sql_time) * 1000, 3),
+            phases_ms={phase: round(value * 1000, 3) for phase, value in self.phases.items()},
+            queries=len(self.statements),
+            statements=statements,
+        )
+
+
+def profile_graph(view, graph_type: str, graph_processor_class, queryset, query_params, **serializer_kwargs) -> dict:
+    """
+    Processes the graph as the view does, bypassing the graphs cache, returning the payload with its profile
+    """
+    with GraphProfiler() as profiler:
+        graph_processor = graph_processor_class(queryset, **query_params)
+        with measure_phase("processor_time"):
+            graph_data = evaluate_graph_data(graph_processor.process())
+        serializer = view.get_serializer_by_graph_type(graph_type, data=graph_data, **serializer_kwargs)
+        with measure_phase("serializer_time"):
+            data = serializer.data
+    return dict(data=data, profile=profiler.to_dict())
@@ -0,0 +1,147 @@
+import math
+import time
+from collections import namedtuple
+from typing import Iterable, Optional
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# a graph of a site, the breakdown parameter it's run over (if any) with its options, and its other required params
+GraphBenchmarkSpec = namedtuple(
+    "GraphBenchmarkSpec", ["graph_type", "breakdown_param", "breakdown_options", "params", "many"]
+)
+
+
+def graph_spec(graph_type: str, breakdown_param: str = None, breakdown_options=(), params=None, many=True):
+    return GraphBenchmarkSpec(graph_type, breakdown_param, list(breakdown_options), params or {}, many)
+
+
+def get_contrast_graphs_specs() -> list[GraphBenchmarkSpec]:
+    from configuration.initial_setup import ParentTheories
+    from studies.open_api_parameters import BREAKDOWN_OPTIONS, THEORY_ADDED_BREAKDOWN_OPTIONS
+
+    theory = {"theory": [ParentTheories.GLOBAL_WORKSPACE]}
+    return [
+        graph_spec("nations_of_consciousness"),
+        graph_spec("across_the_years", "breakdown", THEORY_ADDED_BREAKDOWN_OPTIONS),
+        graph_spec("trends_over_years", "breakdown", THEORY_ADDED_BREAKDOWN_OPTIONS),
+        graph_spec("journals", params=theory),
+        graph_spec("parameters_distribution_bar", "breakdown", BREAKDOWN_OPTIONS, params=theory),
+        graph_spec("parameters_distribution_pie", "breakdown", BREAKDOWN_OPTIONS),
+        graph_spec(
+            "parameters_distribution_theories_comparison",
+            "breakdown",
+            THEORY_ADDED_BREAKDOWN_OPTIONS,
+            params={"interpretation": ["pro"]},
+        ),
+        graph_spec("parameters_distribution_free_queries", "breakdown", BREAKDOWN_OPTIONS),
+        graph_spec("frequencies", params=theory),
+        graph_spec("timings", params=theory),
+        graph_spec("theory_driven_distribution_pie", params={"interpretation": ["pro"]}),
+        graph_spec("theory_grand_overview_bar"),
+        graph_spec("brain_images", params=theory),
+    ]
+
+
+def get_uncontrast_graphs_specs() -> list[GraphBenchmarkSpec]:
+    from uncontrast_studies.open_api_parameters import (
+        UNCONTRAST_GRAPH_BREAKDOWN_OPTIONS_WITH_SIGNIFICANCE,
+        UNCONTRAST_GRAPH_CONTINUOUS_BREAKDOWN_OPTIONS,
+    )
+
+    breakdowns = UNCONTRAST_GRAPH_BREAKDOWN_OPTIONS_WITH_SIGNIFICANCE
+    return [
+        graph_spec("nations_of_consciousness"),
+        graph_spec("trends_over_years", "breakdown", breakdowns),
+        graph_spec("journals"),
+        graph_spec("parameters_distribution_bar", "breakdown", breakdowns),
+        graph_spec("parameters_distribution_pie", "breakdown", breakdowns),
+        graph_spec("parameters_distribution_free_queries", "breakdown", breakdowns),
+        graph_spec("parameters_distribution_experiments_comparison", "breakdown", breakdowns),
+        graph_spec(
+            "distribution_of_effects_across_parameters",
+            "continuous_breakdown",
+            UNCONTRAST_GRAPH_CONTINUOUS_BREAKDOWN_OPTIONS,
+        ),
+        graph_spec("grand_overview_pie", many=False),
+    ]
+
+
+def get_sites():
+    from studies.views.experiments_graphs import ExperimentsGraphsViewSet
+    from uncontrast_studies.views.experiments_graphs import UnConExperimentsGraphsViewSet
+
+    return {
+        "contrast": (ExperimentsGraphsViewSet, get_contrast_graphs_specs()),
+        "uncontrast": (UnConExperimentsGraphsViewSet, get_uncontrast_graphs_specs()),
+    }
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    # nearest rank, so it's one of the measured values even for a few repeats
+    return sorted_values[max(math.ceil(fraction * len(sorted_values)) - 1, 0)]
+
+
+def iterate_graph_params(viewset_class, spec: GraphBenchmarkSpec) -> Iterable[tuple[str, dict]]:
+    if spec.breakdown_param is None:
+        yield spec.graph_type, dict(spec.params)
+        return
+    processor_class = viewset_class.graph_processors[spec.graph_type]
+    for option in spec.breakdown_options:
+        # the processors dispatch each breakdown to its process_<breakdown> method
+        if hasattr(processor_class, f"process_{option}"):
+            yield f"{spec.graph_type}:{option}", {**spec.params, spec.breakdown_param: [option]}
+
+
+def run_graph(viewset_class, spec: GraphBenchmarkSpec, params: dict):
+    processor = viewset_class.graph_processors[spec.graph_type](
+        viewset_class.queryset.all(), **{key: list(values) for key, values in params.items()}
+    )
+    graph_data = processor.process()
+    # serializing evaluates the lazy querysets the processors return, as the view does
+    return viewset_class.graph_serializers[spec.graph_type](instance=graph_data, many=spec.many, context={}).data
+
+
+def benchmark_graph(viewset_class, spec: GraphBenchmarkSpec, params: dict, repeat: int, warmup: int) -> dict:
+    durations = []
+    queries = []
+    try:
+        for run in range(warmup + repeat):
+            with CaptureQueriesContext(connection) as captured_queries:
+                start = time.perf_counter()
+                run_graph(viewset_class, spec, params)
+                duration = time.perf_counter() - start
+            if run >= warmup:
+                durations.append(duration * 1000)
+                queries.append(len(captured_queries))
+    except Exception as error:
+        return dict(error=f"{type(error).__name__}: {error}")
+
+    durations.sort()
+    return dict(
+        p50_ms=round(percentile(durations, 0.5), 2),
+        p95_ms=round(percentile(durations, 0.95), 2),
+        mean_ms=round(sum(durations) / len(durations), 2),
+        queries=max(queries),
+    )
+
+
+def run_graphs_benchmark(
+    sites: list[str], repeat: int = 5, warmup: int = 1, graphs: Optional[list[str]] = None, report=print
+) -> dict:
+    """
+    Times every registered graph processor (over each of its breakdowns) of the given sites, serializing included
+    Returns the p50/p95/mean latency and the queries count per graph, keyed by site:graph_type[:breakdown]
+    """
+    results = {}
+    for site, (viewset_class, specs) in get_sites().items():
+        if site not in sites:
+            continue
+        for spec in specs:
+            if graphs and spec.graph_type not in graphs:
+                continue
+            for key, params in iterate_graph_params(viewset_class, spec):
+                result = benchmark_graph(viewset_class, spec, params, repeat, warmup)
+                results[f"{site}:{key}"] = result
+                report(f"{site}:{key} {result}")
+    return results
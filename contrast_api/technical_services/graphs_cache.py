@@ -0,0 +1,42 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import QueryDict
+
+from configuration.models import DatasetVersion
+
+
+class GraphsCacheService:
+    """
+    Caches serialized graph data, keyed by the graph type, the normalized query params and the dataset version.
+    As the dataset version is bumped on any relevant data change, stale entries are never read again and just expire
+    """
+
+    cache_alias = "graphs"
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+
+    @property
+    def cache(self):
+        # resolved lazily, so settings overrides (e.g. in tests) are respected
+        return caches[self.cache_alias]
+
+    def normalize_query_params(self, query_params: QueryDict) -> str:
+        # order independent, both for the keys and for multiple values of the same key
+        normalized = sorted((key, sorted(values)) for key, values in query_params.lists())
+        return json.dumps(normalized)
+
+    def build_key(self, graph_type: str, query_params: QueryDict, dataset_version: int = None) -> str:
+        if dataset_version is None:
+            dataset_version = DatasetVersion.current()
+        params_hash = hashlib.sha1(self.normalize_query_params(query_params).encode("utf-8")).hexdigest()
+        return f"{self.namespace}:{graph_type}:{dataset_version}:{params_hash}"
+
+    def get(self, key: str):
+        return self.cache.get(key)
+
+    def set(self, key: str, data):
+        self.cache.set(key, data, timeout=settings.GRAPHS_CACHE_TIMEOUT)
@@ -0,0 +1,155 @@
+import bisect
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.db.models import QuerySet
+
+_request_metrics = threading.local()
+
+TIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+SIZE_BUCKETS = (1_000, 10_000, 100_000, 500_000, 1_000_000, 5_000_000, 10_000_000)
+
+# metric, its histogram buckets and its prometheus name
+METRICS = {
+    "queries": (COUNT_BUCKETS, "contrast_api_request_queries"),
+    "sql_time": (TIME_BUCKETS, "contrast_api_request_sql_seconds"),
+    "processor_time": (TIME_BUCKETS, "contrast_api_request_processor_seconds"),
+    "serializer_time": (TIME_BUCKETS, "contrast_api_request_serializer_seconds"),
+    "response_time": (TIME_BUCKETS, "contrast_api_request_seconds"),
+    "response_size": (SIZE_BUCKETS, "contrast_api_response_size_bytes"),
+}
+
+
+class Histogram:
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        # the last count is for values above the highest bucket
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += 1
+        self.sum += value
+
+    def cumulative_counts(self) -> list[tuple]:
+        cumulative = 0
+        counts = []
+        for bucket, count in zip(self.buckets + ("+Inf",), self.counts):
+            cumulative += count
+            counts.append((bucket, cumulative))
+        return counts
+
+    def to_dict(self) -> dict:
+        return dict(
+            count=self.total,
+            sum=self.sum,
+            avg=self.sum / self.total if self.total else 0,
+            buckets={str(bucket): count for bucket, count in self.cumulative_counts()},
+        )
+
+
+class EndpointsTelemetry:
+    """
+    In process histograms of the requests metrics, per resolved view (e.g. experiments-graphs-journals)
+    Each worker process keeps its own histograms, from its start
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints = defaultdict(dict)
+
+    def record(self, endpoint: str, metrics: dict):
+        with self.lock:
+            endpoint_histograms = self.endpoints[endpoint]
+            for metric, value in metrics.items():
+                if metric not in endpoint_histograms:
+                    endpoint_histograms[metric] = Histogram(METRICS[metric][0])
+                endpoint_histograms[metric].observe(value)
+
+    def reset(self):
+        with self.lock:
+            self.endpoints.clear()
+
+    def to_dict(self) -> dict:
+        with self.lock:
+            return {
+                endpoint: {metric: histogram.to_dict() for metric, histogram in histograms.items()}
+                for endpoint, histograms in sorted(self.endpoints.items())
+            }
+
+    def to_prometheus_text(self) -> str:
+        lines = []
+        with self.lock:
+            for metric, (buckets, name) in METRICS.items():
+                lines.append(f"# TYPE {name} histogram")
+                for endpoint, histograms in sorted(self.endpoints.items()):
+                    histogram = histograms.get(metric)
+                    if histogram is None:
+                        continue
+                    for bucket, count in histogram.cumulative_counts():
+                        lines.append(f'{name}_bucket{{endpoint="{endpoint}",le="{bucket}"}} {count}')
+                    lines.append(f'{name}_sum{{endpoint="{endpoint}"}} {histogram.sum}')
+                    lines.append(f'{name}_count{{endpoint="{endpoint}"}} {histogram.total}')
+        return "\n".join(lines) + "\n"
+
+
+endpoints_telemetry = EndpointsTelemetry()
+
+
+def start_request_metrics():
+    _request_metrics.metrics = defaultdict(float)
+
+
+def pop_request_metrics() -> dict:
+    return _request_metrics.__dict__.pop("metrics", {})
+
+
+def has_request_metrics() -> bool:
+    return hasattr(_request_metrics, "metrics")
+
+
+def get_request_metrics() -> dict:
+    return dict(getattr(_request_metrics, "metrics", {}))
+
+
+def add_request_metric(metric: str, value):
+    metrics = getattr(_request_metrics, "metrics", None)
+    # outside of a request (e.g. commands, or the graphs batch worker threads) nothing is recorded
+    if metrics is not None:
+        metrics[metric] += value
+
+
+@contextmanager
+def measure_phase(metric: str):
+    """
+    Adds the time spent in the block to the current request metric, e.g. processor_time or serializer_time
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_request_metric(metric, time.perf_counter() - start)
+
+
+def evaluate_graph_data(graph_data):
+    """
+    Processors often return lazy querysets, evaluated here so their SQL is measured as processor time and not while
+    serializing
+    """
+    if isinstance(graph_data, QuerySet):
+        return list(graph_data)
+    return graph_data
+
+
+def sql_timing_wrapper(execute, sql, params, many, context):
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        add_request_metric("queries", 1)
+        add_request_metric("sql_time", time.perf_counter() - start)
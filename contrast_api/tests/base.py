@@ -130,9 +130,11 @@ class BaseTestCase(APITestCase):
         return theory
 
     def given_interpretation_exist(self, experiment: Experiment, theory: Theory, interpretation_type: str):
-        interpretation, created = Interpretation.objects.get_or_create(
-            experiment=experiment, theory=theory, type=interpretation_type
-        )
+        # the aggregated interpretations are refreshed on commit, which the test transaction never reaches
+        with self.captureOnCommitCallbacks(execute=True):
+            interpretation, created = Interpretation.objects.get_or_create(
+                experiment=experiment, theory=theory, type=interpretation_type
+            )
         return interpretation
 
     def given_paradigm_exists(self, name: str, parent: Optional[Paradigm] = None):
@@ -220,7 +222,7 @@ class BaseTestCase(APITestCase):
         res = self.client.get(self.reverse_with_query_params("authors-list", search=part_name))
         return res
 
-    def when_admin_approves_study(self, study_id: int):
+    def when_admin_approves_study(self, study_id: int | list[int]):
         res = self.client.post(
             reverse("admin:studies_study_changelist"), data=dict(action="approve_study", _selected_action=study_id)
         )
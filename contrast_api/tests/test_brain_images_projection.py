@@ -0,0 +1,28 @@
+import nibabel as nib
+import numpy as np
+from nilearn import datasets, surface
+
+from contrast_api.application_services.brain_images import build_region_projection_matrix
+from contrast_api.tests.base import BaseTestCase
+
+
+class BrainImagesProjectionTestCase(BaseTestCase):
+    def test_projected_texture_matches_vol_to_surf_of_the_composed_volume(self):
+        # fsaverage5 ships with nilearn, and a coarse synthetic label volume over the MNI space stands for the atlas
+        pial_left = surface.load_surf_mesh(datasets.fetch_surf_fsaverage(mesh="fsaverage5").pial_left)
+        affine = np.array([[8, 0, 0, -80], [0, 8, 0, -112], [0, 0, 8, -72], [0, 0, 0, 1]], dtype=float)
+        label_volume = np.zeros((20, 28, 20), dtype=np.int32)
+        label_volume[:10, :14, :] = 3
+        label_volume[:10, 14:, :10] = 7
+        label_volume[:10, 14:, 10:] = 12
+
+        projection, region_codes = build_region_projection_matrix(pial_left, label_volume, affine)
+
+        opacity_by_region_code = np.zeros(13)
+        opacity_by_region_code[[3, 7, 12]] = [0.25, 1.0, 0.5]
+        composed_img = nib.Nifti1Image(opacity_by_region_code[label_volume], affine=affine)
+        expected_texture = np.nan_to_num(surface.vol_to_surf(composed_img, pial_left))
+
+        texture = projection @ opacity_by_region_code[region_codes]
+        np.testing.assert_allclose(texture, expected_texture, atol=1e-9)
+        self.assertGreater(np.count_nonzero(texture), 0)
@@ -0,0 +1,73 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from contrast_api.technical_services.telemetry import endpoints_telemetry, evaluate_graph_data
+from contrast_api.tests.base import BaseTestCase
+from studies.models import Study
+
+
+@override_settings(TELEMETRY_ENABLED=True)
+class TelemetryTestCase(BaseTestCase):
+    def setUp(self):
+        endpoints_telemetry.reset()
+
+    def test_graph_requests_are_recorded_per_view(self):
+        gnw_theory = self.given_theory_exists(parent=None, name="GNW", acronym="GNW")
+        self.given_study_exists(title="Israeli study", abbreviated_source_title="the first journal")
+        for is_csv in ["false", "0"]:
+            res = self.client.get(reverse("experiments-graphs-journals"), {"theory": gnw_theory.id, "is_csv": is_csv})
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        journals_metrics = endpoints_telemetry.to_dict()["experiments-graphs-journals"]
+        self.assertEqual(journals_metrics["response_time"]["count"], 2)
+        self.assertEqual(journals_metrics["processor_time"]["count"], 2)
+        self.assertEqual(journals_metrics["serializer_time"]["count"], 2)
+        self.assertGreater(journals_metrics["queries"]["sum"], 0)
+        self.assertGreater(journals_metrics["response_size"]["sum"], 0)
+
+    def test_streamed_csv_size_is_recorded_once_consumed(self):
+        gnw_theory = self.given_theory_exists(parent=None, name="GNW", acronym="GNW")
+        self.given_study_exists(title="Israeli study", abbreviated_source_title="the first journal")
+        res = self.client.get(reverse("experiments-graphs-journals"), {"theory": gnw_theory.id, "is_csv": "true"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn("experiments-graphs-journals", endpoints_telemetry.to_dict())
+
+        content = b"".join(res.streaming_content)
+        journals_metrics = endpoints_telemetry.to_dict()["experiments-graphs-journals"]
+        self.assertEqual(journals_metrics["response_time"]["count"], 1)
+        self.assertEqual(journals_metrics["response_size"]["sum"], len(content))
+
+    def test_telemetry_is_exposed_to_staff_only(self):
+        self.client.get(reverse("healthcheck"))
+        res = self.client.get(reverse("telemetry"))
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.given_user_exists(username="user")
+        self.given_user_authenticated("user", "12345")
+        res = self.client.get(reverse("telemetry"))
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.given_user_exists(username="staff_user", is_staff=True)
+        self.given_user_authenticated("staff_user", "12345")
+        res = self.client.get(reverse("telemetry"))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()["healthcheck"]["response_time"]["count"], 1)
+
+        res = self.client.get(reverse("telemetry"), {"format": "prometheus"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('contrast_api_request_seconds_count{endpoint="healthcheck"}', res.content.decode())
+
+        # as prometheus scrapers ask for it
+        res = self.client.get(reverse("telemetry"), HTTP_ACCEPT="text/plain;version=0.0.4;q=0.5,*/*;q=0.1")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('contrast_api_request_seconds_count{endpoint="healthcheck"}', res.content.decode())
+
+    def test_lazy_graph_data_is_evaluated_in_the_processor_phase(self):
+        self.given_study_exists(title="Israeli study", abbreviated_source_title="the first journal")
+        titles = Study.objects.values_list("title", flat=True)
+        with self.assertNumQueries(1):
+            graph_data = evaluate_graph_data(titles)
+        with self.assertNumQueries(0):
+            self.assertEqual(graph_data, ["Israeli study"])
+        self.assertIs(evaluate_graph_data(graph_data), graph_data)
@@ -31,6 +31,7 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path("", include(tf_urls)),
     path("health_check", views.healthcheck, name="healthcheck"),
+    path("telemetry", views.telemetry, name="telemetry"),
     path("api/api-token-auth/", TokenObtainPairView.as_view(), name="api-token-obtain-pair"),
     path("api/api-token-refresh/", TokenRefreshView.as_view(), name="api-token-refresh"),
     path("api/studies/", include("studies.urls")),
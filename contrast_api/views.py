@@ -1,5 +1,38 @@
+import json
+
 from django.http import JsonResponse
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.response import Response
+
+from contrast_api.technical_services.telemetry import endpoints_telemetry
+
+
+class PrometheusTextRenderer(BaseRenderer):
+    media_type = "text/plain"
+    format = "prometheus"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not isinstance(data, str):
+            # errors, e.g. a scraper without a valid token
+            data = json.dumps(data)
+        return data.encode(self.charset)
 
 
 def healthcheck(request):
     return JsonResponse({"status": "OK"})
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+@renderer_classes([JSONRenderer, PrometheusTextRenderer])
+def telemetry(request):
+    """
+    Staff only, the per view requests histograms of the serving process, as JSON or as prometheus text
+    (?format=prometheus, or a text/plain Accept header as sent by prometheus scrapers)
+    """
+    if request.accepted_renderer.format == PrometheusTextRenderer.format:
+        return Response(endpoints_telemetry.to_prometheus_text())
+    return Response(endpoints_telemetry.to_dict())
@@ -0,0 +1,16 @@
+# Picked up automatically by gunicorn from the working directory
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def post_worker_init(worker):
+    # the django app is loaded at this point, so warm up the atlas before the worker takes its first request
+    # it's only loaded from the files built by load_atlas_data, anything slower is left to the first request
+    from contrast_api.application_services.brain_images import AALAtlasRegistry
+
+    try:
+        AALAtlasRegistry.warm_up()
+    except Exception:
+        # not fatal, the first brain images request would load it lazily
+        logger.exception("Failed warming up the AAL atlas registry")
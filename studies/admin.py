@@ -12,6 +12,7 @@ from import_export.formats.base_formats import CSV
 from contrast_api.admin_utils import SimpleHistoryWithDeletedAdmin
 from contrast_api.domain_services.study_lifecycle import StudyLifeCycleService
 from contrast_api.choices import InterpretationsChoices, TheoryDrivenChoices
+from studies.services.admin_facets_svc import get_countries_facet, get_journals_facet
 from studies.models import (
     Study,
     Experiment,
@@ -33,6 +34,7 @@ from studies.models import (
     Technique,
     Theory,
     AggregatedInterpretation,
+    BrainImage,
 )
 from studies.models.finding_tag import AALAtlasTag
 from studies.models.stimulus import StimulusCategory, StimulusSubCategory, Stimulus
@@ -271,15 +273,11 @@ class CountryFilter(admin.SimpleListFilter):
     parameter_name = "country"
 
     def lookups(self, request, model_admin):
-        # Get a list of all distinct countries that exist in the database
-        existing_countries = model_admin.get_queryset(request).values_list("countries", flat=True).distinct()
-        flattened_existing_countries = sorted(
-            set(country for the_countries in existing_countries for country in the_countries)
-        )
-
-        # Create a list of tuples for the filter dropdown
+        # Countries that exist in the database with their studies count, cached per dataset version
         # Each tuple contains the country code and name
-        return [(country, countries.name(country)) for country in flattened_existing_countries]
+        return [
+            (country, f"{countries.name(country)} ({count})") for country, count in get_countries_facet() if country
+        ]
 
     def queryset(self, request, queryset):
         # If a country code is selected in the filter,
@@ -293,16 +291,11 @@ class JournalFilter(admin.SimpleListFilter):
     parameter_name = "journal"
 
     def lookups(self, request, model_admin):
-        # Get a list of all distinct countries that exist in the database
-        existing_journals = (
-            model_admin.get_queryset(request).values_list("abbreviated_source_title", flat=True).distinct()
-        )
-
-        # Create a list of tuples for the filter dropdown
-        # Each tuple contains the country code and name
-        return [(journal, journal.capitalize()) for journal in existing_journals if journal is not None] + [
-            ("None", "None")
-        ]
+        # Journals that exist in the database with their studies count, cached per dataset version
+        journals = dict(get_journals_facet())
+        return [
+            (journal, f"{journal.capitalize()} ({count})") for journal, count in journals.items() if journal is not None
+        ] + [("None", f"None ({journals.get(None, 0)})")]
 
     def queryset(self, request, queryset):
         # If a country code is selected in the filter,
@@ -497,6 +490,13 @@ class AggregatedInterpretationAdmin(ImportExportModelAdmin):
     list_filter = ("type", "parent_theory_names")
 
 
+class BrainImageAdmin(admin.ModelAdmin):
+    list_display = ("id", "theory", "key", "created_at")
+    model = BrainImage
+    list_filter = ("theory",)
+    exclude = ("payload",)
+
+
 class MeasureTypeAdmin(ImportExportModelAdmin):
     model = MeasureType
 
@@ -633,6 +633,7 @@ admin.site.register(FindingTagType, FindingTagTypeAdmin)
 admin.site.register(FindingTag, FindingTagAdmin)
 admin.site.register(Interpretation, InterpretationAdmin)
 admin.site.register(AggregatedInterpretation, AggregatedInterpretationAdmin)
+admin.site.register(BrainImage, BrainImageAdmin)
 admin.site.register(MeasureType, MeasureTypeAdmin)
 admin.site.register(Measure, MeasureAdmin)
 admin.site.register(Paradigm, ParadigmAdmin)
@@ -1,26 +1,86 @@
 from django.apps import AppConfig
-from django.db.models.signals import post_save, m2m_changed
+from django.db.models import Q
+from django.db.models.signals import post_save, post_delete, m2m_changed
 
 
-def setup_aggregated_interpretations_via_direct_create(sender, instance, created, **kwargs):
-    # Imported here because else it would run before the models are ready
-    from studies.models import AggregatedInterpretation
+def setup_aggregated_interpretations_via_direct_create(sender, instance, **kwargs):
+    from studies.services.aggregated_Interpretations_svc import schedule_aggregated_interpretations_refresh
 
-    AggregatedInterpretation.setup_aggregate_interpretations(instance.experiment_id)
+    schedule_aggregated_interpretations_refresh([instance.experiment_id])
 
 
 def setup_aggregated_interpretations_via_add(sender, instance, pk_set, action, **kwargs):
     # in this case the sender can be the experiment, or the theory adding the interpretations
     if action not in ["post_add", "post_remove", "post_clear"]:
         return
-    from studies.models import AggregatedInterpretation, Experiment, Theory
+    from studies.models import Experiment, Theory
+    from studies.services.aggregated_Interpretations_svc import schedule_aggregated_interpretations_refresh
 
     if isinstance(instance, Experiment):
-        AggregatedInterpretation.setup_aggregate_interpretations(instance.id)
+        schedule_aggregated_interpretations_refresh([instance.id])
 
-    elif isinstance(instance, Theory):
-        for pk in pk_set:
-            AggregatedInterpretation.setup_aggregate_interpretations(pk)
+    elif isinstance(instance, Theory) and pk_set:
+        schedule_aggregated_interpretations_refresh(pk_set)
+
+
+def refresh_experiment_facts_via_experiment(sender, instance, **kwargs):
+    from studies.services.experiment_facts_svc import schedule_experiment_facts_refresh
+
+    schedule_experiment_facts_refresh([instance.id])
+
+
+def refresh_experiment_facts_via_related(sender, instance, **kwargs):
+    # samples, tasks, stimuli, measures, finding tags etc. all belong to a single experiment
+    from studies.services.experiment_facts_svc import schedule_experiment_facts_refresh
+
+    schedule_experiment_facts_refresh([instance.experiment_id])
+
+
+def refresh_experiment_facts_via_study(sender, instance, **kwargs):
+    # the countries and year are the study's
+    from studies.services.experiment_facts_svc import schedule_experiment_facts_refresh
+
+    schedule_experiment_facts_refresh(instance.experiments.values_list("id", flat=True))
+
+
+# the experiments of each facts lookup model, whose facts store its name
+FACTS_LOOKUP_MODELS_EXPERIMENTS = {
+    "Paradigm": ["paradigms", "paradigms__parent"],
+    "Technique": ["techniques"],
+    "TaskType": ["tasks__type"],
+    "StimulusCategory": ["stimuli__category"],
+    "ModalityType": ["stimuli__modality"],
+    "ConsciousnessMeasurePhaseType": ["consciousness_measures__phase"],
+    "ConsciousnessMeasureType": ["consciousness_measures__type"],
+    "FindingTagType": ["finding_tags__type"],
+    "FindingTagFamily": ["finding_tags__family"],
+    "MeasureType": ["measures__type"],
+}
+
+
+def refresh_experiment_facts_via_lookup(sender, instance, **kwargs):
+    # e.g. a renamed technique, the facts of its experiments hold its former name
+    from studies.models import Experiment
+    from studies.services.experiment_facts_svc import schedule_experiment_facts_refresh
+
+    experiments_filter = Q()
+    for lookup in FACTS_LOOKUP_MODELS_EXPERIMENTS[sender.__name__]:
+        experiments_filter |= Q(**{lookup: instance})
+    schedule_experiment_facts_refresh(
+        Experiment.objects.filter(experiments_filter).order_by().values_list("id", flat=True).distinct()
+    )
+
+
+def refresh_experiment_facts_via_add(sender, instance, pk_set, action, reverse, **kwargs):
+    # in this case the sender can be the experiment, or the paradigm / technique it's added to
+    if action not in ["post_add", "post_remove", "post_clear"]:
+        return
+    from studies.services.experiment_facts_svc import schedule_experiment_facts_refresh
+
+    if not reverse:
+        schedule_experiment_facts_refresh([instance.id])
+    elif pk_set:
+        schedule_experiment_facts_refresh(pk_set)
 
 
 class StudiesConfig(AppConfig):
@@ -28,9 +88,29 @@ class StudiesConfig(AppConfig):
     name = "studies"
 
     def ready(self):
-        from studies.models import Interpretation
-        from contrast_api.application_services.brain_images import get_AAL_Atlas_datasets
+        from studies.models import (
+            Interpretation,
+            Experiment,
+            Study,
+            Sample,
+            Task,
+            Stimulus,
+            ConsciousnessMeasure,
+            Measure,
+            FindingTag,
+        )
 
         post_save.connect(receiver=setup_aggregated_interpretations_via_direct_create, sender=Interpretation)
+        post_delete.connect(receiver=setup_aggregated_interpretations_via_direct_create, sender=Interpretation)
         m2m_changed.connect(receiver=setup_aggregated_interpretations_via_add, sender=Interpretation)
-        # get_AAL_Atlas_datasets()  ## init the library startup once, so it would download on start
+
+        post_save.connect(receiver=refresh_experiment_facts_via_experiment, sender=Experiment)
+        post_save.connect(receiver=refresh_experiment_facts_via_study, sender=Study)
+        for related_model in [Sample, Task, Stimulus, ConsciousnessMeasure, Measure, FindingTag]:
+            post_save.connect(receiver=refresh_experiment_facts_via_related, sender=related_model)
+            post_delete.connect(receiver=refresh_experiment_facts_via_related, sender=related_model)
+        for through_model in [Experiment.paradigms.through, Experiment.techniques.through]:
+            m2m_changed.connect(receiver=refresh_experiment_facts_via_add, sender=through_model)
+        for lookup_model_name in FACTS_LOOKUP_MODELS_EXPERIMENTS:
+            post_save.connect(receiver=refresh_experiment_facts_via_lookup, sender=f"studies.{lookup_model_name}")
+        # the AAL atlas is warmed up per gunicorn worker, see gunicorn.conf.py
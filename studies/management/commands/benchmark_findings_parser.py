@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from contrast_api.data_migration_functionality.helpers import get_list_from_excel
+from studies.parsers.findings_tokenizer import parse_findings
+from studies.parsers.parsing_findings_Contrast2 import parse
+
+
+def get_decoded_findings(parser, text):
+    try:
+        return [(type(finding), vars(finding)) for finding in parser(text)]
+    except Exception as error:
+        return type(error)
+
+
+class Command(BaseCommand):
+    help = "Check the findings tokenizer against the original findings parser over a spreadsheet column, and time both"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--file", type=str, default="studies/data/Contrast2_Existing_Data.xlsx")
+        parser.add_argument("--sheet", type=str, default="sheet1")
+        parser.add_argument("--column", type=str, default="Findings.NCC Tags")
+        parser.add_argument("--repeat", type=int, default=10, help="Passes over the column for the timing")
+
+    def handle(self, *args, **options):
+        rows = get_list_from_excel(options["file"], sheet_name=options["sheet"])
+        texts = [row[options["column"]] for row in rows]
+
+        mismatches = 0
+        for index, text in enumerate(texts):
+            if get_decoded_findings(parse, text) != get_decoded_findings(parse_findings, text):
+                mismatches += 1
+                self.stdout.write(self.style.WARNING(f"row #{index} decoded differently: {text}"))
+
+        for parser_name, parser in [("parser", parse), ("tokenizer", parse_findings)]:
+            start = time.perf_counter()
+            for _ in range(options["repeat"]):
+                for text in texts:
+                    get_decoded_findings(parser, text)
+            elapsed_ms = (time.perf_counter() - start) * 1000 / options["repeat"]
+            self.stdout.write(f"{parser_name}: {elapsed_ms:.1f}ms per pass over {len(texts)} rows")
+
+        if mismatches:
+            raise CommandError(f"{mismatches} of {len(texts)} rows decoded differently")
+        self.stdout.write(self.style.SUCCESS(f"All {len(texts)} rows decoded the same"))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from studies.models import Experiment, ExperimentFact
+
+
+class Command(BaseCommand):
+    help = "Rebuild the experiment facts table the graphs aggregate over, for all experiments"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Experiments refreshed per transaction")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        experiment_ids = list(Experiment.objects.order_by("id").values_list("id", flat=True))
+        # experiments that no longer exist are removed by the cascade, so this only needs to cover the current ones
+        for start in range(0, len(experiment_ids), batch_size):
+            ExperimentFact.refresh_experiments_facts(experiment_ids[start : start + batch_size])
+            self.stdout.write(f"Refreshed {min(start + batch_size, len(experiment_ids))}/{len(experiment_ids)}")
+
+        self.stdout.write(self.style.SUCCESS(f"Stored {ExperimentFact.objects.count()} experiment facts"))
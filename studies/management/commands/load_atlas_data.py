@@ -1,12 +1,15 @@
 from django.core.management.base import BaseCommand
 
-from contrast_api.application_services.brain_images import get_AAL_Atlas_datasets
+from contrast_api.application_services.brain_images import AALAtlasRegistry
 
 
 class Command(BaseCommand):
-    help = "Load and cache the AAL atlas datasets for brain image generation"
+    help = (
+        "Load and cache the AAL atlas datasets for brain image generation, and build the regions projection matrix"
+        " - run at build time, so the matrix ships with the app rather than being built by the web workers"
+    )
 
     def handle(self, *args, **options):
         self.stdout.write("Loading AAL atlas datasets...")
-        get_AAL_Atlas_datasets()
+        AALAtlasRegistry.get()
         self.stdout.write(self.style.SUCCESS("Successfully loaded and cached all atlas datasets"))
@@ -1,13 +1,15 @@
 import logging
+from collections import defaultdict
 
 import pandas
 from django.core.management import BaseCommand
-from django.db import transaction
+from django.db import transaction, IntegrityError
 
 from studies.parsers.parsing_findings_Contrast2 import FindingTagDataError
 from studies.parsers.process_row import (
     process_row,
 )
+from studies.parsers.staged_import import LookupTables, parse_row, persist_experiments, recompute_derived_data
 from contrast_api.data_migration_functionality.create_study import create_study
 from contrast_api.data_migration_functionality.errors import (
     MissingStimulusCategoryError,
@@ -25,45 +27,84 @@ from contrast_api.data_migration_functionality.studies_parsing_helpers import Pr
 
 logger = logging.getLogger("Contrast2")
 
+# row error, the problematic data sheet the row is logged to, and the log message
+ROW_ERRORS = [
+    (IncoherentStimuliDataError, "IncoherentStimuli", "has incoherent stimuli data"),
+    (ParadigmDataException, "ParadigmData", "has bad paradigm data"),
+    (MissingValueInStimuliError, "MissingValueStimuliData", "is missing 1 or more values in stimuli data"),
+    (StimulusDurationError, "StimulusDuration", "has problematic stimulus duration data"),
+    (MissingStimulusCategoryError, "StimulusCategory", "did not find matching stimulus category or sub-category"),
+    (ProblemInTheoryDrivenExistingDataException, "TheoryDriven", "is problematic regarding to theory driven data"),
+    (IncoherentSampleDataError, "IncoherentSample", "has incoherent sample data"),
+    (SampleTypeError, "SampleType", "is problematic regarding to sample type"),
+    (ProblemInStudyExistingDataException, "ExperimentStudyData", "is problematic regarding to study data"),
+    (
+        InvalidConsciousnessMeasureDataError,
+        "ConsciousnessMeasureData",
+        "is problematic regarding to consciousness measure data",
+    ),
+    (FindingTagDataError, "FindingTag", "is problematic regarding to finding tag data"),
+]
+ROW_ERRORS_CLASSES = tuple(error_class for error_class, sheet_name, message in ROW_ERRORS)
+
+PROBLEMATIC_DATA_SHEETS = [
+    "FindingTag",
+    "StudyData",
+    "ParadigmData",
+    "IncoherentStimuli",
+    "MissingValueStimuliData",
+    "StimulusDuration",
+    "StimulusCategory",
+    "TheoryDriven",
+    "IncoherentSample",
+    "SampleType",
+    "ExperimentStudyData",
+    "ConsciousnessMeasureData",
+    "ExcludedItems",
+    "PersistenceError",
+]
+
 
 class Command(BaseCommand):
     help = "Load historic data"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--staged",
+            action="store_true",
+            help="Parse and validate all rows first, then bulk insert them in chunks and recompute derived data once",
+        )
+        parser.add_argument("--batch-size", type=int, default=200, help="Rows per bulk insert transaction (staged)")
+
     def handle(self, *args, **options):
         # Read .xlsx file and convert to dict
         historic_data_list = get_list_from_excel("studies/data/Contrast2_Existing_Data.xlsx", sheet_name="sheet1")
         studies_historic_data_list = get_list_from_excel(
             "studies/data/Contrast2_Existing_Data.xlsx", sheet_name="Included_Metadata"
         )
+        problematic_data_logs = defaultdict(list)
 
         # iterate over studies
-        studies_problematic_data_log = []
         for study_item in studies_historic_data_list:
             try:
                 with transaction.atomic():
                     create_study(item=study_item, unconsciousness=False)
             except ProblemInStudyExistingDataException:
-                studies_problematic_data_log.append(study_item)
+                problematic_data_logs["StudyData"].append(study_item)
 
         # iterate over experiments
-        stimuli_incoherent_data_log = []
-        stimuli_duration_data_log = []
-        stimuli_missing_value_data_log = []
-        stimuli_missing_object_data_log = []
-        paradigms_log = []
-        theory_driven_problematic_data_log = []
-        sample_incoherent_data_log = []
-        sample_type_errors_log = []
-        experiment_studies_problematic_data_log = []
-        consciousness_measure_problematic_data_log = []
-        finding_tags_problematic_data_log = []
-        items_to_exclude = []
-
-        for item in historic_data_list:
-            index = historic_data_list.index(item)
+        if options["staged"]:
+            self.load_experiments_staged(historic_data_list, problematic_data_logs, options["batch_size"])
+        else:
+            self.load_experiments(historic_data_list, problematic_data_logs)
+
+        self.write_problematic_data(problematic_data_logs)
+
+    def load_experiments(self, historic_data_list, problematic_data_logs):
+        for index, item in enumerate(historic_data_list):
             is_included = bool(item["Should be included?"])
             if not is_included:
-                items_to_exclude.append(item)
+                problematic_data_logs["ExcludedItems"].append(item)
                 print(f"row #{index} removed")
                 continue
 
@@ -71,80 +112,54 @@ class Command(BaseCommand):
                 with transaction.atomic():
                     process_row(item)
                     print(f"row #{index} completed")
+            except ROW_ERRORS_CLASSES as error:
+                self.log_row_error(error, index, item, problematic_data_logs)
 
-            except IncoherentStimuliDataError:
-                stimuli_incoherent_data_log.append(item)
-                logger.exception(f"row #{index} has incoherent stimuli data")
-
-            except ParadigmDataException:
-                paradigms_log.append(item)
-                logger.exception(f"row #{index} has bad paradigm data")
-
-            except MissingValueInStimuliError:
-                stimuli_missing_value_data_log.append(item)
-                logger.exception(f"row #{index} is missing 1 or more values in stimuli data")
-
-            except StimulusDurationError:
-                stimuli_duration_data_log.append(item)
-                logger.exception(f"row #{index} has problematic stimulus duration data")
-
-            except MissingStimulusCategoryError:
-                stimuli_missing_object_data_log.append(item)
-                logger.exception(f"row #{index} did not find matching stimulus category or sub-category")
-
-            except ProblemInTheoryDrivenExistingDataException:
-                theory_driven_problematic_data_log.append(item)
-                logger.exception(f"row #{index} is problematic regarding to theory driven data")
-
-            except IncoherentSampleDataError:
-                sample_incoherent_data_log.append(item)
-                logger.exception(f"row #{index} has incoherent sample data")
-
-            except SampleTypeError:
-                sample_type_errors_log.append(item)
-                logger.exception(f"row #{index} is problematic regarding to sample type")
-
-            except ProblemInStudyExistingDataException:
-                experiment_studies_problematic_data_log.append(item)
-                logger.exception(f"row #{index} is problematic regarding to study data")
-
-            except InvalidConsciousnessMeasureDataError:
-                consciousness_measure_problematic_data_log.append(item)
-                logger.exception(f"row #{index} is problematic regarding to consciousness measure data")
-
-            except FindingTagDataError:
-                finding_tags_problematic_data_log.append(item)
-                logger.exception(f"row #{index} is problematic regarding to finding tag data")
-
-            # iterate over problematic data and add them to .xlsx file in respective sheets
-            df_studies = pandas.DataFrame.from_records(studies_problematic_data_log)
-            df_paradigms = pandas.DataFrame.from_records(paradigms_log)
-            df_incoherent_stimuli = pandas.DataFrame.from_records(stimuli_incoherent_data_log)
-            df_missing_value_stimuli = pandas.DataFrame.from_records(stimuli_missing_value_data_log)
-            df_bad_duration_stimuli = pandas.DataFrame.from_records(stimuli_duration_data_log)
-            df_missing_category_stimuli = pandas.DataFrame.from_records(stimuli_missing_object_data_log)
-            df_theory_driven = pandas.DataFrame.from_records(theory_driven_problematic_data_log)
-            df_incoherent_sample = pandas.DataFrame.from_records(sample_incoherent_data_log)
-            df_sample_type = pandas.DataFrame.from_records(sample_type_errors_log)
-            df_study_in_experiment = pandas.DataFrame.from_records(experiment_studies_problematic_data_log)
-            df_consciousness_measure = pandas.DataFrame.from_records(consciousness_measure_problematic_data_log)
-            df_finding_tag = pandas.DataFrame.from_records(finding_tags_problematic_data_log)
-            df_items_to_exclude = pandas.DataFrame.from_records(items_to_exclude)
-
+    def load_experiments_staged(self, historic_data_list, problematic_data_logs, batch_size):
+        lookups = LookupTables()
+        parsed_rows = []
+        for index, item in enumerate(historic_data_list):
+            is_included = bool(item["Should be included?"])
+            if not is_included:
+                problematic_data_logs["ExcludedItems"].append(item)
+                continue
+            try:
+                parsed_rows.append(parse_row(index, item, lookups))
+            except ROW_ERRORS_CLASSES as error:
+                self.log_row_error(error, index, item, problematic_data_logs)
+        print(f"{len(parsed_rows)} rows parsed, {len(historic_data_list) - len(parsed_rows)} excluded or problematic")
+
+        experiment_ids = []
+        for start in range(0, len(parsed_rows), batch_size):
+            chunk = parsed_rows[start : start + batch_size]
             try:
-                with pandas.ExcelWriter("studies/data/Contrast2_Problematic_Data.xlsx") as writer:
-                    df_finding_tag.to_excel(writer, sheet_name="FindingTag", index=False)
-                    df_studies.to_excel(writer, sheet_name="StudyData", index=False)
-                    df_paradigms.to_excel(writer, sheet_name="ParadigmData", index=False)
-                    df_incoherent_stimuli.to_excel(writer, sheet_name="IncoherentStimuli", index=False)
-                    df_missing_value_stimuli.to_excel(writer, sheet_name="MissingValueStimuliData", index=False)
-                    df_bad_duration_stimuli.to_excel(writer, sheet_name="StimulusDuration", index=False)
-                    df_missing_category_stimuli.to_excel(writer, sheet_name="StimulusCategory", index=False)
-                    df_theory_driven.to_excel(writer, sheet_name="TheoryDriven", index=False)
-                    df_incoherent_sample.to_excel(writer, sheet_name="IncoherentSample", index=False)
-                    df_sample_type.to_excel(writer, sheet_name="SampleType", index=False)
-                    df_study_in_experiment.to_excel(writer, sheet_name="ExperimentStudyData", index=False)
-                    df_consciousness_measure.to_excel(writer, sheet_name="ConsciousnessMeasureData", index=False)
-                    df_items_to_exclude.to_excel(writer, sheet_name="ExcludedItems", index=False)
-            except AttributeError as error:
-                logger.exception(f"{error.name} occurred while writing to excel")
+                experiment_ids.extend(persist_experiments(chunk))
+            except IntegrityError:
+                # a single bad row fails its whole chunk, so it's retried row by row
+                for parsed_row in chunk:
+                    try:
+                        experiment_ids.extend(persist_experiments([parsed_row]))
+                    except IntegrityError:
+                        problematic_data_logs["PersistenceError"].append(parsed_row.item)
+                        logger.exception(f"row #{parsed_row.index} failed to be stored")
+            print(f"rows {start}-{start + len(chunk)} of {len(parsed_rows)} stored")
+
+        recompute_derived_data(experiment_ids, batch_size)
+        print(f"{len(experiment_ids)} experiments loaded")
+
+    def log_row_error(self, error, index, item, problematic_data_logs):
+        for error_class, sheet_name, message in ROW_ERRORS:
+            if isinstance(error, error_class):
+                problematic_data_logs[sheet_name].append(item)
+                logger.exception(f"row #{index} {message}")
+                return
+
+    def write_problematic_data(self, problematic_data_logs):
+        # iterate over problematic data and add them to .xlsx file in respective sheets
+        try:
+            with pandas.ExcelWriter("studies/data/Contrast2_Problematic_Data.xlsx") as writer:
+                for sheet_name in PROBLEMATIC_DATA_SHEETS:
+                    data_frame = pandas.DataFrame.from_records(problematic_data_logs[sheet_name])
+                    data_frame.to_excel(writer, sheet_name=sheet_name, index=False)
+        except AttributeError as error:
+            logger.exception(f"{error.name} occurred while writing to excel")
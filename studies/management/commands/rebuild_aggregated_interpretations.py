@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from studies.models import AggregatedInterpretation
+
+
+class Command(BaseCommand):
+    help = "Rebuild the aggregated interpretations of all experiments in a single aggregation pass"
+
+    def handle(self, *args, **options):
+        created = AggregatedInterpretation.rebuild_all_aggregated_interpretations()
+        self.stdout.write(self.style.SUCCESS(f"Stored {created} aggregated interpretations"))
@@ -0,0 +1,76 @@
+import itertools
+
+from django.core.management.base import BaseCommand
+from django.http import QueryDict
+
+from approval_process.choices import ApprovalChoices
+from configuration.initial_setup import ParentTheories
+from contrast_api.choices import ReportingChoices, TheoryDrivenChoices, TypeOfConsciousnessChoices
+from studies.filters import ExperimentFilter
+from studies.models import Experiment, Theory, BrainImage
+from studies.processors.brain_images import BrainImagesDataProcessor
+
+RENDERED_THEORIES = [
+    ParentTheories.GLOBAL_WORKSPACE,
+    ParentTheories.INTEGRATED_INFORMATION,
+    ParentTheories.HIGHER_ORDER,
+    ParentTheories.FIRST_ORDER_AND_PREDICTIVE_PROCESSING,
+]
+
+FILTERS_OPTIONS = {
+    "is_reporting": ["either"] + ReportingChoices.values,
+    "theory_driven": ["either"] + TheoryDrivenChoices.values,
+    "type_of_consciousness": ["either"] + TypeOfConsciousnessChoices.values,
+}
+
+
+def get_common_filters_combinations():
+    """
+    The unfiltered graph, and each filter set on its own - which is what the site mostly asks for
+    """
+    combinations = [{}]
+    for filter_name, options in FILTERS_OPTIONS.items():
+        combinations.extend({filter_name: option} for option in options if option != "either")
+    return combinations
+
+
+def get_all_filters_combinations():
+    filters_names = list(FILTERS_OPTIONS.keys())
+    return [dict(zip(filters_names, options)) for options in itertools.product(*FILTERS_OPTIONS.values())]
+
+
+class Command(BaseCommand):
+    help = "Pre render brain images for all parent theories and common filters combinations into the artifacts store"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all-combinations", action="store_true", help="Render every filters combination, not just common ones"
+        )
+        parser.add_argument(
+            "--prune", action="store_true", help="Delete stored images that weren't produced in this run"
+        )
+
+    def handle(self, *args, **options):
+        if options["all_combinations"]:
+            filters_combinations = get_all_filters_combinations()
+        else:
+            filters_combinations = get_common_filters_combinations()
+
+        approved_experiments = Experiment.objects.filter(study__approval_status=ApprovalChoices.APPROVED)
+        theories = Theory.objects.filter(parent__isnull=True, name__in=RENDERED_THEORIES)
+        produced_keys = set()
+        for theory in theories:
+            for filters in filters_combinations:
+                query_params = QueryDict(mutable=True)
+                query_params.update(filters)
+                query_params["theory"] = theory.name
+                experiments = ExperimentFilter(data=query_params, queryset=approved_experiments).qs
+                processor = BrainImagesDataProcessor(experiments, **dict(query_params.lists()))
+                processor.process()
+                produced_keys.add(processor.artifact_key)
+                self.stdout.write(f"Rendered {theory.name} with filters {filters}")
+
+        self.stdout.write(self.style.SUCCESS(f"Stored {len(produced_keys)} distinct brain images"))
+        if options["prune"]:
+            deleted, _ = BrainImage.objects.exclude(key__in=produced_keys).delete()
+            self.stdout.write(f"Pruned {deleted} stale brain images")
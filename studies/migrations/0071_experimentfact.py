@@ -0,0 +1,57 @@
+# Generated by Django 5.1.8 on 2026-10-18 12:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("studies", "0070_brainimage"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExperimentFact",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "dimension",
+                    models.CharField(
+                        choices=[
+                            ("paradigm_family", "Paradigm Family"),
+                            ("paradigm", "Paradigm"),
+                            ("population", "Population"),
+                            ("finding_tag", "Finding Tag"),
+                            ("finding_tag_family", "Finding Tag Family"),
+                            ("reporting", "Reporting"),
+                            ("theory_driven", "Theory Driven"),
+                            ("task", "Task"),
+                            ("stimuli_category", "Stimuli Category"),
+                            ("modality", "Modality"),
+                            ("consciousness_measure_phase", "Consciousness Measure Phase"),
+                            ("consciousness_measure_type", "Consciousness Measure Type"),
+                            ("type_of_consciousness", "Type Of Consciousness"),
+                            ("technique", "Technique"),
+                            ("measure", "Measure"),
+                            ("country", "Country"),
+                            ("year", "Year"),
+                        ],
+                        max_length=50,
+                    ),
+                ),
+                ("value", models.CharField(max_length=250)),
+                (
+                    "experiment",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="facts", to="studies.experiment"
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["dimension", "value"], name="experiment_fact_dimension_idx"),
+                    models.Index(fields=["experiment", "dimension"], name="experiment_fact_experiment_idx"),
+                ],
+            },
+        ),
+    ]
@@ -16,6 +16,8 @@ from studies.models.sample import Sample
 from studies.models.paradigm import Paradigm
 from studies.models.measure import Measure, MeasureType
 from studies.models.aggregated_interpretation import AggregatedInterpretation
+from studies.models.brain_image import BrainImage
+from studies.models.experiment_fact import ExperimentFact
 
 
 __all__ = [
@@ -41,5 +43,7 @@ __all__ = [
     ConsciousnessMeasureType,
     ConsciousnessMeasurePhaseType,
     AggregatedInterpretation,
+    BrainImage,
+    ExperimentFact,
     Sample,
 ]
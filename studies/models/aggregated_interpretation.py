@@ -1,8 +1,17 @@
+from collections import defaultdict
+from typing import Iterable
+
+from django.contrib.postgres.aggregates import StringAgg
 from django.db import models, transaction
-from django.db.models import CASCADE
+from django.db.models import CASCADE, F
+from django.db.models.functions import Collate
 
 from contrast_api.choices import AggregatedInterpretationsChoices
-from studies.services.aggregated_Interpretations_svc import AggregatedInterpretationService, AggregatedInterpretationDTO
+from studies.services.aggregated_Interpretations_svc import (
+    AggregatedInterpretationService,
+    AggregatedInterpretationDTO,
+    AGGREGATED_NAMES_SEP,
+)
 
 
 class AggregatedInterpretation(models.Model):
@@ -15,27 +24,68 @@ class AggregatedInterpretation(models.Model):
         return f"experiment: {self.experiment_id} theory {self.parent_theory_names}, type {self.type}"
 
     @staticmethod
-    @transaction.atomic
     def setup_aggregate_interpretations(experiment_id):
+        AggregatedInterpretation.refresh_aggregated_interpretations([experiment_id])
+
+    @staticmethod
+    @transaction.atomic
+    def refresh_aggregated_interpretations(experiment_ids: Iterable[int]):
         from studies.models import Interpretation
 
-        current_interpretations = Interpretation.objects.filter(experiment_id=experiment_id).select_related()
-        serialized_interpretations = [
-            AggregatedInterpretationDTO(
-                parent_theory_names=item.theory.parent.name,
-                type=item.type,
-                parent_theory_acronyms=item.theory.parent.acronym,
+        experiment_ids = list(experiment_ids)
+        current_interpretations = (
+            Interpretation.objects.filter(experiment_id__in=experiment_ids)
+            .select_related("theory__parent")
+            .order_by("id")
+        )
+        serialized_interpretations = defaultdict(list)
+        for item in current_interpretations:
+            serialized_interpretations[item.experiment_id].append(
+                AggregatedInterpretationDTO(
+                    parent_theory_names=item.theory.parent.name,
+                    type=item.type,
+                    parent_theory_acronyms=item.theory.parent.acronym,
+                )
             )
-            for item in current_interpretations
-        ]
-        service = AggregatedInterpretationService(serialized_interpretations)
-        updated_aggregated_interpretations = service.resolve()
-        # remove current ones. any way, because there might not be new ones and it's ok
-        AggregatedInterpretation.objects.filter(experiment_id=experiment_id).delete()
-        for aggregated_interpretation in updated_aggregated_interpretations:
-            AggregatedInterpretation.objects.create(
+        updated_aggregated_interpretations = [
+            AggregatedInterpretation(
                 experiment_id=experiment_id,
                 type=aggregated_interpretation.type,
                 parent_theory_acronyms=aggregated_interpretation.parent_theory_acronyms,
                 parent_theory_names=aggregated_interpretation.parent_theory_names,
             )
+            for experiment_id, interpretations in serialized_interpretations.items()
+            for aggregated_interpretation in AggregatedInterpretationService(interpretations).resolve()
+        ]
+        # remove current ones. any way, because there might not be new ones and it's ok
+        AggregatedInterpretation.objects.filter(experiment_id__in=experiment_ids).delete()
+        AggregatedInterpretation.objects.bulk_create(updated_aggregated_interpretations)
+
+    @staticmethod
+    @transaction.atomic
+    def rebuild_all_aggregated_interpretations() -> int:
+        """
+        Rebuilds the aggregated rows of all experiments in a single aggregation query, mirroring
+        AggregatedInterpretationService: the parent theories are joined in their names (codepoint) order per type
+        """
+        from studies.models import Interpretation
+
+        parent_theory_order = (Collate(F("theory__parent__name"), "C"), "id")
+        aggregated_values = (
+            Interpretation.objects.filter(type__in=AggregatedInterpretationsChoices.values)
+            .order_by()
+            .values("experiment_id", "type")
+            .annotate(
+                parent_theory_names=StringAgg(
+                    "theory__parent__name", delimiter=AGGREGATED_NAMES_SEP, ordering=parent_theory_order
+                ),
+                parent_theory_acronyms=StringAgg(
+                    "theory__parent__acronym", delimiter=AGGREGATED_NAMES_SEP, ordering=parent_theory_order
+                ),
+            )
+        )
+        AggregatedInterpretation.objects.all().delete()
+        created = AggregatedInterpretation.objects.bulk_create(
+            (AggregatedInterpretation(**values) for values in aggregated_values), batch_size=1000
+        )
+        return len(created)
@@ -1,4 +1,6 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from simple_history.models import HistoricalRecords
 
 
@@ -8,6 +10,8 @@ class Author(models.Model):
 
     class Meta:
         ordering = ("name",)
+        # trigram index on the expression icontains / istartswith compare, so autocomplete doesn't scan the table
+        indexes = [GinIndex(OpClass(Upper("name"), name="gin_trgm_ops"), name="author_name_trgm_idx")]
 
     def __str__(self):
         return f"{self.name}"
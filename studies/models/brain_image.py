@@ -0,0 +1,16 @@
+from django.db import models
+
+
+class BrainImage(models.Model):
+    """
+    Pre rendered brain images, content addressed by the theory and the finding tags data they were rendered from
+    So the brain images graph only renders on a miss, and identical inputs (from different filters) share an image
+    """
+
+    key = models.CharField(null=False, blank=False, max_length=64, unique=True)
+    theory = models.CharField(null=False, blank=False, max_length=250)
+    payload = models.JSONField(null=False, blank=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"theory: {self.theory} key {self.key}"
@@ -0,0 +1,75 @@
+from typing import Iterable
+
+from django.db import models, transaction
+from django.db.models import CASCADE, F, Func, Q, FilteredRelation
+
+from contrast_api.choices import ExperimentFactDimensionChoices
+
+# How each dimension value is reached from the experiment, finding tags only count when they are NCC and paradigms
+# when they aren't families (as in the graphs)
+FACTS_EXPRESSIONS = {
+    ExperimentFactDimensionChoices.PARADIGM_FAMILY: F("paradigms__parent__name"),
+    ExperimentFactDimensionChoices.PARADIGM: F("child_paradigms__name"),
+    ExperimentFactDimensionChoices.POPULATION: F("samples__type"),
+    ExperimentFactDimensionChoices.FINDING_TAG: F("ncc_finding_tags__type__name"),
+    ExperimentFactDimensionChoices.FINDING_TAG_FAMILY: F("ncc_finding_tags__family__name"),
+    ExperimentFactDimensionChoices.REPORTING: F("is_reporting"),
+    ExperimentFactDimensionChoices.THEORY_DRIVEN: F("theory_driven"),
+    ExperimentFactDimensionChoices.TASK: F("tasks__type__name"),
+    ExperimentFactDimensionChoices.STIMULI_CATEGORY: F("stimuli__category__name"),
+    ExperimentFactDimensionChoices.MODALITY: F("stimuli__modality__name"),
+    ExperimentFactDimensionChoices.CONSCIOUSNESS_MEASURE_PHASE: F("consciousness_measures__phase__name"),
+    ExperimentFactDimensionChoices.CONSCIOUSNESS_MEASURE_TYPE: F("consciousness_measures__type__name"),
+    ExperimentFactDimensionChoices.TYPE_OF_CONSCIOUSNESS: F("type_of_consciousness"),
+    ExperimentFactDimensionChoices.TECHNIQUE: F("techniques__name"),
+    ExperimentFactDimensionChoices.MEASURE: F("measures__type__name"),
+    ExperimentFactDimensionChoices.COUNTRY: Func(F("study__countries"), function="unnest"),
+    ExperimentFactDimensionChoices.YEAR: F("study__year"),
+}
+
+
+class ExperimentFact(models.Model):
+    """
+    A denormalized row per experiment and each of its breakdown values (paradigm family, technique, country...)
+    Graphs can then group a single indexed table, instead of joining the experiment to all of its related models
+    """
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["dimension", "value"], name="experiment_fact_dimension_idx"),
+            models.Index(fields=["experiment", "dimension"], name="experiment_fact_experiment_idx"),
+        ]
+
+    experiment = models.ForeignKey(to="studies.Experiment", on_delete=CASCADE, related_name="facts")
+    dimension = models.CharField(
+        null=False, blank=False, choices=ExperimentFactDimensionChoices.choices, max_length=50
+    )
+    value = models.CharField(null=False, blank=False, max_length=250)
+
+    def __str__(self):
+        return f"experiment: {self.experiment_id} {self.dimension}: {self.value}"
+
+    @staticmethod
+    @transaction.atomic
+    def refresh_experiments_facts(experiment_ids: Iterable[int]):
+        from studies.models import Experiment
+
+        experiment_ids = list(experiment_ids)
+        experiments = Experiment.objects.filter(id__in=experiment_ids).annotate(
+            ncc_finding_tags=FilteredRelation("finding_tags", condition=Q(finding_tags__is_NCC=True)),
+            child_paradigms=FilteredRelation("paradigms", condition=Q(paradigms__parent__isnull=False)),
+        )
+        facts = []
+        for dimension, expression in FACTS_EXPRESSIONS.items():
+            # filtering the empty values in python, as the countries are unnested and can't be used in WHERE
+            dimension_values = (
+                experiments.annotate(fact_value=expression).order_by().values_list("id", "fact_value").distinct()
+            )
+            facts.extend(
+                ExperimentFact(experiment_id=experiment_id, dimension=dimension, value=str(value))
+                for experiment_id, value in dimension_values
+                if value is not None
+            )
+        # remove current ones, as with the aggregated interpretations there might not be new ones and it's ok
+        ExperimentFact.objects.filter(experiment_id__in=experiment_ids).delete()
+        ExperimentFact.objects.bulk_create(facts)
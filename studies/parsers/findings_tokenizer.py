@@ -0,0 +1,154 @@
+from contrast_api.choices import AnalysisTypeChoices, DirectionChoices
+from studies.parsers.parsing_findings_Contrast2 import (
+    ITEM_SEP,
+    FINDING_INNER_S_SEP,
+    FINDING_INNER_E_SEP,
+    NEGATIVE_TAG,
+    INNER_ITEM_SEP,
+    START_FINDING_SEP,
+    COMMENT_CHAR,
+    UNINITIALIZED_VAL,
+    TEMPORAL_MS,
+    TEMPORAL_NEGATIVE_TIMING_SIGN,
+    TEMPORAL_APPROX_SIGN,
+    ONSET_OFFSET_SEP,
+    FREQUENCY_DATA_SEP,
+    FREQ_DIRECTION_DEF_VAL,
+    FREQ_DIRECTION_NEGATIVE,
+    FREQ_BAND_DEF_IDX,
+    FREQUENCY_HZ,
+    FindingTagDataError,
+    BaseFinding,
+    SpatialFinding,
+    TemporalFinding,
+    FrequencyFinding,
+    tag_to_findings,
+    finding_tag_to_area,
+)
+
+# single pass replacement of the timing signs: ! marks a negative timing, ~ an approximate one, > closes the timing
+TEMPORAL_TRANSLATION = str.maketrans(
+    {TEMPORAL_NEGATIVE_TIMING_SIGN: ONSET_OFFSET_SEP, TEMPORAL_APPROX_SIGN: None, FINDING_INNER_E_SEP: None}
+)
+
+ANALYSIS_TYPES = {
+    "power": AnalysisTypeChoices.POWER,
+    "connectivity": AnalysisTypeChoices.CONNECTIVITY,
+    "phi": AnalysisTypeChoices.PHI,
+    "complexity": AnalysisTypeChoices.COMPLEXITY,
+    "te": AnalysisTypeChoices.TE,
+    "pca": AnalysisTypeChoices.PCA,
+    "lrtc": AnalysisTypeChoices.LRTC,
+    "microstates": AnalysisTypeChoices.MICROSTATES,
+    "microstate": AnalysisTypeChoices.MICROSTATES,
+    "cd": AnalysisTypeChoices.CD,
+    "clustering": AnalysisTypeChoices.CLUSTERING,
+    "mst": AnalysisTypeChoices.MST,
+    "psd": AnalysisTypeChoices.PSD,
+    "ersp": AnalysisTypeChoices.ERSP,
+}
+
+
+def fill_temporal(finding, txt: str):
+    onset, has_offset, offset_txt = txt.replace(TEMPORAL_MS, "").partition(ONSET_OFFSET_SEP)
+    finding.onset = onset.translate(TEMPORAL_TRANSLATION).strip()
+    if has_offset:
+        finding.offset = offset_txt.partition(ONSET_OFFSET_SEP)[0].translate(TEMPORAL_TRANSLATION).strip()
+    else:
+        finding.offset = finding.onset
+    if finding.onset == "":
+        finding.onset = UNINITIALIZED_VAL
+        finding.offset = UNINITIALIZED_VAL
+
+
+def decode_base(finding, txt: str):
+    # TAG (TEXT <TECHNIQUE> #COMMENT), the text itself is the comment when there is no comment char
+    finding_txt, has_comment, comment_txt = txt.partition(COMMENT_CHAR)
+    finding.comment = comment_txt.partition(COMMENT_CHAR)[0].strip() if has_comment else txt
+    finding.technique = UNINITIALIZED_VAL
+    # the last < may encode a temporal finding rather than the technique
+    head, has_inner, inner_txt = finding_txt.rpartition(FINDING_INNER_S_SEP)
+    if has_inner and TEMPORAL_MS not in inner_txt:
+        finding_txt = head.strip()
+        finding.technique = inner_txt.strip().replace(FINDING_INNER_E_SEP, "")
+    finding.finding_txt = finding_txt
+
+
+def decode_spatial(finding, txt: str):
+    decode_base(finding, txt)
+    finding.area = finding_tag_to_area.get(finding.tag) or finding.finding_txt.strip()
+
+
+def decode_temporal(finding, txt: str):
+    decode_base(finding, txt)
+    fill_temporal(finding, finding.finding_txt)
+
+
+def decode_frequency(finding, txt: str):
+    decode_base(finding, txt)
+    finding.direction = FREQ_DIRECTION_DEF_VAL
+    finding.onset = UNINITIALIZED_VAL
+    finding.offset = UNINITIALIZED_VAL
+
+    # ANALYSIS_TYPE [Neg] BAND_LOW-BAND_HIGHHz [<ONSET-OFFSETms>]
+    freq_split = finding.finding_txt.replace(FINDING_INNER_S_SEP, FREQUENCY_DATA_SEP).split(FREQUENCY_DATA_SEP)
+    analysis_type = freq_split[0].strip()
+    finding.analysis = ANALYSIS_TYPES.get(analysis_type.lower())
+    if finding.analysis is None:
+        raise FindingTagDataError(f"Parsed analysis type: {analysis_type} not compatible with existing options")
+
+    band_idx = FREQ_BAND_DEF_IDX
+    if FREQ_DIRECTION_NEGATIVE in freq_split:
+        finding.direction = DirectionChoices.NEGATIVE
+        band_idx = band_idx + 1
+
+    band_low, has_band_high, band_high = freq_split[band_idx].replace(FREQUENCY_HZ, "").partition(ONSET_OFFSET_SEP)
+    finding.band_low = float(band_low.replace(",", ""))
+    if has_band_high:
+        finding.band_high = float(band_high.partition(ONSET_OFFSET_SEP)[0].replace(",", ""))
+    else:
+        finding.band_high = finding.band_low
+
+    head, has_temporal, temporal_txt = finding.finding_txt.rpartition(FINDING_INNER_S_SEP)
+    if has_temporal:
+        fill_temporal(finding, temporal_txt)
+
+
+FINDINGS_DECODERS = {
+    BaseFinding: decode_base,
+    SpatialFinding: decode_spatial,
+    TemporalFinding: decode_temporal,
+    FrequencyFinding: decode_frequency,
+}
+
+
+def parse_findings(txt) -> list[BaseFinding]:
+    """
+    Tokenizes an experiment's findings text in a single scan per tag, producing the same findings as `parse`
+    """
+    findings = []
+    for tag_txt in str(txt).split(ITEM_SEP):
+        # TAG (FINDING & FINDING ...), only the text up to a nested ( is kept and the closing char is dropped
+        tag_code, has_findings, findings_txt = tag_txt.strip().partition(START_FINDING_SEP)
+        tag_code = tag_code.replace(" ", "")
+        findings_txt = findings_txt.partition(START_FINDING_SEP)[0].strip()[:-1] if has_findings else ""
+
+        if findings_txt:
+            inner_findings = [finding for finding in map(str.strip, findings_txt.split(INNER_ITEM_SEP)) if finding]
+        else:
+            inner_findings = [findings_txt]
+        clean_tag = tag_code.replace(NEGATIVE_TAG, "")
+        finding_class = tag_to_findings.get(clean_tag, BaseFinding)
+        decode = FINDINGS_DECODERS[finding_class]
+
+        for finding_txt in inner_findings:
+            if not tag_code:
+                raise FindingTagDataError()
+            # the finding is filled by the decoder, skipping the per class decode chain
+            finding = finding_class.__new__(finding_class)
+            finding.tag = clean_tag
+            finding.is_NCC = tag_code[0] != NEGATIVE_TAG
+            decode(finding, finding_txt)
+            findings.append(finding)
+
+    return findings
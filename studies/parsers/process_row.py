@@ -47,8 +47,8 @@ from studies.parsers.historic_data_helpers import (
     get_stimuli_from_data,
     parse_theory_driven_from_data,
 )
+from studies.parsers.findings_tokenizer import parse_findings
 from studies.parsers.parsing_findings_Contrast2 import (
-    parse,
     FrequencyFinding,
     TemporalFinding,
     SpatialFinding,
@@ -263,7 +263,7 @@ def process_row(item: dict):
     # resolve and create findings
     findings_ncc_tags = item["Findings.NCC Tags"]
     try:
-        findings = parse(findings_ncc_tags)
+        findings = parse_findings(findings_ncc_tags)
         for finding in findings:
             resolved_tag_type = finding_tags_map[finding.tag]
             comment = finding.comment
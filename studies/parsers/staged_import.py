@@ -0,0 +1,380 @@
+import logging
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from django.db import transaction
+from simple_history.utils import bulk_create_with_history
+
+from configuration.initial_setup import current_child_theories, techniques, finding_tags_map
+from configuration.models import DatasetVersion
+from contrast_api.choices import (
+    InterpretationsChoices,
+    ExperimentTypeChoices,
+    TypeOfConsciousnessChoices,
+    ReportingChoices,
+    DirectionChoices,
+)
+from contrast_api.data_migration_functionality.errors import (
+    MissingStimulusCategoryError,
+    ParadigmDataException,
+    IncoherentSampleDataError,
+    InvalidConsciousnessMeasureDataError,
+    ParadigmError,
+)
+from contrast_api.data_migration_functionality.studies_parsing_helpers import ProblemInStudyExistingDataException
+from studies.models import (
+    Theory,
+    Technique,
+    Paradigm,
+    ConsciousnessMeasureType,
+    ConsciousnessMeasurePhaseType,
+    ConsciousnessMeasure,
+    MeasureType,
+    Measure,
+    Sample,
+    TaskType,
+    Task,
+    ModalityType,
+    FindingTagFamily,
+    FindingTagType,
+    FindingTag,
+    Study,
+    Experiment,
+    Interpretation,
+    AggregatedInterpretation,
+    ExperimentFact,
+)
+from studies.models.stimulus import StimulusCategory, StimulusSubCategory, Stimulus
+from studies.parsers.historic_data_helpers import (
+    get_paradigms_from_data,
+    get_consciousness_measure_type_and_phase_from_data,
+    get_measures_from_data,
+    get_sample_from_data,
+    parse_task_types,
+    get_stimuli_from_data,
+    parse_theory_driven_from_data,
+)
+from studies.parsers.findings_tokenizer import parse_findings
+from studies.parsers.parsing_findings_Contrast2 import (
+    FrequencyFinding,
+    TemporalFinding,
+    SpatialFinding,
+    FindingTagDataError,
+)
+
+logger = logging.getLogger("Contrast2")
+
+
+class LookupTables:
+    """
+    All the lookup tables a historic row is resolved against, loaded once for the whole import
+    A missing key plays the part of ObjectDoesNotExist in the row by row import
+    """
+
+    def __init__(self):
+        self.studies = {study.DOI: study for study in Study.objects.all()}
+        self.theories = {theory.name: theory for theory in Theory.objects.all()}
+        self.techniques = {technique.name: technique for technique in Technique.objects.all()}
+        self.paradigms = {
+            (paradigm.name, paradigm.parent_id, paradigm.sub_type): paradigm for paradigm in Paradigm.objects.all()
+        }
+        self.consciousness_measure_types = {item.name: item for item in ConsciousnessMeasureType.objects.all()}
+        self.consciousness_measure_phases = {item.name: item for item in ConsciousnessMeasurePhaseType.objects.all()}
+        self.measure_types = {item.name: item for item in MeasureType.objects.all()}
+        self.task_types = {item.name: item for item in TaskType.objects.all()}
+        self.modality_types = {item.name: item for item in ModalityType.objects.all()}
+        self.stimulus_categories = {item.name: item for item in StimulusCategory.objects.all()}
+        self.stimulus_sub_categories = {
+            (item.name, item.parent_id): item for item in StimulusSubCategory.objects.all()
+        }
+        self.finding_tag_families = {item.name: item for item in FindingTagFamily.objects.all()}
+        self.finding_tag_types = {(item.name, item.family_id): item for item in FindingTagType.objects.all()}
+
+
+@dataclass
+class HistoricExperimentDTO:
+    index: int
+    item: dict
+    experiment: Experiment
+    theory_driven_theories: List[Theory] = field(default_factory=list)
+    interpretations: List[Tuple[Theory, str]] = field(default_factory=list)
+    techniques: List[Technique] = field(default_factory=list)
+    paradigms: List[Paradigm] = field(default_factory=list)
+    consciousness_measures: List[ConsciousnessMeasure] = field(default_factory=list)
+    measures: List[Measure] = field(default_factory=list)
+    samples: List[Sample] = field(default_factory=list)
+    tasks: List[Task] = field(default_factory=list)
+    stimuli: List[Stimulus] = field(default_factory=list)
+    finding_tags: List[FindingTag] = field(default_factory=list)
+
+
+def parse_experiment(item: dict, lookups: LookupTables) -> Tuple[Experiment, List[str]]:
+    try:
+        study = lookups.studies[item["Paper.DOI"]]
+    except KeyError:
+        raise ProblemInStudyExistingDataException()
+
+    theory_driven, theory_driven_theories = parse_theory_driven_from_data(item, current_child_theories)
+
+    type_of_consciousness = ""
+    type_of_consciousness_choice = item["State - Content"]
+    if type_of_consciousness_choice in ["0", 0]:
+        type_of_consciousness = TypeOfConsciousnessChoices.STATE
+    elif type_of_consciousness_choice in ["1", 1]:
+        type_of_consciousness = TypeOfConsciousnessChoices.CONTENT
+    elif type_of_consciousness_choice in ["2", 2]:
+        type_of_consciousness = TypeOfConsciousnessChoices.BOTH
+
+    is_reporting = ""
+    reporting_choice = item["Experimental paradigms.Report"]
+    if reporting_choice in ["0", 0]:
+        is_reporting = ReportingChoices.NO_REPORT
+    elif reporting_choice in ["1", 1]:
+        is_reporting = ReportingChoices.REPORT
+    elif reporting_choice in ["2", 2]:
+        is_reporting = ReportingChoices.BOTH
+
+    experiment = Experiment(
+        study=study,
+        type_of_consciousness=type_of_consciousness,
+        results_summary=item["Findings.Summary"],
+        is_reporting=is_reporting,
+        theory_driven=theory_driven,
+        type=ExperimentTypeChoices.NEUROSCIENTIFIC,
+        tasks_notes=item["Task.Description"],
+        stimuli_notes=item["Stimuli Features.Description"],
+        consciousness_measures_notes=item["Measures of consciousness.Description"],
+    )
+    return experiment, theory_driven_theories
+
+
+def parse_row(index: int, item: dict, lookups: LookupTables) -> HistoricExperimentDTO:
+    """
+    Resolves a historic row to unsaved model instances, raising the same errors as process_row
+    Nothing is written here, so all rows can be validated before the database is touched
+    """
+    experiment, theory_driven_theories = parse_experiment(item, lookups)
+    dto = HistoricExperimentDTO(index=index, item=item, experiment=experiment)
+
+    dto.theory_driven_theories = list({lookups.theories[theory] for theory in theory_driven_theories})
+
+    # as in process_row, a theory without a matching column keeps the previous theory's interpretation
+    interpretation = ""
+    for theory in current_child_theories:
+        for key, value in item.items():
+            if theory not in key:
+                continue
+            if value in ["1", 1]:
+                interpretation = InterpretationsChoices.PRO
+            elif value in ["0", 0]:
+                interpretation = InterpretationsChoices.CHALLENGES
+            elif value == "X":
+                interpretation = InterpretationsChoices.NEUTRAL
+        dto.interpretations.append((lookups.theories[theory], interpretation))
+
+    dto.techniques = [lookups.techniques[technique] for technique in techniques if technique in item["Techniques"]]
+
+    try:
+        main_paradigms = []
+        specific_paradigms = []
+        for paradigm in get_paradigms_from_data(item):
+            if paradigm.parent is None:
+                main_paradigms.append(lookups.paradigms[(paradigm.name, None, None)])
+            else:
+                main_paradigm = lookups.paradigms[(paradigm.parent, None, None)]
+                specific_paradigms.append(lookups.paradigms[(paradigm.name, main_paradigm.id, paradigm.sub_type)])
+
+        for specific_paradigm in specific_paradigms:
+            if specific_paradigm.parent_id not in [main_paradigm.id for main_paradigm in main_paradigms]:
+                raise ParadigmError(f"main paradigm {specific_paradigm.parent} doesn't exist")
+            if specific_paradigm not in dto.paradigms:
+                dto.paradigms.append(specific_paradigm)
+
+    except (ParadigmError, KeyError):
+        raise ParadigmDataException(
+            f"paradigm error for {item['Experimental paradigms.Main Paradigm']} or {item['Experimental paradigms.Specific Paradigm']}"
+        )
+
+    try:
+        for consciousness_measure in get_consciousness_measure_type_and_phase_from_data(item):
+            dto.consciousness_measures.append(
+                ConsciousnessMeasure(
+                    phase=lookups.consciousness_measure_phases[consciousness_measure.phase],
+                    type=lookups.consciousness_measure_types[consciousness_measure.type],
+                )
+            )
+    except KeyError:
+        raise InvalidConsciousnessMeasureDataError()
+
+    for measure in get_measures_from_data(item):
+        dto.measures.append(Measure(type=lookups.measure_types[measure.measure_type], notes=measure.measure_notes))
+
+    try:
+        sample_notes_list = []
+        for sample in get_sample_from_data(item):
+            total_size = int(sample.total_size)
+            included_size = int(sample.included_size)
+            dto.samples.append(Sample(type=sample.sample_type, total_size=total_size, size_included=included_size))
+            if sample.note is not None:
+                sample_notes_list.append(sample.note)
+        experiment.sample_notes = "; ".join(map(str, sample_notes_list))
+    except ValueError as error:
+        logger.exception(f"{error} while processing sample data")
+        raise IncoherentSampleDataError
+
+    for parsed_task_type in parse_task_types(item):
+        dto.tasks.append(Task(type=lookups.task_types[parsed_task_type]))
+
+    for stimulus in get_stimuli_from_data(item):
+        if (stimulus.duration is None) or (stimulus.duration == "None"):
+            duration = None
+        else:
+            duration = float(stimulus.duration)
+        try:
+            if not stimulus.modality:
+                raise ValueError("stimulus without modality")
+            stimulus_category = lookups.stimulus_categories[stimulus.category]
+            if (stimulus.sub_category == "") or (stimulus.sub_category is None):
+                stimulus_sub_category = None
+            else:
+                sub_category_key = (stimulus.sub_category, stimulus_category.id)
+                stimulus_sub_category = lookups.stimulus_sub_categories[sub_category_key]
+            dto.stimuli.append(
+                Stimulus(
+                    category=stimulus_category,
+                    sub_category=stimulus_sub_category,
+                    modality=lookups.modality_types[stimulus.modality],
+                    duration=duration,
+                )
+            )
+        except (KeyError, ValueError) as error:
+            logger.exception(f"{error} while processing stimuli data")
+            raise MissingStimulusCategoryError()
+
+    finding = None
+    try:
+        for finding in parse_findings(item["Findings.NCC Tags"]):
+            dto.finding_tags.append(parse_finding_tag(finding, dto.techniques, lookups))
+    except (ValueError, IndexError, KeyError) as error:
+        logger.exception(f"{error} while processing finding tag data {finding}")
+        raise FindingTagDataError()
+
+    return dto
+
+
+def parse_finding_tag(finding, techniques_in_historic_data: List[Technique], lookups: LookupTables) -> FindingTag:
+    resolved_tag_type = finding_tags_map[finding.tag]
+    technique: Optional[Technique] = None
+    if finding.technique is not None:
+        technique = lookups.techniques[finding.technique]
+    elif len(techniques_in_historic_data) == 1:
+        technique = techniques_in_historic_data[0]
+
+    common_fields = dict(notes=finding.comment, is_NCC=finding.is_NCC)
+    if isinstance(finding, FrequencyFinding):
+        family = lookups.finding_tag_families["Frequency"]
+        return FindingTag(
+            family=family,
+            type=lookups.finding_tag_types[(resolved_tag_type, family.id)],
+            onset=finding.onset,
+            offset=finding.offset,
+            band_lower_bound=finding.band_low,
+            band_higher_bound=finding.band_high,
+            analysis_type=finding.analysis,
+            direction=DirectionChoices.NEGATIVE if finding.direction == "Negative" else DirectionChoices.POSITIVE,
+            technique=technique,
+            **common_fields,
+        )
+    elif isinstance(finding, TemporalFinding):
+        family = lookups.finding_tag_families["Temporal"]
+        return FindingTag(
+            family=family,
+            type=lookups.finding_tag_types[(resolved_tag_type, family.id)],
+            onset=finding.onset,
+            offset=finding.offset,
+            technique=technique,
+            **common_fields,
+        )
+    elif isinstance(finding, SpatialFinding):
+        family = lookups.finding_tag_families["Spatial Areas"]
+        return FindingTag(
+            family=family,
+            type=lookups.finding_tag_types[(resolved_tag_type, family.id)],
+            AAL_atlas_tag=finding.area,
+            technique=technique,
+            **common_fields,
+        )
+    family = lookups.finding_tag_families["miscellaneous"]
+    return FindingTag(family=family, type=lookups.finding_tag_types[(resolved_tag_type, family.id)], **common_fields)
+
+
+@transaction.atomic
+def persist_experiments(dtos: List[HistoricExperimentDTO]) -> List[int]:
+    """
+    Writes a chunk of parsed rows with a bulk insert per model, history rows included
+    Signals don't fire for bulk inserts, see recompute_derived_data
+    """
+    for dto in dtos:
+        # a chunk that failed is retried row by row, without the ids of its rolled back inserts
+        dto.experiment.pk = None
+    experiments = bulk_create_with_history([dto.experiment for dto in dtos], Experiment)
+    for dto, experiment in zip(dtos, experiments):
+        dto.experiment = experiment
+
+    Experiment.theory_driven_theories.through.objects.bulk_create(
+        [
+            Experiment.theory_driven_theories.through(experiment_id=dto.experiment.id, theory_id=theory.id)
+            for dto in dtos
+            for theory in dto.theory_driven_theories
+        ]
+    )
+    Experiment.techniques.through.objects.bulk_create(
+        [
+            Experiment.techniques.through(experiment_id=dto.experiment.id, technique_id=technique.id)
+            for dto in dtos
+            for technique in dto.techniques
+        ]
+    )
+    Experiment.paradigms.through.objects.bulk_create(
+        [
+            Experiment.paradigms.through(experiment_id=dto.experiment.id, paradigm_id=paradigm.id)
+            for dto in dtos
+            for paradigm in dto.paradigms
+        ]
+    )
+    Interpretation.objects.bulk_create(
+        [
+            Interpretation(experiment_id=dto.experiment.id, theory=theory, type=interpretation_type)
+            for dto in dtos
+            for theory, interpretation_type in dto.interpretations
+        ]
+    )
+
+    for related_name, model in [
+        ("consciousness_measures", ConsciousnessMeasure),
+        ("measures", Measure),
+        ("samples", Sample),
+        ("tasks", Task),
+        ("stimuli", Stimulus),
+        ("finding_tags", FindingTag),
+    ]:
+        instances = []
+        for dto in dtos:
+            for instance in getattr(dto, related_name):
+                instance.pk = None
+                instance.experiment = dto.experiment
+                instances.append(instance)
+        if hasattr(model, "history"):
+            bulk_create_with_history(instances, model)
+        else:
+            model.objects.bulk_create(instances)
+
+    return [dto.experiment.id for dto in dtos]
+
+
+def recompute_derived_data(experiment_ids: List[int], batch_size: int):
+    # once for the whole import, instead of on every interpretation added
+    for start in range(0, len(experiment_ids), batch_size):
+        AggregatedInterpretation.refresh_aggregated_interpretations(experiment_ids[start : start + batch_size])
+        ExperimentFact.refresh_experiments_facts(experiment_ids[start : start + batch_size])
+    DatasetVersion.bump()
@@ -1,10 +1,35 @@
+from itertools import groupby
+from operator import itemgetter
 from typing import List
 
-from django.db.models import QuerySet
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db import connections
+from django.db.models import QuerySet, BigIntegerField
+from django.db.models.expressions import RawSQL
 
 from contrast_api.utils import cast_as_boolean
 from studies.models import Experiment
 
+# the yearly counts arrays of the series query are unnested, and accumulated by a window per series
+CUMULATIVE_SERIES_SQL = """
+    SELECT series_name, year, value FROM (
+        SELECT
+            series_name,
+            year,
+            SUM(value) OVER (PARTITION BY series_name ORDER BY year) AS value,
+            SUM(value) OVER (PARTITION BY series_name) AS total
+        FROM (
+            SELECT
+                series_query.series_name,
+                (point ->> 'year')::integer AS year,
+                (point ->> 'value')::integer AS value
+            FROM (%s) AS series_query, UNNEST(series_query.series) AS point
+        ) AS yearly_counts
+    ) AS cumulative_counts
+    WHERE total > %%s
+    ORDER BY series_name, year
+"""
+
 
 class BaseProcessor:
     def __init__(self, experiments: QuerySet[Experiment], **kwargs):
@@ -20,18 +45,38 @@ class BaseProcessor:
     def process(self):
         raise NotImplementedError()
 
-    def accumulate_inner_series_values_and_filter(self, data, min_count: int) -> List:
-        accumulated_data = []
-        accumulated = 0
-        for dataset in data:
-            accumulated = accumulated + dataset["value"]
-            new_dataset = dict(**dataset)
-            new_dataset.update({"value": accumulated})
-            accumulated_data.append(new_dataset)
-        if accumulated > min_count:
-            return accumulated_data
-        else:
-            return []
+    def get_csv_experiments_ids(
+        self, breakdown_queryset: QuerySet, filtered_subquery: QuerySet, experiment_reference: str = "id"
+    ) -> RawSQL:
+        """
+        The experiments of all the breakdown options, as a lazy subquery to be used with id__in.
+        The per option arrays are unnested by the database, so the export is a single semi-join and no ids
+        are pulled into python. Wrapping the breakdown query (rather than rewriting it) keeps its DISTINCT ON semantics
+        """
+        ids_arrays = breakdown_queryset.annotate(
+            experiments=ArraySubquery(filtered_subquery.values_list(experiment_reference))
+        ).values_list("experiments", flat=True)
+        sql, params = ids_arrays.query.sql_with_params()
+        return RawSQL(
+            f"SELECT UNNEST(csv_selection.experiments) FROM ({sql}) AS csv_selection",
+            params,
+            output_field=BigIntegerField(),
+        )
+
+    def get_cumulative_series(self, series_queryset: QuerySet) -> List[dict]:
+        """
+        The series_name and series (an array of yearly {year, value} counts) rows, with the values accumulated over the
+        years by the database, in a single query across all the series. The series whose total doesn't pass the
+        minimum number of experiments are dropped there, rather than transferred and discarded in python
+        """
+        sql, params = series_queryset.query.sql_with_params()
+        with connections[series_queryset.db].cursor() as cursor:
+            cursor.execute(CUMULATIVE_SERIES_SQL % sql, (*params, self.min_number_of_experiments))
+            rows = cursor.fetchall()
+        return [
+            dict(series_name=series_name, series=[dict(year=year, value=value) for _, year, value in points])
+            for series_name, points in groupby(rows, key=itemgetter(0))
+        ]
 
     def accumulate_total_from_series(self, data) -> int:
         return sum([series["value"] for series in data])
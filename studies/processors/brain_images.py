@@ -1,8 +1,14 @@
-from django.db.models import QuerySet, Count
-import pandas as pd
+import hashlib
+import json
+
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db.models import QuerySet, Count, OuterRef, F
+from django.db.models.functions import JSONObject
+
 from contrast_api.application_services.brain_images import BrainImageCreatorService
 from contrast_api.choices import InterpretationsChoices
-from studies.models import Theory, Experiment, FindingTag, Interpretation
+from studies.models import Theory, Experiment, FindingTag, Interpretation, BrainImage
+from studies.models.finding_tag import AALAtlasTag
 from studies.processors.base import BaseProcessor
 from studies.resources.finding_tag import FindingTagResource
 
@@ -20,6 +26,7 @@ class BrainImagesDataProcessor(BaseProcessor):
             except Theory.DoesNotExist:
                 theory = Theory.objects.get(id=theory_reference)
             self.theory = theory
+        self.artifact_key = None
 
         if self.theory:
             interpretations = Interpretation.objects.filter(type=InterpretationsChoices.PRO, theory__parent=self.theory)
@@ -37,11 +44,36 @@ class BrainImagesDataProcessor(BaseProcessor):
 
         return queryset
 
+    def get_artifact_key(self, queryset: QuerySet[FindingTag]) -> str:
+        """
+        Content address of the image: the theory and exactly the finding tags data the rendering depends on
+        """
+        # aggregated per finding tag, rather than a row per AAL tag and interpretation of its experiment
+        aal_atlas_tags = AALAtlasTag.objects.filter(finding_tags=OuterRef("id")).order_by("name").values("name")
+        interpretations = (
+            Interpretation.objects.filter(experiment=OuterRef("experiment_id"))
+            .order_by("theory__parent__name", "theory__name", "type")
+            .values(json=JSONObject(theory=F("theory__parent__name"), type=F("type")))
+        )
+        contributing_rows = (
+            FindingTag.objects.filter(id__in=queryset.values("id"))
+            .annotate(atlas_tag_names=ArraySubquery(aal_atlas_tags), theories=ArraySubquery(interpretations))
+            .order_by("id")
+            .values_list("id", "experiment_id", "atlas_tag_names", "theories")
+        )
+        content = json.dumps([self.theory.name, list(contributing_rows)], default=str)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
     def process(self):
         queryset = self.get_queryset()
         if self.is_csv:
             return queryset.values_list("id", flat=True)
 
+        self.artifact_key = self.get_artifact_key(queryset)
+        stored_payload = BrainImage.objects.filter(key=self.artifact_key).values_list("payload", flat=True).first()
+        if stored_payload is not None:
+            return [stored_payload]
+
         # turn queryset to pandas df
 
         resource = FindingTagResource()  # reusing from the admin
@@ -50,4 +82,9 @@ class BrainImagesDataProcessor(BaseProcessor):
         # TODO: later - work on multi brain
         svc = BrainImageCreatorService(findings_df=findings_df, theory=self.theory.name)
         brain_views = svc.create_brain_image()
+        # stored as the serializer renders them, so stored and freshly rendered responses are identical
+        brain_views["color_list"] = [str(color) for color in brain_views["color_list"]]
+        BrainImage.objects.get_or_create(
+            key=self.artifact_key, defaults=dict(theory=self.theory.name, payload=brain_views)
+        )
         return [brain_views]
@@ -49,10 +49,9 @@ class FrequenciesGraphDataProcessor(BaseProcessor):
         )
 
         if self.is_csv:
-            ids = relevant_finding_tags.filter(
+            return relevant_finding_tags.filter(
                 experiment__in=experiments_interpretations.values_list("experiment_id", flat=True)
             ).values_list("experiment_id", flat=True)
-            return set(ids)
 
         finding_tags_subquery_series = (
             relevant_finding_tags.filter(experiment__in=OuterRef("experiment_id"))
@@ -1,5 +1,4 @@
-import itertools
-
+from django.conf import settings
 from django.contrib.postgres.expressions import ArraySubquery
 from django.db.models import Func, F, Count, QuerySet, OuterRef
 
@@ -19,6 +18,7 @@ from studies.models import (
 )
 from studies.models.stimulus import StimulusCategory
 from studies.processors.base import BaseProcessor
+from studies.services.free_queries_snapshot_svc import get_free_queries_snapshot
 
 
 class ParametersDistributionFreeQueriesDataProcessor(BaseProcessor):
@@ -51,12 +51,59 @@ class ParametersDistributionFreeQueriesDataProcessor(BaseProcessor):
 
 
         """
+        if settings.GRAPHS_USE_FREE_QUERIES_SNAPSHOT and not self.is_csv:
+            return self.process_from_snapshot()
+
         # First we'll filter the available experiments
         self.filtered_experiments = self.get_queryset()
 
         process_func = getattr(self, f"process_{self.breakdown}")
         return process_func()
 
+    def process_from_snapshot(self):
+        """
+        Same graph as the joins and subqueries, evaluated over the worker's columnar snapshot: each filter is the union
+        of its values bitmaps, intersected with the others, and the breakdown is a bitmap count per value
+        """
+        snapshot = get_free_queries_snapshot()
+        # the base experiments (approved, and the experiments filterset) are resolved by a single ids query
+        selection = snapshot.to_bitmap(self.experiments.values_list("id", flat=True))
+        # as with the subqueries, only the interpreted experiments are counted
+        selection &= snapshot.any_of("interpretations", lambda value: True)
+        if len(self.interpretations_types):
+            selection &= snapshot.any_of("interpretations", self.is_matching_interpretation)
+
+        filters = dict(
+            techniques=self.techniques,
+            paradigms=self.paradigms,
+            paradigm_families=self.paradigm_families,
+            stimuli_categories=self.stimuli_categories,
+            stimuli_modalities=self.stimuli_modalities,
+            populations=self.populations,
+            measures=self.measures,
+            consciousness_measure_phases=self.consciousness_measure_phases,
+            consciousness_measure_types=self.consciousness_measure_types,
+            finding_tags_families=self.finding_tags_families,
+            finding_tags_types=self.finding_tags_types,
+            theory_driven=self.theory_driven,
+            types=self.types,
+            tasks=self.tasks,
+        )
+        for dimension, filter_values in filters.items():
+            if len(filter_values):
+                filter_values = set(filter_values)
+                selection &= snapshot.any_of(dimension, lambda value: value in filter_values)
+
+        counts = snapshot.count_by(self.breakdown, selection)
+        data = [dict(key=key, value=value) for key, value in counts.items() if value > self.min_number_of_experiments]
+        return sorted(data, key=lambda item: (-item["value"], item["key"]))
+
+    def is_matching_interpretation(self, value: str) -> bool:
+        interpretation_type, parent_theory = value.split(":")
+        if interpretation_type not in self.interpretations_types:
+            return False
+        return not len(self.interpretation_theories) or parent_theory in self.interpretation_theories
+
     def get_queryset(self):
         queryset = self.experiments
         if len(self.interpretations_types):
@@ -319,10 +366,7 @@ class ParametersDistributionFreeQueriesDataProcessor(BaseProcessor):
         # Hopefully this is generic enough to be reused
 
         if self.is_csv:
-            ids = queryset.annotate(
-                experiments=ArraySubquery(filtered_subquery.values_list("experiment_id"))
-            ).values_list("experiments", flat=True)
-            return set(list(itertools.chain.from_iterable(ids)))
+            return self.get_csv_experiments_ids(queryset, filtered_subquery, "experiment_id")
 
         annotated_subquery = filtered_subquery.annotate(experiment_count=Count("id", distinct=True))
 
@@ -1,5 +1,6 @@
-import itertools
+from collections import defaultdict
 
+from django.conf import settings
 from django.contrib.postgres.expressions import ArraySubquery
 from django.db.models import QuerySet, OuterRef, F, Func, Count
 from django.db.models.functions import JSONObject
@@ -30,9 +31,38 @@ class ParametersDistributionPieGraphDataProcessor(BaseProcessor):
         self.breakdown = breakdown[0]
 
     def process(self):
+        if settings.GRAPHS_USE_EXPERIMENT_FACTS and not self.is_csv:
+            return self.process_from_experiment_facts()
         process_func = getattr(self, f"process_{self.breakdown}")
         return process_func()
 
+    def process_from_experiment_facts(self):
+        """
+        Same graph as the per breakdown subqueries, grouped in one pass over the experiment facts
+        """
+        theories_by_breakdown = (
+            AggregatedInterpretation.objects.filter(
+                type=InterpretationsChoices.PRO,
+                experiment__in=self.experiments,
+                experiment__facts__dimension=self.breakdown,
+            )
+            .values("experiment__facts__value", "parent_theory_acronyms")
+            .annotate(experiment_count=Count("id", distinct=True))
+            .filter(experiment_count__gt=self.min_number_of_experiments)
+            .order_by("-experiment_count", "parent_theory_acronyms")
+        )
+        series_by_breakdown = defaultdict(list)
+        for item in theories_by_breakdown:
+            series_by_breakdown[item["experiment__facts__value"]].append(
+                dict(key=item["parent_theory_acronyms"], value=item["experiment_count"])
+            )
+
+        retval = [
+            dict(series_name=series_name, series=series, value=self.accumulate_total_from_series(series))
+            for series_name, series in sorted(series_by_breakdown.items())
+        ]
+        return sorted(retval, key=lambda x: x["value"], reverse=True)
+
     def process_paradigm_family(self):
         experiments_subquery_by_breakdown = AggregatedInterpretation.objects.filter(
             type=InterpretationsChoices.PRO,
@@ -232,13 +262,10 @@ class ParametersDistributionPieGraphDataProcessor(BaseProcessor):
         )
 
         if self.is_csv:
-            ids = queryset.annotate(
-                experiments=ArraySubquery(filtered_subquery.values_list("experiment_id"))
-            ).values_list("experiments", flat=True)
-            return set(list(itertools.chain.from_iterable(ids)))
+            return self.get_csv_experiments_ids(queryset, filtered_subquery, "experiment_id")
 
         subquery = (
-            theory_subquery.order_by("-experiment_count")
+            theory_subquery.order_by("-experiment_count", "parent_theory_acronyms")
             .filter(experiment_count__gt=self.min_number_of_experiments)
             .annotate(data=JSONObject(key=F("parent_theory_acronyms"), value=F("experiment_count")))
             .values_list("data")
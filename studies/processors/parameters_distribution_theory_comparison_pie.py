@@ -213,9 +213,12 @@ class ComparisonParametersDistributionPieGraphDataProcessor(BaseProcessor):
 
     def aggregate_query_by_breakdown(self):
         parent_theories = Theory.objects.filter(parent__isnull=True)
+        if self.is_csv:
+            return Interpretation.objects.filter(
+                type=self.interpretation, theory__parent__in=parent_theories, experiment__in=self.experiments
+            ).values_list("experiment_id", flat=True)
 
         results = []
-        experiment_ids = []
         for theory in parent_theories:
             theory_interpretations_experiments = (
                 Interpretation.objects.filter(
@@ -226,26 +229,21 @@ class ComparisonParametersDistributionPieGraphDataProcessor(BaseProcessor):
             )
             # Children_experiments is referring from theory to child theory and from their to "experiments"
             theory_experiment_ids = theory_interpretations_experiments.values_list("experiment_id", flat=True)
-            if self.is_csv:
-                experiment_ids += theory_experiment_ids
-            else:
-                subquery = self.get_query(theory_interpretations_experiments)
-
-                subquery_by_breakdown = (
-                    subquery.order_by("-experiment_count")
-                    .filter(experiment_count__gt=self.min_number_of_experiments)
-                    .annotate(data=JSONObject(key=F("key"), value=F("experiment_count")))
-                    .values_list("data", flat=True)
-                )
-                # TODO: adaption needed https://trello.com/c/1in869h0/283-thoeries-comparison-graph-change-the-n-in-the-middle-of-the-pie
-                # change total_value to get the total number of experiments within theory and that relation
-                if len(subquery_by_breakdown) > 0:
-                    series = list(subquery_by_breakdown)
-                    # total_value = self.accumulate_total_from_series(series)
-                    total_value = len(set(theory_experiment_ids))
-                    result = dict(series=series, series_name=theory.acronym, value=total_value)
-                    results.append(result)
-        if self.is_csv:
-            return set(experiment_ids)
+            subquery = self.get_query(theory_interpretations_experiments)
+
+            subquery_by_breakdown = (
+                subquery.order_by("-experiment_count")
+                .filter(experiment_count__gt=self.min_number_of_experiments)
+                .annotate(data=JSONObject(key=F("key"), value=F("experiment_count")))
+                .values_list("data", flat=True)
+            )
+            # TODO: adaption needed https://trello.com/c/1in869h0/283-thoeries-comparison-graph-change-the-n-in-the-middle-of-the-pie
+            # change total_value to get the total number of experiments within theory and that relation
+            if len(subquery_by_breakdown) > 0:
+                series = list(subquery_by_breakdown)
+                # total_value = self.accumulate_total_from_series(series)
+                total_value = len(set(theory_experiment_ids))
+                result = dict(series=series, series_name=theory.acronym, value=total_value)
+                results.append(result)
 
         return results
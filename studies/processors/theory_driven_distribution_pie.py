@@ -1,5 +1,3 @@
-import itertools
-
 from django.contrib.postgres.expressions import ArraySubquery
 from django.db.models import QuerySet, OuterRef, F, Func, Count
 from django.db.models.functions import JSONObject
@@ -38,10 +36,7 @@ class TheoryDrivenDistributionPieGraphDataProcessor(BaseProcessor):
         )
 
         if self.is_csv:
-            ids = queryset.annotate(
-                experiments=ArraySubquery(filtered_subquery.values_list("experiment_id"))
-            ).values_list("experiments", flat=True)
-            return set(list(itertools.chain.from_iterable(ids)))
+            return self.get_csv_experiments_ids(queryset, filtered_subquery, "experiment_id")
 
         subquery = (
             theory_subquery.order_by("-experiment_count")
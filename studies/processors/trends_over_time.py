@@ -1,7 +1,5 @@
-import itertools
-
 from django.contrib.postgres.expressions import ArraySubquery
-from django.db.models import QuerySet, OuterRef, F, Count, Func
+from django.db.models import QuerySet, OuterRef, F, Count
 from django.db.models.functions import JSONObject
 
 from contrast_api.choices import AggregatedOptionalInterpretationsChoices, InterpretationsChoices
@@ -201,10 +199,7 @@ class TrendsOverYearsGraphDataProcessor(BaseProcessor):
     def _aggregate_query_by_breakdown(self, queryset: QuerySet, filtered_subquery: QuerySet):
         # Hopefully this is generic enough to be reused
         if self.is_csv:
-            ids = queryset.order_by().annotate(experiments=ArraySubquery(filtered_subquery.values_list("id"))).values_list(
-                "experiments", flat=True
-            )
-            return set(list(itertools.chain.from_iterable(ids)))
+            return self.get_csv_experiments_ids(queryset.order_by(), filtered_subquery)
         subquery = (
             filtered_subquery.annotate(year=F("study__year"))
             .values("year")
@@ -217,28 +212,13 @@ class TrendsOverYearsGraphDataProcessor(BaseProcessor):
         qs = (
             queryset.values("series_name")
             .annotate(series=ArraySubquery(subquery))
-            .annotate(field_len=Func(F("series"), function="CARDINALITY"))
-            .filter(field_len__gt=0)
             .values("series_name", "series")
             .order_by("series_name")
         )
-        # Note we're filtering out empty timeseries with the cardinality option
-        retval = []
-        earliest_year = None
-        latest_year = None
-
-        for series_data in list(qs):
-            series = self.accumulate_inner_series_values_and_filter(
-                series_data["series"], self.min_number_of_experiments
-            )
-            if len(series):
-                earliest_year_in_series = series_data["series"][0]["year"]
-                latest_year_in_series = series_data["series"][-1]["year"]
-                if earliest_year is None or earliest_year_in_series < earliest_year:
-                    earliest_year = earliest_year_in_series
-                if latest_year is None or latest_year_in_series > latest_year:
-                    latest_year = latest_year_in_series
-                retval.append(dict(series_name=series_data["series_name"], series=series))
+        # the series are accumulated, and filtered by the minimum number of experiments, by the database
+        retval = self.get_cumulative_series(qs)
+        earliest_year = min((line["series"][0]["year"] for line in retval), default=None)
+        latest_year = max((line["series"][-1]["year"] for line in retval), default=None)
         if earliest_year is not None:
             for line in retval:
                 if line["series"][0]["year"] > earliest_year:
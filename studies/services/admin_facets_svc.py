@@ -0,0 +1,50 @@
+from django.db.models import Count, F, Func
+from django.http import QueryDict
+
+from contrast_api.technical_services.graphs_cache import GraphsCacheService
+
+facets_cache = GraphsCacheService(namespace="admin_facets")
+
+
+def get_cached_facet(facet_name: str, compute_facet) -> list[tuple]:
+    """
+    Facet values with their studies count, computed once per dataset version (bumped on any study change)
+    """
+    cache_key = facets_cache.build_key(facet_name, QueryDict())
+    facet = facets_cache.get(cache_key)
+    if facet is None:
+        facet = compute_facet()
+        facets_cache.set(cache_key, facet)
+    return facet
+
+
+def compute_countries_facet() -> list[tuple[str, int]]:
+    from studies.models import Study
+
+    # a single grouped scan over the unnested countries arrays
+    return list(
+        Study.objects.annotate(country=Func(F("countries"), function="unnest"))
+        .values("country")
+        .annotate(count=Count("id"))
+        .order_by("country")
+        .values_list("country", "count")
+    )
+
+
+def compute_journals_facet() -> list[tuple[str | None, int]]:
+    from studies.models import Study
+
+    return list(
+        Study.objects.values("abbreviated_source_title")
+        .annotate(count=Count("id"))
+        .order_by("abbreviated_source_title")
+        .values_list("abbreviated_source_title", "count")
+    )
+
+
+def get_countries_facet() -> list[tuple[str, int]]:
+    return get_cached_facet("countries", compute_countries_facet)
+
+
+def get_journals_facet() -> list[tuple[str | None, int]]:
+    return get_cached_facet("journals", compute_journals_facet)
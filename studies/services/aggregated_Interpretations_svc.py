@@ -1,8 +1,13 @@
+import threading
 from collections import namedtuple
-from typing import List
+from typing import List, Iterable
+
+from django.db import transaction
 
 from contrast_api.choices import InterpretationsChoices, AggregatedInterpretationsChoices
 
+AGGREGATED_NAMES_SEP = " & "
+
 AggregatedInterpretationDTO = namedtuple(
     "AggregatedInterpretationDTO", ["parent_theory_names", "parent_theory_acronyms", "type"]
 )
@@ -20,8 +25,8 @@ class AggregatedInterpretationService:
             pro_acronym_names = [
                 x.parent_theory_acronyms for x in self.interpretations if x.type == InterpretationsChoices.PRO
             ]
-            aggregated_name = " & ".join(pro_names)
-            aggregated_acronyms = " & ".join(pro_acronym_names)
+            aggregated_name = AGGREGATED_NAMES_SEP.join(pro_names)
+            aggregated_acronyms = AGGREGATED_NAMES_SEP.join(pro_acronym_names)
             results.append(
                 AggregatedInterpretationDTO(
                     parent_theory_names=aggregated_name,
@@ -38,8 +43,8 @@ class AggregatedInterpretationService:
                 x.parent_theory_acronyms for x in self.interpretations if x.type == InterpretationsChoices.CHALLENGES
             ]
 
-            aggregated_name = " & ".join(challenge_names)
-            aggregated_acronyms = " & ".join(challenges_acronym_names)
+            aggregated_name = AGGREGATED_NAMES_SEP.join(challenge_names)
+            aggregated_acronyms = AGGREGATED_NAMES_SEP.join(challenges_acronym_names)
 
             results.append(
                 AggregatedInterpretationDTO(
@@ -50,3 +55,28 @@ class AggregatedInterpretationService:
             )
 
         return results
+
+
+_pending = threading.local()
+
+
+def schedule_aggregated_interpretations_refresh(experiment_ids: Iterable[int]):
+    """
+    Refresh the experiments aggregated interpretations once the current transaction commits
+    Saving an experiment with several interpretations triggers a signal per interpretation, the ids are collected so
+    each experiment is aggregated once
+    """
+    pending = _pending.__dict__.setdefault("experiment_ids", set())
+    pending.update(experiment_ids)
+    transaction.on_commit(_refresh_pending_aggregated_interpretations)
+
+
+def _refresh_pending_aggregated_interpretations():
+    from configuration.models import DatasetVersion
+    from studies.models import AggregatedInterpretation
+
+    experiment_ids = _pending.__dict__.pop("experiment_ids", set())
+    if experiment_ids:
+        AggregatedInterpretation.refresh_aggregated_interpretations(experiment_ids)
+        # the interpretations' own bump was committed before the refresh, graphs cached in between are stale
+        DatasetVersion.bump()
@@ -0,0 +1,28 @@
+import threading
+from typing import Iterable
+
+from django.db import transaction
+
+_pending = threading.local()
+
+
+def schedule_experiment_facts_refresh(experiment_ids: Iterable[int]):
+    """
+    Refresh the experiments facts once the current transaction commits
+    Saving an experiment and its related objects triggers many signals, the ids are collected so each experiment is
+    refreshed once, and only after the cascade of a delete (if any) has completed
+    """
+    pending = _pending.__dict__.setdefault("experiment_ids", set())
+    pending.update(experiment_ids)
+    transaction.on_commit(_refresh_pending_experiments_facts)
+
+
+def _refresh_pending_experiments_facts():
+    from configuration.models import DatasetVersion
+    from studies.models import ExperimentFact
+
+    experiment_ids = _pending.__dict__.pop("experiment_ids", set())
+    if experiment_ids:
+        ExperimentFact.refresh_experiments_facts(experiment_ids)
+        # the changes' own bump was committed before the refresh, graphs cached in between are stale
+        DatasetVersion.bump()
@@ -0,0 +1,134 @@
+import threading
+from collections import defaultdict
+from typing import Callable, Iterable, Optional
+
+import numpy
+from django.db.models import QuerySet
+
+from approval_process.choices import ApprovalChoices
+from configuration.models import DatasetVersion
+from studies.models import Experiment, Interpretation, Sample, Measure, ConsciousnessMeasure, FindingTag, Task
+from studies.models.stimulus import Stimulus
+
+_snapshot_lock = threading.Lock()
+_snapshot: Optional["FreeQueriesSnapshot"] = None
+
+
+def get_dimensions_values() -> dict[str, QuerySet]:
+    """
+    The (experiment id, *value) rows of each dimension. The free queries filters are by ids (or choices), and the
+    breakdowns are by names, so options sharing a name (e.g. the Oddball sub types) are a single series
+    """
+    techniques = Experiment.techniques.through.objects
+    paradigms = Experiment.paradigms.through.objects
+    ncc_finding_tags = FindingTag.objects.filter(is_NCC=True)
+    return {
+        # filters
+        "interpretations": Interpretation.objects.values_list("experiment_id", "type", "theory__parent_id"),
+        "techniques": techniques.values_list("experiment_id", "technique_id"),
+        "paradigms": paradigms.values_list("experiment_id", "paradigm_id"),
+        "paradigm_families": paradigms.values_list("experiment_id", "paradigm__parent_id"),
+        "stimuli_categories": Stimulus.objects.values_list("experiment_id", "category_id"),
+        "stimuli_modalities": Stimulus.objects.values_list("experiment_id", "modality_id"),
+        "populations": Sample.objects.values_list("experiment_id", "type"),
+        "measures": Measure.objects.values_list("experiment_id", "type_id"),
+        "consciousness_measure_phases": ConsciousnessMeasure.objects.values_list("experiment_id", "phase_id"),
+        "consciousness_measure_types": ConsciousnessMeasure.objects.values_list("experiment_id", "type_id"),
+        "finding_tags_families": FindingTag.objects.values_list("experiment_id", "family_id"),
+        "finding_tags_types": FindingTag.objects.values_list("experiment_id", "type_id"),
+        "theory_driven": Experiment.objects.values_list("id", "theory_driven"),
+        "types": Experiment.objects.values_list("id", "type"),
+        "tasks": Task.objects.values_list("experiment_id", "type_id"),
+        # breakdowns
+        "paradigm_family": paradigms.values_list("experiment_id", "paradigm__parent__name"),
+        "paradigm": paradigms.filter(paradigm__parent__isnull=False).values_list("experiment_id", "paradigm__name"),
+        "population": Sample.objects.values_list("experiment_id", "type"),
+        "finding_tag": ncc_finding_tags.values_list("experiment_id", "type__name"),
+        "finding_tag_family": ncc_finding_tags.values_list("experiment_id", "family__name"),
+        "reporting": Experiment.objects.values_list("id", "is_reporting"),
+        "task": Task.objects.values_list("experiment_id", "type__name"),
+        "stimuli_category": Stimulus.objects.values_list("experiment_id", "category__name"),
+        "modality": Stimulus.objects.values_list("experiment_id", "modality__name"),
+        "consciousness_measure_phase": ConsciousnessMeasure.objects.values_list("experiment_id", "phase__name"),
+        "consciousness_measure_type": ConsciousnessMeasure.objects.values_list("experiment_id", "type__name"),
+        "type_of_consciousness": Experiment.objects.values_list("id", "type_of_consciousness"),
+        "technique": techniques.values_list("experiment_id", "technique__name"),
+        "measure": Measure.objects.values_list("experiment_id", "type__name"),
+    }
+
+
+def to_value_key(value: tuple) -> str:
+    # values are compared to the query params, so they are kept as strings
+    return ":".join(str(part) for part in value)
+
+
+class FreeQueriesSnapshot:
+    """
+    A columnar snapshot of the approved experiments, for a dataset version: per dimension, its values and a matrix of
+    their packed bitmaps, a bit per experiment (by its position in experiment_ids) that has the value
+    Filters are unions and intersections of bitmaps, and a breakdown is a popcount of each of its values bitmap
+    """
+
+    def __init__(self, version: tuple, experiment_ids: numpy.ndarray, dimensions: dict):
+        self.version = version
+        self.experiment_ids = experiment_ids
+        self.dimensions = dimensions
+
+    @classmethod
+    def build(cls, version: tuple) -> "FreeQueriesSnapshot":
+        experiment_ids = numpy.array(
+            Experiment.objects.filter(study__approval_status=ApprovalChoices.APPROVED)
+            .order_by("id")
+            .values_list("id", flat=True),
+            dtype=numpy.int64,
+        )
+        snapshot = cls(version, experiment_ids, {})
+        for dimension, rows in get_dimensions_values().items():
+            ids_by_value = defaultdict(list)
+            for experiment_id, *value in rows:
+                if None not in value:
+                    ids_by_value[to_value_key(value)].append(experiment_id)
+            values = sorted(ids_by_value)
+            bitmaps = numpy.zeros((len(values), snapshot.bitmap_size), dtype=numpy.uint8)
+            for index, value in enumerate(values):
+                bitmaps[index] = snapshot.to_bitmap(ids_by_value[value])
+            snapshot.dimensions[dimension] = (values, bitmaps)
+        return snapshot
+
+    @property
+    def bitmap_size(self) -> int:
+        return (len(self.experiment_ids) + 7) // 8
+
+    def to_bitmap(self, experiment_ids: Iterable[int]) -> numpy.ndarray:
+        # experiments outside of the snapshot (not approved) are dropped
+        ids = numpy.fromiter(experiment_ids, dtype=numpy.int64)
+        return numpy.packbits(numpy.isin(self.experiment_ids, ids))
+
+    def any_of(self, dimension: str, is_matching: Callable[[str], bool]) -> numpy.ndarray:
+        values, bitmaps = self.dimensions[dimension]
+        matching = [index for index, value in enumerate(values) if is_matching(value)]
+        if not matching:
+            return numpy.zeros(self.bitmap_size, dtype=numpy.uint8)
+        return numpy.bitwise_or.reduce(bitmaps[matching], axis=0)
+
+    def count_by(self, dimension: str, selection: numpy.ndarray) -> dict[str, int]:
+        values, bitmaps = self.dimensions[dimension]
+        counts = numpy.bitwise_count(bitmaps & selection).sum(axis=1)
+        return dict(zip(values, counts.tolist()))
+
+
+def get_free_queries_snapshot() -> FreeQueriesSnapshot:
+    """
+    The worker's snapshot, rebuilt on the first request after the dataset version was bumped
+    """
+    global _snapshot
+    dataset_version = DatasetVersion.get()
+    # the update time too, so a database restored to a former version number isn't served from a stale snapshot
+    version = (dataset_version.version, dataset_version.updated_at)
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+    with _snapshot_lock:
+        if _snapshot is None or _snapshot.version != version:
+            _snapshot = FreeQueriesSnapshot.build(version)
+        return _snapshot
@@ -0,0 +1,201 @@
+import random
+from collections import defaultdict
+from typing import List
+
+from simple_history.utils import bulk_create_with_history
+
+from approval_process.choices import ApprovalChoices
+from contrast_api.choices import (
+    StudyTypeChoices,
+    TypeOfConsciousnessChoices,
+    ReportingChoices,
+    TheoryDrivenChoices,
+    ExperimentTypeChoices,
+    InterpretationsChoices,
+    SampleChoices,
+    AnalysisTypeChoices,
+    DirectionChoices,
+)
+from studies.models import (
+    Study,
+    Experiment,
+    Theory,
+    Technique,
+    Paradigm,
+    ConsciousnessMeasure,
+    ConsciousnessMeasureType,
+    ConsciousnessMeasurePhaseType,
+    Measure,
+    MeasureType,
+    Sample,
+    Task,
+    TaskType,
+    ModalityType,
+    FindingTag,
+    FindingTagType,
+)
+from studies.models.finding_tag import AALAtlasTag
+from studies.models.stimulus import StimulusCategory, StimulusSubCategory, Stimulus
+from studies.parsers.staged_import import HistoricExperimentDTO, persist_experiments, recompute_derived_data
+
+SYNTHETIC_DOI_PREFIX = "10.synthetic/"
+
+SYNTHETIC_COUNTRIES = ["US", "GB", "DE", "FR", "IL", "NL", "IT", "JP", "CN", "CA", "AU", "ES", "CH", "SE", "BR"]
+SYNTHETIC_JOURNALS_COUNT = 150
+
+
+def skewed_choice(rng: random.Random, options: list):
+    # a few popular options and a long tail, as paradigms, journals and countries are in the real corpus
+    return options[min(int(rng.paretovariate(1.2)) - 1, len(options) - 1)]
+
+
+def fan_out(rng: random.Random, low: int, high: int) -> int:
+    # mostly the low end, occasionally up to high
+    return min(low + int(rng.expovariate(1.0)), high)
+
+
+def generate_synthetic_studies(rng: random.Random, count: int, study_type: str, run_key: str) -> List[Study]:
+    journals = [f"synthetic journal {index}" for index in range(SYNTHETIC_JOURNALS_COUNT)]
+    studies = [
+        Study(
+            DOI=f"{SYNTHETIC_DOI_PREFIX}{run_key}.{index}",
+            title=f"synthetic {study_type} study {index}",
+            year=min(int(rng.triangular(1990, 2026, 2022)), 2025),
+            approval_status=ApprovalChoices.APPROVED,
+            type=study_type,
+            countries=sorted({skewed_choice(rng, SYNTHETIC_COUNTRIES) for _ in range(fan_out(rng, 1, 4))}),
+            abbreviated_source_title=skewed_choice(rng, journals),
+            authors_key_words=["synthetic"],
+            affiliations="synthetic affiliations",
+        )
+        for index in range(count)
+    ]
+    return bulk_create_with_history(studies, Study)
+
+
+class ContrastConfiguration:
+    """
+    The configuration entities the synthetic experiments refer to, as created by the migrations
+    """
+
+    def __init__(self):
+        self.child_theories = list(Theory.objects.filter(parent__isnull=False))
+        self.techniques = list(Technique.objects.all())
+        self.paradigms = list(Paradigm.objects.filter(parent__isnull=False))
+        self.consciousness_measure_types = list(ConsciousnessMeasureType.objects.all())
+        self.consciousness_measure_phases = list(ConsciousnessMeasurePhaseType.objects.all())
+        self.measure_types = list(MeasureType.objects.all())
+        self.task_types = list(TaskType.objects.all())
+        self.modality_types = list(ModalityType.objects.all())
+        self.stimulus_categories = list(StimulusCategory.objects.all())
+        self.stimulus_sub_categories = defaultdict(list)
+        for sub_category in StimulusSubCategory.objects.all():
+            self.stimulus_sub_categories[sub_category.parent_id].append(sub_category)
+        self.finding_tag_types = list(FindingTagType.objects.select_related("family").filter(family__isnull=False))
+        self.aal_atlas_tags = list(AALAtlasTag.objects.order_by("id"))
+
+
+def generate_finding_tag(
+    rng: random.Random, configuration: ContrastConfiguration, techniques: list, atlas_tags: list
+) -> FindingTag:
+    tag_type = skewed_choice(rng, configuration.finding_tag_types)
+    finding_tag = FindingTag(
+        family=tag_type.family, type=tag_type, is_NCC=rng.random() < 0.8, technique=rng.choice(techniques)
+    )
+    if tag_type.family.name in ("Temporal", "Frequency"):
+        finding_tag.onset = rng.randrange(-200, 600, 10)
+        finding_tag.offset = finding_tag.onset + rng.randrange(10, 500, 10)
+    if tag_type.family.name == "Frequency":
+        finding_tag.band_lower_bound = rng.randrange(1, 80)
+        finding_tag.band_higher_bound = finding_tag.band_lower_bound + rng.randrange(1, 40)
+        finding_tag.analysis_type = rng.choice(AnalysisTypeChoices.values)
+        finding_tag.direction = rng.choice(DirectionChoices.values)
+    elif tag_type.family.name == "Spatial Areas" and configuration.aal_atlas_tags:
+        # the brain images graph reads the AAL_atlas_tags relation, added once the finding tag is inserted
+        regions = rng.sample(configuration.aal_atlas_tags, fan_out(rng, 1, 4))
+        atlas_tags.extend((finding_tag, region) for region in regions)
+    return finding_tag
+
+
+def generate_experiment(
+    rng: random.Random, index: int, study: Study, configuration: ContrastConfiguration, atlas_tags: list
+) -> HistoricExperimentDTO:
+    experiment = Experiment(
+        study=study,
+        type_of_consciousness=rng.choice(TypeOfConsciousnessChoices.values),
+        is_reporting=rng.choice(ReportingChoices.values),
+        theory_driven=rng.choice(TheoryDrivenChoices.values),
+        type=rng.choice(ExperimentTypeChoices.values),
+    )
+    dto = HistoricExperimentDTO(index=index, item={}, experiment=experiment)
+    theories = rng.sample(configuration.child_theories, fan_out(rng, 1, min(3, len(configuration.child_theories))))
+    dto.interpretations = [(theory, rng.choice(InterpretationsChoices.values)) for theory in theories]
+    if experiment.theory_driven != TheoryDrivenChoices.POST_HOC:
+        dto.theory_driven_theories = theories[:1]
+    dto.techniques = rng.sample(configuration.techniques, fan_out(rng, 1, min(3, len(configuration.techniques))))
+    dto.paradigms = list({skewed_choice(rng, configuration.paradigms) for _ in range(fan_out(rng, 1, 3))})
+    dto.consciousness_measures = [
+        ConsciousnessMeasure(
+            phase=rng.choice(configuration.consciousness_measure_phases),
+            type=rng.choice(configuration.consciousness_measure_types),
+        )
+        for _ in range(fan_out(rng, 1, 2))
+    ]
+    dto.measures = [Measure(type=rng.choice(configuration.measure_types)) for _ in range(fan_out(rng, 1, 3))]
+    total_size = rng.randrange(8, 120)
+    dto.samples = [
+        Sample(
+            type=skewed_choice(rng, SampleChoices.values),
+            total_size=total_size,
+            size_included=total_size - rng.randrange(0, total_size // 4 + 1),
+        )
+    ]
+    dto.tasks = [Task(type=rng.choice(configuration.task_types)) for _ in range(fan_out(rng, 1, 2))]
+    dto.stimuli = []
+    for _ in range(fan_out(rng, 1, 3)):
+        category = rng.choice(configuration.stimulus_categories)
+        sub_categories = configuration.stimulus_sub_categories[category.id]
+        dto.stimuli.append(
+            Stimulus(
+                category=category,
+                sub_category=rng.choice(sub_categories) if sub_categories and rng.random() < 0.5 else None,
+                modality=skewed_choice(rng, configuration.modality_types),
+                duration=rng.choice([None, rng.randrange(10, 2000)]),
+            )
+        )
+    dto.finding_tags = [
+        generate_finding_tag(rng, configuration, dto.techniques, atlas_tags) for _ in range(fan_out(rng, 1, 4) * 2)
+    ]
+    return dto
+
+
+def generate_contrast_corpus(experiments_count: int, seed: int = 0, batch_size: int = 500, report=print) -> List[int]:
+    """
+    Creates approved synthetic studies with experiments_count experiments (about 3 per study), each with a realistic
+    fan out of interpretations, paradigms, techniques, stimuli and finding tags, through the staged import bulk inserts
+    """
+    rng = random.Random(seed)
+    configuration = ContrastConfiguration()
+    studies = generate_synthetic_studies(
+        rng, max(experiments_count // 3, 1), StudyTypeChoices.CONSCIOUSNESS, run_key=f"contrast.{seed}"
+    )
+
+    experiment_ids = []
+    for start in range(0, experiments_count, batch_size):
+        # (finding tag, AAL atlas tag) pairs of the batch
+        atlas_tags = []
+        dtos = [
+            generate_experiment(rng, index, rng.choice(studies), configuration, atlas_tags)
+            for index in range(start, min(start + batch_size, experiments_count))
+        ]
+        experiment_ids.extend(persist_experiments(dtos))
+        FindingTag.AAL_atlas_tags.through.objects.bulk_create(
+            [
+                FindingTag.AAL_atlas_tags.through(findingtag_id=finding_tag.id, aalatlastag_id=region.id)
+                for finding_tag, region in atlas_tags
+            ]
+        )
+        report(f"{len(experiment_ids)} of {experiments_count} contrast experiments generated")
+
+    recompute_derived_data(experiment_ids, batch_size)
+    return experiment_ids
@@ -228,6 +228,21 @@ class AcrossTheYearsGraphTestCase(BaseTestCase):
         self.assertDictEqual(second_series["series"][0], dict(year=2002, value=2))
         self.assertDictEqual(second_series["series"][1], dict(year=2004, value=3))  # accumulated
 
+    def test_across_the_years_filters_series_by_min_number_of_experiments(self):
+        self._given_world_setup()
+
+        target_url = self.reverse_with_query_params(
+            "experiments-graphs-across-the-years", breakdown="technique", min_number_of_experiments=3
+        )
+        res = self.client.get(target_url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        # the first technique has a single experiment, so only the second one is left
+        self.assertEqual(len(res.data), 1)
+        self.assertEqual(res.data[0]["series_name"], "b_second_technique")
+        self.assertEqual(
+            [dict(point) for point in res.data[0]["series"]], [dict(year=2002, value=2), dict(year=2004, value=3)]
+        )
+
     def test_across_the_years_is_reporting_breakdown(self):
         (
             another_different_child_paradigm,
@@ -275,6 +290,18 @@ class AcrossTheYearsGraphTestCase(BaseTestCase):
                 self.assertEqual(res.status_code, status.HTTP_200_OK)
                 self.assertEqual(res["Content-Type"], "text/csv")
 
+    def test_across_the_years_csv_is_streamed(self):
+        self._given_world_setup()
+        target_url = self.reverse_with_query_params(
+            "experiments-graphs-across-the-years", breakdown="reporting", is_csv="true"
+        )
+        res = self.client.get(target_url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        lines = b"".join(res.streaming_content).decode("utf-8").splitlines()
+        self.assertIn("Experiment_id", lines[0])
+        self.assertEqual(len(lines), 1 + 3)  # headers and the three experiments
+
     def test_across_the_years_sanity_check(self):
         (
             another_different_child_paradigm,
@@ -12,6 +12,7 @@ from contrast_api.choices import (
 )
 from studies.models import FindingTag, FindingTagFamily, FindingTagType, Technique
 from django_countries import countries
+from studies.services.admin_facets_svc import get_countries_facet, get_journals_facet
 
 User = get_user_model()
 
@@ -222,6 +223,16 @@ class AdminViewsTest(TestCase):
         self.assertEqual(queryset.first().abbreviated_source_title, "Journal Y")
         self.assertEqual(queryset.first().title, "Study Approved")
 
+    def test_study_admin_country_and_journal_facets_are_counted(self):
+        self.assertEqual(get_countries_facet(), [("CA", 1), ("US", 2)])
+        self.assertEqual(get_journals_facet(), [("Journal X", 2), ("Journal Y", 1)])
+
+        url = reverse("admin:studies_study_changelist")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, f"{countries.name('US')} (2)")
+        self.assertContains(response, "Journal x (2)")
+
     def test_experiment_admin_filter_by_type_of_consciousness(self):
         exp1 = Experiment.objects.create(
             study=self.study_approved,
@@ -1,5 +1,6 @@
 from contrast_api.tests.base import BaseTestCase
 from contrast_api.choices import InterpretationsChoices, AggregatedInterpretationsChoices
+from studies.models import AggregatedInterpretation, Interpretation
 from studies.services.aggregated_Interpretations_svc import AggregatedInterpretationService, AggregatedInterpretationDTO
 
 
@@ -53,3 +54,47 @@ class AggregatedInterpretationsServiceTestCase(BaseTestCase):
         self.assertEqual(result[0].type, AggregatedInterpretationsChoices.PRO)  # Alphabetical order
         self.assertEqual(result[1].parent_theory_names, "HOT & IIT")
         self.assertEqual(result[1].type, AggregatedInterpretationsChoices.CHALLENGES)
+
+    def _given_experiment_with_interpretations(self):
+        study = self.given_study_exists()
+        experiment = self.given_experiment_exists_for_study(study=study)
+        interpretations = [
+            ("Recurrent Processing", "RPT", InterpretationsChoices.PRO),
+            ("Global Workspace", "GNW", InterpretationsChoices.PRO),
+            ("Integrated Information", "IIT", InterpretationsChoices.CHALLENGES),
+            ("Higher Order", "HOT", InterpretationsChoices.NEUTRAL),
+        ]
+        for parent_name, acronym, interpretation_type in interpretations:
+            parent_theory = self.given_theory_exists(name=parent_name, acronym=acronym)
+            theory = self.given_theory_exists(name=f"{parent_name} child", parent=parent_theory)
+            Interpretation.objects.create(experiment=experiment, theory=theory, type=interpretation_type)
+        return experiment
+
+    def _get_aggregated_interpretations(self, experiment):
+        return sorted(
+            experiment.aggregated_theories.values_list("type", "parent_theory_names", "parent_theory_acronyms")
+        )
+
+    def test_interpretations_are_aggregated_once_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            experiment = self._given_experiment_with_interpretations()
+            self.assertFalse(AggregatedInterpretation.objects.filter(experiment=experiment).exists())
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(
+            self._get_aggregated_interpretations(experiment),
+            [
+                (AggregatedInterpretationsChoices.CHALLENGES, "Integrated Information", "IIT"),
+                (AggregatedInterpretationsChoices.PRO, "Global Workspace & Recurrent Processing", "GNW & RPT"),
+            ],
+        )
+
+    def test_rebuild_all_matches_per_experiment_aggregation(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            experiment = self._given_experiment_with_interpretations()
+        aggregated_interpretations = self._get_aggregated_interpretations(experiment)
+
+        created = AggregatedInterpretation.rebuild_all_aggregated_interpretations()
+        self.assertEqual(created, 2)
+        self.assertEqual(self._get_aggregated_interpretations(experiment), aggregated_interpretations)
@@ -34,3 +34,16 @@ class AuthorsTestCase(BaseTestCase):
         res = self.when_a_user_searches_for_author("cher")
         self.assertEqual(len(res.data["results"]), 1)
         self.assertEqual(res.data["results"][0]["name"], "mr researcher")
+
+    def test_autocomplete_ranks_prefix_matches_first(self):
+        self.given_user_exists(username="submitting_user")
+        self.given_user_authenticated("submitting_user", "12345")
+        self.given_an_author_exists("Cohen, Michael")
+        self.given_an_author_exists("Michaelson, Dana")
+        self.given_an_author_exists("Levi, Ruth")
+
+        res = self.client.get(self.reverse_with_query_params("authors-autocomplete", search="michael"))
+        self.assertEqual([author["name"] for author in res.data], ["Michaelson, Dana", "Cohen, Michael"])
+
+        res = self.client.get(self.reverse_with_query_params("authors-autocomplete", search=""))
+        self.assertEqual(res.data, [])
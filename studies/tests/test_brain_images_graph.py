@@ -0,0 +1,86 @@
+from rest_framework import status
+
+from approval_process.choices import ApprovalChoices
+from contrast_api.choices import ReportingChoices, InterpretationsChoices
+from contrast_api.tests.base import BaseTestCase
+from studies.models import Experiment, FindingTagFamily, FindingTagType, BrainImage
+from studies.models.finding_tag import AALAtlasTag
+from studies.processors.brain_images import BrainImagesDataProcessor
+
+
+class BrainImagesGraphTestCase(BaseTestCase):
+    def _given_world_setup(self):
+        study = self.given_study_exists(title="Israeli study", DOI="10.1016/j.cortex.2017.07.011", year=2002)
+        self.gnw_parent_theory = self.given_theory_exists(parent=None, name="Global Workspace", acronym="GNW")
+        gnw_child_theory = self.given_theory_exists(parent=self.gnw_parent_theory, name="GNW_child")
+        fmri_technique = self.given_technique_exists("fMRI")
+        spatial_family = FindingTagFamily.objects.get(name="Spatial Areas")
+        tag_type, created = FindingTagType.objects.get_or_create(name="BOLD", family=spatial_family)
+        experiment = self.given_experiment_exists_for_study(
+            study=study,
+            is_reporting=ReportingChoices.NO_REPORT,
+            techniques=[fmri_technique],
+            finding_tags=[dict(type=tag_type, technique=fmri_technique, family=spatial_family, is_NCC=True)],
+        )
+        self.experiment = experiment
+        self.finding_tag = experiment.finding_tags.first()
+        self.finding_tag.AAL_atlas_tags.add(AALAtlasTag.objects.create(name="Frontal_Mid"))
+        self.given_interpretation_exist(
+            experiment=experiment, theory=gnw_child_theory, interpretation_type=InterpretationsChoices.PRO
+        )
+
+    def _given_processor(self) -> BrainImagesDataProcessor:
+        experiments = Experiment.objects.filter(study__approval_status=ApprovalChoices.APPROVED)
+        return BrainImagesDataProcessor(experiments, theory=[self.gnw_parent_theory.name])
+
+    def test_stored_brain_image_is_served_without_rendering(self):
+        self._given_world_setup()
+        processor = self._given_processor()
+        stored_payload = {
+            "medial": "stored medial",
+            "lateral": "stored lateral",
+            "theory": self.gnw_parent_theory.name,
+            "title_text": "title",
+            "caption_text": "caption",
+            "color": "#D76964",
+            "color_list": ["(0, (0, 0, 0, 0))"],
+        }
+        BrainImage.objects.create(
+            key=processor.get_artifact_key(processor.get_queryset()),
+            theory=self.gnw_parent_theory.name,
+            payload=stored_payload,
+        )
+
+        target_url = self.reverse_with_query_params(
+            "experiments-graphs-brain-images", theory=self.gnw_parent_theory.name
+        )
+        res = self.client.get(target_url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data[0]["medial"], "stored medial")
+        self.assertEqual(res.data[0]["color_list"], ["(0, (0, 0, 0, 0))"])
+
+    def test_artifact_key_changes_with_contributing_findings(self):
+        self._given_world_setup()
+        processor = self._given_processor()
+        key_before = processor.get_artifact_key(processor.get_queryset())
+        self.assertEqual(key_before, processor.get_artifact_key(processor.get_queryset()))
+
+        self.finding_tag.AAL_atlas_tags.add(AALAtlasTag.objects.create(name="Precuneus"))
+        processor = self._given_processor()
+        self.assertNotEqual(key_before, processor.get_artifact_key(processor.get_queryset()))
+
+    def test_artifact_key_changes_with_the_interpretations_types(self):
+        self._given_world_setup()
+        iit_parent_theory = self.given_theory_exists(parent=None, name="Integrated Information", acronym="IIT")
+        iit_child_theory = self.given_theory_exists(parent=iit_parent_theory, name="IIT_child")
+        iit_interpretation = self.given_interpretation_exist(
+            experiment=self.experiment, theory=iit_child_theory, interpretation_type=InterpretationsChoices.CHALLENGES
+        )
+        processor = self._given_processor()
+        key_before = processor.get_artifact_key(processor.get_queryset())
+        self.assertEqual(key_before, processor.get_artifact_key(processor.get_queryset()))
+
+        iit_interpretation.type = InterpretationsChoices.NEUTRAL
+        iit_interpretation.save()
+        processor = self._given_processor()
+        self.assertNotEqual(key_before, processor.get_artifact_key(processor.get_queryset()))
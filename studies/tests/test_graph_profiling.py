@@ -0,0 +1,50 @@
+from rest_framework import status
+
+from contrast_api.choices import ReportingChoices, InterpretationsChoices
+from contrast_api.tests.base import BaseTestCase
+
+
+class GraphProfilingTestCase(BaseTestCase):
+    def _given_world_setup(self):
+        study = self.given_study_exists(
+            title="Israeli study",
+            countries=["IL"],
+            abbreviated_source_title="the first journal",
+            DOI="10.1016/j.cortex.2017.07.011",
+            year=2002,
+        )
+        self.gnw_parent_theory = self.given_theory_exists(parent=None, name="GNW", acronym="GNW")
+        gnw_child_theory = self.given_theory_exists(parent=self.gnw_parent_theory, name="GNW_child")
+        experiment = self.given_experiment_exists_for_study(study=study, is_reporting=ReportingChoices.NO_REPORT)
+        self.given_interpretation_exist(
+            experiment=experiment, theory=gnw_child_theory, interpretation_type=InterpretationsChoices.PRO
+        )
+
+    def test_profile_is_ignored_for_non_staff_users(self):
+        self._given_world_setup()
+        target_url = self.reverse_with_query_params(
+            "experiments-graphs-journals", theory=self.gnw_parent_theory.id, profile="true"
+        )
+        res = self.client.get(target_url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data[0]["value"], 1)
+
+    def test_staff_profile_returns_the_graph_with_its_explained_statements(self):
+        self._given_world_setup()
+        self.given_user_exists(username="staff", is_staff=True)
+        self.given_user_authenticated(username="staff", password="12345")
+        target_url = self.reverse_with_query_params(
+            "experiments-graphs-journals", theory=self.gnw_parent_theory.id, profile="true"
+        )
+        res = self.client.get(target_url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn("ETag", res.headers)
+        self.assertEqual(res.data["data"][0]["value"], 1)
+
+        profile = res.data["profile"]
+        self.assertGreater(profile["queries"], 0)
+        self.assertIn("processor_time", profile["phases_ms"])
+        self.assertIn("serializer_time", profile["phases_ms"])
+        explained_statements = [statement for statement in profile["statements"] if statement["plan"]]
+        self.assertTrue(explained_statements)
+        self.assertIn("Execution Time", explained_statements[0]["plan"])
@@ -0,0 +1,110 @@
+import json
+import time
+from unittest import mock
+
+from django.db import connection, OperationalError
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from contrast_api.choices import ReportingChoices, InterpretationsChoices
+from contrast_api.tests.base import BaseTestCase
+from studies.processors.journals import JournalsGraphDataProcessor
+
+
+class GraphsBatchTestCase(BaseTestCase):
+    def _given_world_setup(self):
+        study = self.given_study_exists(
+            title="Israeli study",
+            countries=["IL"],
+            abbreviated_source_title="the first journal",
+            DOI="10.1016/j.cortex.2017.07.011",
+            year=2002,
+        )
+        self.gnw_parent_theory = self.given_theory_exists(parent=None, name="GNW", acronym="GNW")
+        gnw_child_theory = self.given_theory_exists(parent=self.gnw_parent_theory, name="GNW_child")
+        experiment = self.given_experiment_exists_for_study(study=study, is_reporting=ReportingChoices.NO_REPORT)
+        self.given_interpretation_exist(
+            experiment=experiment, theory=gnw_child_theory, interpretation_type=InterpretationsChoices.PRO
+        )
+
+    def _post_batch(self, graphs):
+        return self.client.post(
+            reverse("experiments-graphs-batch"), data=json.dumps(dict(graphs=graphs)), content_type="application/json"
+        )
+
+    def test_batch_returns_each_graph_by_key(self):
+        self._given_world_setup()
+        res = self._post_batch(
+            [
+                dict(graph_type="journals", params=dict(theory=self.gnw_parent_theory.id)),
+                dict(
+                    key="reported_journals",
+                    graph_type="journals",
+                    params=dict(theory=self.gnw_parent_theory.id, is_reporting=ReportingChoices.REPORT),
+                ),
+                dict(graph_type="parameters_distribution_pie", params=dict(breakdown="reporting")),
+            ]
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        single_res = self.client.get(
+            self.reverse_with_query_params("experiments-graphs-journals", theory=self.gnw_parent_theory.id)
+        )
+        self.assertEqual(res.data["journals"]["status"], status.HTTP_200_OK)
+        self.assertEqual(res.data["journals"]["data"], single_res.data)
+        self.assertEqual(res.data["reported_journals"]["data"], [])
+        self.assertEqual(res.data["parameters_distribution_pie"]["data"][0]["series_name"], ReportingChoices.NO_REPORT)
+
+    def test_batch_item_failure_does_not_fail_the_batch(self):
+        self._given_world_setup()
+        res = self._post_batch(
+            [
+                dict(graph_type="journals", params=dict(theory=self.gnw_parent_theory.id)),
+                dict(graph_type="not_a_graph"),
+            ]
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["journals"]["status"], status.HTTP_200_OK)
+        self.assertEqual(res.data["not_a_graph"]["status"], status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_item_with_invalid_filters_is_rejected_and_not_cached(self):
+        self._given_world_setup()
+        params = dict(theory=self.gnw_parent_theory.id, is_reporting="not_a_choice")
+        res = self._post_batch([dict(graph_type="journals", params=params)])
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["journals"]["status"], status.HTTP_400_BAD_REQUEST)
+        self.assertIn("is_reporting", res.data["journals"]["error"])
+
+        single_res = self.client.get(self.reverse_with_query_params("experiments-graphs-journals", **params))
+        self.assertEqual(single_res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_rejects_repeated_keys(self):
+        res = self._post_batch([dict(graph_type="journals"), dict(graph_type="journals")])
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(GRAPHS_BATCH_MAX_WORKERS=2, GRAPHS_BATCH_TIMEOUT=0.5)
+    def test_batch_deadline_cancels_the_running_statements(self):
+        cancelled = []
+
+        def slow_process(processor):
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT pg_sleep(5)")
+            except OperationalError:
+                cancelled.append(True)
+                raise
+
+        start = time.monotonic()
+        with mock.patch.object(JournalsGraphDataProcessor, "process", slow_process):
+            res = self._post_batch([dict(graph_type="journals", key="slow")])
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["slow"]["status"], status.HTTP_504_GATEWAY_TIMEOUT)
+        self.assertLess(time.monotonic() - start, 3)
+
+        # the database cancels the statement shortly after the deadline, instead of it running for the whole sleep
+        for _ in range(40):
+            if cancelled:
+                break
+            time.sleep(0.1)
+        self.assertEqual(cancelled, [True])
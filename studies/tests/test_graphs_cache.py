@@ -0,0 +1,105 @@
+from django.test import override_settings
+from rest_framework import status
+
+from configuration.models import DatasetVersion
+from contrast_api.choices import ReportingChoices, InterpretationsChoices
+from contrast_api.tests.base import BaseTestCase
+from studies.models import FindingTag, FindingTagFamily, FindingTagType
+from studies.models.finding_tag import AALAtlasTag
+
+GRAPHS_CACHE_ENABLED = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "graphs": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "graphs-tests"},
+}
+
+
+@override_settings(CACHES=GRAPHS_CACHE_ENABLED)
+class GraphsCacheTestCase(BaseTestCase):
+    def _given_world_setup(self):
+        self.study = self.given_study_exists(
+            title="Israeli study",
+            countries=["IL"],
+            abbreviated_source_title="the first journal",
+            DOI="10.1016/j.cortex.2017.07.011",
+            year=2002,
+        )
+        self.gnw_parent_theory = self.given_theory_exists(parent=None, name="GNW", acronym="GNW")
+        self.gnw_child_theory = self.given_theory_exists(parent=self.gnw_parent_theory, name="GNW_child")
+        experiment = self.given_experiment_exists_for_study(study=self.study, is_reporting=ReportingChoices.NO_REPORT)
+        self.given_interpretation_exist(
+            experiment=experiment, theory=self.gnw_child_theory, interpretation_type=InterpretationsChoices.PRO
+        )
+
+    def test_repeated_graph_request_is_served_from_cache(self):
+        self._given_world_setup()
+        target_url = self.reverse_with_query_params("experiments-graphs-journals", theory=self.gnw_parent_theory.id)
+        res = self.client.get(target_url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data[0]["value"], 1)
+
+        # only the dataset version lookup is expected
+        with self.assertNumQueries(1):
+            cached_res = self.client.get(target_url)
+        self.assertEqual(cached_res.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached_res.data, res.data)
+
+    def test_cache_key_ignores_query_params_order(self):
+        self._given_world_setup()
+        first_url = self.reverse_with_query_params(
+            "experiments-graphs-journals", theory=self.gnw_parent_theory.id, is_reporting="either"
+        )
+        second_url = self.reverse_with_query_params(
+            "experiments-graphs-journals", is_reporting="either", theory=self.gnw_parent_theory.id
+        )
+        self.client.get(first_url)
+        with self.assertNumQueries(1):
+            res = self.client.get(second_url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_data_change_invalidates_cached_graph(self):
+        self._given_world_setup()
+        target_url = self.reverse_with_query_params("experiments-graphs-journals", theory=self.gnw_parent_theory.id)
+        version_before = DatasetVersion.current()
+        res = self.client.get(target_url)
+        self.assertEqual(res.data[0]["value"], 1)
+
+        another_experiment = self.given_experiment_exists_for_study(
+            study=self.study, results_summary="brave new world", is_reporting=ReportingChoices.NO_REPORT
+        )
+        self.given_interpretation_exist(
+            experiment=another_experiment, theory=self.gnw_child_theory, interpretation_type=InterpretationsChoices.PRO
+        )
+        self.assertGreater(DatasetVersion.current(), version_before)
+
+        res = self.client.get(target_url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data[0]["value"], 2)
+
+    def test_related_data_changes_bump_the_dataset_version(self):
+        self._given_world_setup()
+        experiment = self.study.experiments.first()
+        version_before = DatasetVersion.current()
+        self.given_measure_exists(experiment_id=experiment.id, measure_type="a_measure")
+        self.assertGreater(DatasetVersion.current(), version_before)
+
+        paradigm = self.given_paradigm_exists(name="a_paradigm")
+        version_before = DatasetVersion.current()
+        experiment.paradigms.add(paradigm)
+        self.assertGreater(DatasetVersion.current(), version_before)
+
+        spatial_family = FindingTagFamily.objects.get(name="Spatial Areas")
+        tag_type, created = FindingTagType.objects.get_or_create(name="BOLD", family=spatial_family)
+        finding_tag = FindingTag.objects.create(experiment=experiment, family=spatial_family, type=tag_type)
+        version_before = DatasetVersion.current()
+        finding_tag.AAL_atlas_tags.add(AALAtlasTag.objects.create(name="Frontal_Mid"))
+        self.assertGreater(DatasetVersion.current(), version_before)
+
+    def test_graph_conditional_get_is_answered_before_processing(self):
+        self._given_world_setup()
+        target_url = self.reverse_with_query_params("experiments-graphs-journals", theory=self.gnw_parent_theory.id)
+        res = self.client.get(target_url)
+        etag = res.headers["ETag"]
+
+        with self.assertNumQueries(1):
+            not_modified_res = self.client.get(target_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified_res.status_code, status.HTTP_304_NOT_MODIFIED)
@@ -1,3 +1,4 @@
+from django.test import override_settings
 from rest_framework import status
 
 from contrast_api.choices import ReportingChoices, InterpretationsChoices, SampleChoices
@@ -274,3 +275,41 @@ class ParameterDistributionFreeQueriesGraphTestCase(BaseTestCase):
             )
             res = self.client.get(target_url)
             self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_snapshot_mode_matches_subqueries(self):
+        (
+            another_different_child_paradigm,
+            different_child_paradigm,
+            different_parent_paradigm,
+            first_measure,
+            first_technique,
+            fourth_measure,
+            masking_child_paradigm,
+            masking_parent_paradigm,
+            second_measure,
+            second_technique,
+            third_measure_with_second_type,
+        ) = self._given_world_setup()
+        filters_options = [
+            dict(),
+            dict(techniques=[first_technique.id]),
+            dict(paradigm_families=[masking_parent_paradigm.id], measures=[second_measure.type_id]),
+            dict(
+                interpretations_types=[InterpretationsChoices.PRO], interpretation_theories=[self.rpt_parent_theory.id]
+            ),
+        ]
+        for breakdown in BREAKDOWN_OPTIONS:
+            for filters in filters_options:
+                target_url = self.reverse_with_query_params(
+                    "experiments-graphs-parameters-distribution-free-queries", breakdown=breakdown, **filters
+                )
+                res = self.client.get(target_url)
+                with override_settings(GRAPHS_USE_FREE_QUERIES_SNAPSHOT=True):
+                    snapshot_res = self.client.get(target_url)
+                self.assertEqual(snapshot_res.status_code, status.HTTP_200_OK)
+                # ties are ordered by python rather than by the database collation
+                self.assertEqual(
+                    sorted((item["key"], item["value"]) for item in snapshot_res.data),
+                    sorted((item["key"], item["value"]) for item in res.data),
+                    (breakdown, filters),
+                )
@@ -1,7 +1,9 @@
+from django.test import override_settings
 from rest_framework import status
 
-from contrast_api.choices import ReportingChoices, InterpretationsChoices
+from contrast_api.choices import ReportingChoices, InterpretationsChoices, ExperimentFactDimensionChoices
 from contrast_api.tests.base import BaseTestCase
+from studies.models import Technique, ExperimentFact, Experiment, Paradigm
 from studies.open_api_parameters import BREAKDOWN_OPTIONS
 
 
@@ -162,6 +164,17 @@ class ParameterDistributionPieGraphTestCase(BaseTestCase):
         self.assertEqual(first_series["series"][1]["key"], self.rpt_parent_theory.name)
         self.assertEqual(first_series["series"][1]["value"], 1)
 
+    def test_parameters_distribution_pie_csv_exports_all_breakdown_experiments(self):
+        self._given_world_setup()
+        target_url = self.reverse_with_query_params(
+            "experiments-graphs-parameters-distribution-pie", breakdown="paradigm_family", is_csv="true"
+        )
+        res = self.client.get(target_url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        lines = b"".join(res.streaming_content).decode("utf-8").splitlines()
+        # every experiment falls under the masking paradigm family, and each is exported once
+        self.assertEqual(len(lines), 1 + 3)
+
     def test_all_options_sanity_test(self):
         """
         This is just a basic sanity test, that nothing throws an exception, later we might add more here
@@ -185,3 +198,32 @@ class ParameterDistributionPieGraphTestCase(BaseTestCase):
             )
             res = self.client.get(target_url)
             self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_experiment_facts_mode_matches_subqueries(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self._given_world_setup()
+            # a family attached directly is only counted by the paradigm family breakdown
+            experiment = Experiment.objects.get(results_summary="brave new world")
+            experiment.paradigms.add(Paradigm.objects.get(name="different_parent_paradigm"))
+        ExperimentFact.refresh_experiments_facts([experiment.id])
+        for breakdown in BREAKDOWN_OPTIONS:
+            target_url = self.reverse_with_query_params(
+                "experiments-graphs-parameters-distribution-pie", breakdown=breakdown
+            )
+            res = self.client.get(target_url)
+            with override_settings(GRAPHS_USE_EXPERIMENT_FACTS=True):
+                facts_res = self.client.get(target_url)
+            self.assertEqual(facts_res.status_code, status.HTTP_200_OK)
+            self.assertEqual(facts_res.data, res.data, breakdown)
+
+    def test_experiment_facts_follow_a_renamed_technique(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self._given_world_setup()
+        technique = Technique.objects.get(name="a_first_technique")
+        with self.captureOnCommitCallbacks(execute=True):
+            technique.name = "a_renamed_technique"
+            technique.save()
+
+        technique_facts = ExperimentFact.objects.filter(dimension=ExperimentFactDimensionChoices.TECHNIQUE)
+        self.assertTrue(technique_facts.filter(value="a_renamed_technique").exists())
+        self.assertFalse(technique_facts.filter(value="a_first_technique").exists())
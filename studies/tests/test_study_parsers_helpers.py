@@ -1,6 +1,7 @@
 from configuration.initial_setup import consciousness_measure_types
 from studies.parsers.historic_data_helpers import get_paradigms_from_data
 from contrast_api.data_migration_functionality.helpers import find_in_list
+from studies.parsers.findings_tokenizer import parse_findings
 from studies.parsers.parsing_findings_Contrast2 import parse
 from contrast_api.data_migration_functionality.studies_parsing_helpers import (
     resolve_authors_from_authors_text,
@@ -59,6 +60,36 @@ class StudyParserHelpersTestCase(BaseTestCase):
         res = parse(text4)
         self.assertEqual(len(res), 2)
 
+    def test_findings_tokenizer_matches_parser(self):
+        golden_corpus = [
+            "5 (Connectivity Neg 90-120Hz <~300-550ms> <EEG> # a comment & Power 10-20Hz <!10-550ms># another comment)"
+            " +   -1 (Inferior_Frontal <fMRI> & Superior_Frontal <EEG>) + -2 (FFA    <MEG>) + 11 + 2 (FFA  <fMRI>)",
+            "20 (# not indicating an area if OK)+2 (Posterior    <fMRI>) + 6 (Dimension of activation)",
+            "14 (Connectivity Neg 7-13Hz <MEG>) + 3 (100-200ms <EEG>) + 4 (!50-!20 <EEG>)",
+            "0 (medial PFC & Orbital PFC &) + 21 (Temporal Pole &) + 42 (Amygdala & Hippocampus)",
+            "41(connectivity between A1 and ACC ) + 11 + 16 (posterior cingulate cortex# −5 −49 26)",
+            "-5 (Power 30-40Hz<340-420ms> # gamma activity)+ -3(380-550ms # P300)",
+            "3 (<300-500ms>) + 3 (~100ms <EEG>) + 6 (a#b#c) + 6 (Dimension (nested) of activation)",
+            "13 (PSD  Neg  4-8Hz) + 28 (ERSP Neg 4-8-9Hz <100 -200ms> <MEG>) + 29 (microstate 8Hz <EEG> #x)",
+            "5 (Power 1,000-2,000Hz)",
+            "5 (Bogus 1Hz)",
+            "5 (Power)",
+            "5 (Power abcHz)",
+            "1 (& &) + 2 (#)",
+            "3 + ",
+            "nan",
+        ]
+
+        def decoded(parser, text):
+            try:
+                return [(type(finding), vars(finding)) for finding in parser(text)]
+            except Exception as error:
+                return type(error)
+
+        for text in golden_corpus:
+            with self.subTest(text=text):
+                self.assertEqual(decoded(parse_findings, text), decoded(parse, text))
+
     def test_paradigm_parser_for_one_paradigm(self):
         item_monocular = {
             "Experimental paradigms.Main Paradigm": "Competition (Monocular)",
@@ -354,6 +354,33 @@ class SubmittedStudiesViewSetTestCase(BaseTestCase):
         self.assertEqual(study.approval_process.comments.last().text, "Submission rejected")
         self.assertEqual(len(study.approval_process.comments.all()), 2)
 
+    def test_bulk_approval_sends_a_single_email_per_submitter(self):
+        self.given_user_exists(username="submitting_user", email="submitting_user@test.com")
+        self.given_user_authenticated("submitting_user", "12345")
+        author1 = self.given_an_author_exists("author1")
+        study_ids = []
+        for title, doi in [("first study", "10.1016/first"), ("second study", "10.1016/second")]:
+            study_res = self.when_study_created_by_user_via_api(
+                authors_key_words=[], authors=[author1.id], title=title, DOI=doi
+            )
+            self.when_study_is_submitted_to_review(study_res["id"])
+            study_ids.append(study_res["id"])
+
+        self.given_user_exists(username="admin_user", is_staff=True, is_superuser=True)
+        self.given_admin_user_authenticated("admin_user", "12345")
+        self.when_admin_approves_study(study_ids)
+
+        self.verify_mailbox_emails_count_by_predicate(
+            lambda x: x.subject.lower() == "regarding your submission to contrast database"
+            and "first study" in x.body
+            and "second study" in x.body,
+            1,
+        )
+        for study in Study.objects.filter(id__in=study_ids):
+            self.assertEqual(study.approval_status, ApprovalChoices.APPROVED)
+            self.assertEqual(study.approval_process.comments.last().text, "Submission approved")
+            self.assertEqual(study.history.first().approval_status, ApprovalChoices.APPROVED)
+
     def test_finding_with_aal_atlas_tags(self):
         # Create study and experiment first
         self.given_user_exists(username="submitting_user", email="submitting_user@test.com")
@@ -1,4 +1,10 @@
-from rest_framework import mixins, permissions
+from django.conf import settings
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db.models import Case, When, Value, IntegerField
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from rest_framework import mixins, permissions, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 from rest_framework import filters
 
@@ -16,3 +22,30 @@ class AuthorsViewSet(mixins.RetrieveModelMixin, mixins.ListModelMixin, mixins.Cr
     serializer_class = AuthorSerializer
     filter_backends = [filters.SearchFilter]
     search_fields = ["name"]
+
+    @extend_schema(
+        parameters=[OpenApiParameter(name="search", type=str, required=True, description="Typed part of the name")],
+        responses=AuthorSerializer(many=True),
+    )
+    @action(detail=False, methods=["GET"], filter_backends=[], pagination_class=None)
+    def autocomplete(self, request, *args, **kwargs):
+        """
+        Ranked and limited matches, names starting with the search first and then by trigram similarity
+        The match uses the trigram index on the name, so it doesn't scan the authors table
+        """
+        search = request.query_params.get("search", "").strip()
+        if not search:
+            return Response([], status=status.HTTP_200_OK)
+
+        authors = (
+            Author.objects.filter(name__icontains=search)
+            .annotate(
+                is_prefix=Case(
+                    When(name__istartswith=search, then=Value(1)), default=Value(0), output_field=IntegerField()
+                ),
+                similarity=TrigramSimilarity("name", search),
+            )
+            .order_by("-is_prefix", "-similarity", "name")[: settings.AUTHORS_AUTOCOMPLETE_LIMIT]
+        )
+        serializer = self.get_serializer(authors, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
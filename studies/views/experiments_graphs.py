@@ -1,4 +1,11 @@
-from django.http import HttpResponse
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django_filters.utils import translate_validation
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import status
 from rest_framework.decorators import action
@@ -40,6 +47,12 @@ from studies.open_api_parameters import (
     theory_added_breakdown_parameter,
 )
 from contrast_api.open_api_parameters import is_csv
+from contrast_api.technical_services.csv_export import create_csv_streaming_response
+from contrast_api.technical_services.conditional_get import dataset_conditional_get, get_request_dataset_version
+from contrast_api.technical_services.graph_profiler import is_profiling_requested, profile_graph
+from contrast_api.technical_services.graphs_cache import GraphsCacheService
+from contrast_api.technical_services.telemetry import measure_phase, evaluate_graph_data
+from contrast_api.utils import cast_as_boolean
 from studies.processors.brain_images import BrainImagesDataProcessor
 from studies.processors.theories_support_matrix import TheoryGrandOverviewGraphDataProcessor
 from studies.processors.trends_over_time import TrendsOverYearsGraphDataProcessor
@@ -67,8 +80,11 @@ from contrast_api.serializers import (
     DurationGraphSerializer,
     NestedPieChartSerializer,
     PieChartSerializer,
+    GraphsBatchSerializer,
 )
 
+logger = logging.getLogger("Contrast2")
+
 
 class ExperimentsGraphsViewSet(GenericViewSet):
     permission_classes = [AllowAny]
@@ -78,6 +94,7 @@ class ExperimentsGraphsViewSet(GenericViewSet):
         study__approval_status=ApprovalChoices.APPROVED
     )
 
+    graphs_cache = GraphsCacheService(namespace="contrast")
     filterset_class = ExperimentFilter
     graph_serializers = {
         "nations_of_consciousness": NationOfConsciousnessByTheoryGraphSerializer,
@@ -345,35 +362,159 @@ class ExperimentsGraphsViewSet(GenericViewSet):
         kwargs.setdefault("context", self.get_serializer_context())
         return serializer_class(instance=data, *args, **kwargs)
 
+    @extend_schema(request=GraphsBatchSerializer, responses=OpenApiTypes.OBJECT)
+    @action(detail=False, methods=["POST"], serializer_class=GraphsBatchSerializer)
+    def batch(self, request, *args, **kwargs):
+        """
+        Several graphs in one request, keyed by each graph's key. Graphs with the same filters share the filtered
+        experiments queryset. Each item has its own status, so a failing graph doesn't fail the whole batch
+        """
+        batch_serializer = GraphsBatchSerializer(data=request.data)
+        batch_serializer.is_valid(raise_exception=True)
+        graphs_specs = batch_serializer.validated_data["graphs"]
+        # resolved up front, so the worker threads share it
+        get_request_dataset_version(request)
+
+        filtersets = {}
+        for spec in graphs_specs:
+            filters_key = self.graphs_cache.normalize_query_params(self.get_filter_params(spec["params"]))
+            if filters_key not in filtersets:
+                filtersets[filters_key] = self.filterset_class(
+                    data=spec["params"], queryset=self.get_queryset(), request=request
+                )
+            spec["filterset"] = filtersets[filters_key]
+
+        max_workers = settings.GRAPHS_BATCH_MAX_WORKERS
+        if max_workers <= 1:
+            results = {spec["key"]: self.get_batch_item(spec) for spec in graphs_specs}
+        else:
+            results = self.get_batch_items_concurrently(graphs_specs, max_workers)
+        return Response(results, status=status.HTTP_200_OK)
+
+    def get_filter_params(self, query_params):
+        filter_params = query_params.copy()
+        for name in list(filter_params.keys()):
+            if name not in self.filterset_class.base_filters:
+                del filter_params[name]
+        return filter_params
+
+    def get_batch_items_concurrently(self, graphs_specs, max_workers):
+        timeout = settings.GRAPHS_BATCH_TIMEOUT
+        deadline = time.monotonic() + timeout
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        futures = {
+            spec["key"]: executor.submit(self.get_batch_item_in_thread, spec, deadline) for spec in graphs_specs
+        }
+        # a single deadline for the whole batch, graphs still running then have their statement cancelled
+        wait(futures.values(), timeout=timeout)
+        executor.shutdown(wait=False, cancel_futures=True)
+        results = {}
+        for key, future in futures.items():
+            if future.done() and not future.cancelled():
+                results[key] = future.result()
+            else:
+                results[key] = dict(status=status.HTTP_504_GATEWAY_TIMEOUT, error="Graph timed out")
+        return results
+
+    def get_batch_item_in_thread(self, spec, deadline):
+        try:
+            # SET LOCAL only lasts for the transaction
+            with transaction.atomic(), connection.execute_wrapper(self.get_statement_deadline_wrapper(deadline)):
+                return self.get_batch_item(spec)
+        finally:
+            # each thread has its own database connection
+            connections.close_all()
+
+    @staticmethod
+    def get_statement_deadline_wrapper(deadline):
+        def limit_statement_to_deadline(execute, sql, params, many, context):
+            remaining_ms = int((deadline - time.monotonic()) * 1000)
+            if remaining_ms <= 0:
+                raise TimeoutError("Graph batch deadline exceeded")
+            # postgres cancels the statement itself, rather than leaving it running after the batch timed out
+            execute("SET LOCAL statement_timeout = %s", [remaining_ms], False, context)
+            return execute(sql, params, many, context)
+
+        return limit_statement_to_deadline
+
+    def get_batch_item(self, spec):
+        graph_type = spec["graph_type"]
+        if graph_type not in self.graph_processors:
+            return dict(status=status.HTTP_400_BAD_REQUEST, error=f"Unknown graph type {graph_type}")
+        filterset = spec["filterset"]
+        # as the single graph endpoint does, rather than caching an unfiltered graph under these params
+        if not filterset.is_valid():
+            return dict(status=status.HTTP_400_BAD_REQUEST, error=translate_validation(filterset.errors).detail)
+        try:
+            data = self.get_graph_data(graph_type, spec["params"], filterset.qs)
+        except Exception:
+            logger.exception(f"batch graph {graph_type} failed for params {dict(spec['params'].lists())}")
+            return dict(status=status.HTTP_500_INTERNAL_SERVER_ERROR, error="Graph failed")
+        return dict(status=status.HTTP_200_OK, data=data)
+
+    def get_graph_data(self, graph_type, query_params, queryset):
+        cache_key = self.graphs_cache.build_key(
+            graph_type, query_params, get_request_dataset_version(self.request).version
+        )
+        cached_data = self.graphs_cache.get(cache_key)
+        if cached_data is not None:
+            return cached_data
+
+        graph_processor = self.graph_processors[graph_type](queryset, **query_params)
+        with measure_phase("processor_time"):
+            graph_data = evaluate_graph_data(graph_processor.process())
+        serializer = self.get_serializer_by_graph_type(graph_type, data=graph_data, many=True)
+        with measure_phase("serializer_time"):
+            data = serializer.data
+        self.graphs_cache.set(cache_key, data)
+        return data
+
+    @dataset_conditional_get
     def graph(self, request, graph_type, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
         graph_data_processor = self.graph_processors.get(graph_type)
         if graph_data_processor is None:
             raise GraphProcessNotRegisteredException(graph_type)
 
+        is_csv_request = cast_as_boolean(request.query_params.get("is_csv", False))
+        if not is_csv_request and is_profiling_requested(request):
+            # staff only, bypasses the graphs cache so every statement of the processor is run and explained
+            queryset = self.filter_queryset(self.get_queryset())
+            profile = profile_graph(self, graph_type, graph_data_processor, queryset, request.query_params, many=True)
+            return Response(profile, status=status.HTTP_200_OK)
+
+        cache_key = None
+        if not is_csv_request:
+            cache_key = self.graphs_cache.build_key(
+                graph_type, request.query_params, get_request_dataset_version(request).version
+            )
+            cached_data = self.graphs_cache.get(cache_key)
+            if cached_data is not None:
+                return Response(cached_data, status=status.HTTP_200_OK)
+
+        queryset = self.filter_queryset(self.get_queryset())
         graph_processor = graph_data_processor(queryset, **request.query_params)
-        graph_data = graph_processor.process()
+        with measure_phase("processor_time"):
+            graph_data = graph_processor.process()
+            if not graph_processor.is_csv:
+                graph_data = evaluate_graph_data(graph_data)
         if not graph_processor.is_csv:
             serializer = self.get_serializer_by_graph_type(graph_type, data=graph_data, many=True)
+            with measure_phase("serializer_time"):
+                data = serializer.data
+            if cache_key is not None:
+                self.graphs_cache.set(cache_key, data)
 
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return Response(data, status=status.HTTP_200_OK)
         else:
             """
             we manipulate the data for csv inside the processor to return a flattened list, 
             Here we select from Experiment with all relevant prefetching and select_related for relations
-            And pass it through the import-export custom resource we've defined
+            And stream it through the import-export custom resource we've defined, batch by batch
             """
             flattened_ids = graph_data
-            dataset = FullExperimentResource().export(
-                queryset=Experiment.objects.related().filter(id__in=flattened_ids)
+            return create_csv_streaming_response(
+                FullExperimentResource(), queryset=Experiment.objects.related().filter(id__in=flattened_ids)
             )
-            response = HttpResponse(
-                dataset.csv,
-                content_type="text/csv",
-                headers={"Content-Disposition": 'attachment; filename="export.csv"'},
-            )
-
-            return response
 
 
 class GraphProcessNotRegisteredException(Exception):
@@ -1,10 +1,12 @@
 from django.apps import AppConfig
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 
 
-def set_experiment_significance_via_direct_create(sender, instance, created, **kwargs):
+def set_experiment_significance_via_direct_create(sender, instance, **kwargs):
     # Imported here because else it would run before the models are ready
-    instance.experiment.calculate_significance()
+    from uncontrast_studies.services.experiment_significance_svc import schedule_experiments_significance_refresh
+
+    schedule_experiments_significance_refresh([instance.experiment_id])
 
 
 class UncontrastStudiesConfig(AppConfig):
@@ -15,3 +17,4 @@ class UncontrastStudiesConfig(AppConfig):
         from uncontrast_studies.models import UnConFinding
 
         post_save.connect(receiver=set_experiment_significance_via_direct_create, sender=UnConFinding)
+        post_delete.connect(receiver=set_experiment_significance_via_direct_create, sender=UnConFinding)
@@ -5,30 +5,13 @@ from django.core.management import BaseCommand
 from django.db import transaction
 
 from contrast_api.data_migration_functionality.create_study import create_study
-from contrast_api.data_migration_functionality.errors import (
-    MissingStimulusCategoryError,
-    SampleTypeError,
-    InvalidConsciousnessMeasureDataError,
-    StimulusDurationError,
-    ParadigmError,
-    TaskTypeError,
-    ProcessingDomainError,
-    StimulusModalityError,
-    StimulusModeOfPresentationError,
-    StimulusMetadataError,
-    SampleSizeError,
-    SuppressionMethodError,
-    FindingError,
-    IncoherentStimuliDataError,
-    NumericListError,
-    MissingValueInStimuliError,
-)
 from contrast_api.data_migration_functionality.helpers import get_list_from_excel
 from contrast_api.data_migration_functionality.studies_parsing_helpers import (
     ProblemInStudyExistingDataException,
     MissingCountryDetectionException,
 )
-from uncontrast_studies.services.process_uncon_experiment import process_uncon_experiment
+from studies.models import Study
+from uncontrast_studies.services.staged_uncon_import import parse_rows, log_parsed_row_error, store_parsed_rows
 from uncontrast_studies.services.uncontrast_logger import write_to_log
 
 logger = logging.getLogger(__name__)
@@ -40,6 +23,11 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument("-f", "--filename", type=str, help="Filename to load")
         parser.add_argument("--dev", action="store_true", help="Start dev data migration process")
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Only parse and validate the rows and write the logs, store nothing"
+        )
+        parser.add_argument("--workers", type=int, default=1, help="Number of processes parsing the rows")
+        parser.add_argument("--batch-size", type=int, default=100, help="Rows per transaction when storing")
 
     def handle(self, *args, **options):
         if options["dev"]:
@@ -74,103 +62,58 @@ class Command(BaseCommand):
             "sample_type_errors_log": [],
             "sample_size_errors_log": [],
             "invalid_numeric_data_log": [],
+            "persistence_error_log": [],
         }
 
         success_logs = {"Metadata": [], "experiments": []}
 
-        # iterate over studies
-        created_studies = []
-        for study_item in studies_historic_data_list:
-            study_doi = study_item["DOI"]
-            if study_doi in created_studies:
-                continue
+        if options["dry_run"]:
+            # studies aren't created, rows only need to refer to a study that exists or is in the metadata sheet
+            known_studies_dois = {study_item["DOI"] for study_item in studies_historic_data_list}
+            known_studies_dois.update(Study.objects.values_list("DOI", flat=True))
+        else:
+            # iterate over studies
+            created_studies = []
+            for study_item in studies_historic_data_list:
+                study_doi = study_item["DOI"]
+                if study_doi in created_studies:
+                    continue
+                else:
+                    try:
+                        with transaction.atomic():
+                            create_study(item=study_item, unconsciousness=True)
+                            created_studies.append(study_doi)
+                            success_logs["Metadata"].append(study_item)
+
+                    except ProblemInStudyExistingDataException:
+                        errors_logs["studies_problematic_data_log"].append(study_item)
+
+                    except MissingCountryDetectionException:
+                        errors_logs["studies_problematic_data_log"].append(study_item)
+
+        # parse and validate experiments, then store the valid ones
+        parsed_rows = parse_rows(experiments_data_list, workers=options["workers"])
+        valid_rows = []
+        for parsed_row in parsed_rows:
+            if parsed_row.log_name:
+                log_parsed_row_error(parsed_row, errors_logs)
             else:
-                try:
-                    with transaction.atomic():
-                        create_study(item=study_item, unconsciousness=True)
-                        created_studies.append(study_doi)
-                        success_logs["Metadata"].append(study_item)
-
-                except ProblemInStudyExistingDataException:
-                    errors_logs["studies_problematic_data_log"].append(study_item)
-
-                except MissingCountryDetectionException:
-                    errors_logs["studies_problematic_data_log"].append(study_item)
-
-        # iterate over experiments
-        for index, item in enumerate(experiments_data_list):
-            index = index + 1
-            try:
-                with transaction.atomic():
-                    process_uncon_experiment(item)
-                    print(f"row #{index} completed")
+                valid_rows.append(parsed_row)
+        print(f"parsed {len(parsed_rows)} rows, {len(valid_rows)} valid")
+
+        if options["dry_run"]:
+            for parsed_row in valid_rows:
+                item = parsed_row.item
+                study_doi = item["DOI"] if item["DOI"] != "missing" else item["StudyID"]
+                if study_doi in known_studies_dois:
                     success_logs["experiments"].append(item)
-
-            except ParadigmError:
-                errors_logs["invalid_paradigm_data_log"].append(item)
-                logger.exception(f"row #{index} has invalid paradigm data")
-
-            except TaskTypeError:
-                errors_logs["invalid_task_data_log"].append(item)
-                logger.exception(f"row #{index} has invalid task data")
-
-            except ProcessingDomainError:
-                errors_logs["invalid_processing_domain_data_log"].append(item)
-                logger.exception(f"row #{index} has invalid processing domain data")
-
-            except SuppressionMethodError:
-                errors_logs["invalid_suppression_method_data_log"].append(item)
-                logger.exception(f"row #{index} has invalid suppression method data")
-
-            except IncoherentStimuliDataError:
-                errors_logs["incoherent_stimuli_data_log"].append(item)
-                logger.exception(f"row #{index} has incoherent stimulus data")
-
-            except StimulusModeOfPresentationError:
-                errors_logs["invalid_stimuli_presentation_mode_data_log"].append(item)
-                logger.exception(f"row #{index} has invalid stimulus MoP data")
-
-            except StimulusMetadataError:
-                errors_logs["invalid_stimuli_metadata_log"].append(item)
-                logger.exception(f"row #{index} has invalid stimulus metadata")
-
-            except StimulusDurationError:
-                errors_logs["stimuli_numeric_data_log"].append(item)
-                logger.exception(f"row #{index} has invalid stimulus numeric data")
-
-            except StimulusModalityError:
-                errors_logs["invalid_stimuli_modality_data_log"].append(item)
-                logger.exception(f"row #{index} has invalid stimulus modality data")
-
-            except (MissingStimulusCategoryError, MissingValueInStimuliError):
-                errors_logs["stimuli_missing_object_data_log"].append(item)
-                logger.exception(f"row #{index} did not find matching stimulus category or sub-category")
-
-            except SampleTypeError:
-                errors_logs["sample_type_errors_log"].append(item)
-                logger.exception(f"row #{index} has invalid sample type data")
-
-            except SampleSizeError:
-                errors_logs["sample_size_errors_log"].append(item)
-                logger.exception(f"row #{index} has invalid sample size data")
-
-            except FindingError:
-                errors_logs["invalid_finding_data_log"].append(item)
-                logger.exception(f"row #{index} has invalid finding data")
-
-            except ProblemInStudyExistingDataException:
-                errors_logs["invalid_study_metadata_log"].append(item)
-                logger.exception(f"row #{index} has invalid study metadata")
-
-            except InvalidConsciousnessMeasureDataError:
-                errors_logs["invalid_consciousness_measure_data_log"].append(item)
-                logger.exception(f"row #{index} is problematic regarding to consciousness measure data")
-
-            except NumericListError:
-                errors_logs["invalid_numeric_data_log"].append(item)
+                else:
+                    errors_logs["invalid_study_metadata_log"].append(item)
+        else:
+            store_parsed_rows(valid_rows, errors_logs, success_logs, batch_size=options["batch_size"])
 
         sum_of_logs = sum(len(log) for log in errors_logs.values())
-        if sum_of_logs > 0:
+        if sum_of_logs > 0 or options["dry_run"]:
             print(f"completed loading {len(experiments_data_list)} rows of data, with {sum_of_logs} errors")
 
             # iterate over invalid-data logs and add them to .xlsx file in respective sheets
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from configuration.models import DatasetVersion
+from uncontrast_studies.models import UnConExperiment
+
+
+class Command(BaseCommand):
+    help = "Recompute the significance of all experiments from their important findings, in a single statement"
+
+    def handle(self, *args, **options):
+        updated = UnConExperiment.refresh_experiments_significance()
+        DatasetVersion.bump()
+        self.stdout.write(self.style.SUCCESS(f"Refreshed the significance of {updated} experiments"))
@@ -1,5 +1,9 @@
+from typing import Iterable, Optional
+
+from django.contrib.postgres.aggregates import BoolAnd, BoolOr
 from django.db import models
-from django.db.models import CASCADE, PROTECT
+from django.db.models import CASCADE, PROTECT, OuterRef, Subquery, Case, When, Value
+from django.db.models.functions import Coalesce
 from simple_history.models import HistoricalRecords
 
 from contrast_api.choices import ExperimentTypeChoices, SignificanceChoices
@@ -37,14 +41,38 @@ class UnConExperiment(models.Model):
         # TODO: check what the cleaning needed
 
     def calculate_significance(self):
-        findings_significance = self.findings.filter(is_important=True).values_list("is_significant", flat=True)
-        if all(x is True for x in findings_significance):
-            self.significance = SignificanceChoices.POSITIVE
-        elif all(x is False for x in findings_significance):
-            self.significance = SignificanceChoices.NEGATIVE
-        else:
-            self.significance = SignificanceChoices.MIXED
-        self.save()
+        UnConExperiment.refresh_experiments_significance([self.id])
+        self.refresh_from_db(fields=["significance"])
+
+    @staticmethod
+    def refresh_experiments_significance(experiment_ids: Optional[Iterable[int]] = None) -> int:
+        """
+        Sets the significance from the important findings in a single UPDATE, for all experiments if no ids are given
+        Positive if all of them are significant (or there are none), negative if none is, mixed otherwise
+        """
+        from uncontrast_studies.models import UnConFinding
+
+        findings_significance = (
+            UnConFinding.objects.filter(experiment=OuterRef("id"), is_important=True)
+            .order_by()
+            .values("experiment")
+            .annotate(all_significant=BoolAnd("is_significant"), any_significant=BoolOr("is_significant"))
+            .annotate(
+                significance=Case(
+                    When(all_significant=True, then=Value(SignificanceChoices.POSITIVE)),
+                    When(any_significant=False, then=Value(SignificanceChoices.NEGATIVE)),
+                    default=Value(SignificanceChoices.MIXED),
+                    output_field=models.CharField(),
+                )
+            )
+            .values("significance")
+        )
+        experiments = UnConExperiment.objects.all()
+        if experiment_ids is not None:
+            experiments = experiments.filter(id__in=list(experiment_ids))
+        return experiments.update(
+            significance=Coalesce(Subquery(findings_significance), Value(SignificanceChoices.POSITIVE))
+        )
 
     def __str__(self):
         return f"study {self.study_id}, id {self.id}"
@@ -8,7 +8,7 @@ from contrast_api.data_migration_functionality.errors import (
     NumericListError,
 )
 
-UnconResolvedParadigmData = namedtuple("UnconParadigmFromData", ["main", "specific"])
+UnconResolvedParadigmData = namedtuple("UnconResolvedParadigmData", ["main", "specific"])
 
 
 def resolve_uncon_paradigm(item, index: str):
@@ -1,5 +1,3 @@
-import itertools
-
 from django.contrib.postgres.expressions import ArraySubquery
 from django.db.models import QuerySet, OuterRef, F, Count, Func, IntegerField
 from django.db.models.functions import JSONObject, Cast, Floor
@@ -91,10 +89,7 @@ class DistributionOfEffectsAcrossParametersGraphDataProcessor(BaseProcessor):
         )
 
         if self.is_csv:
-            ids = queryset.annotate(
-                experiments=ArraySubquery(filtered_subquery.values_list(experiment_referencing_param))
-            ).values_list("experiments", flat=True)
-            return set(list(itertools.chain.from_iterable(ids)))
+            return self.get_csv_experiments_ids(queryset, filtered_subquery, experiment_referencing_param)
         subquery = (  # this is the actual histogram for a specific significance
             filtered_subquery.annotate(value=F("value"))
             .annotate(total=Count("value"))
@@ -274,34 +274,30 @@ class ComparisonParametersDistributionPieGraphDataProcessor(BaseProcessor):
 
     def aggregate_query_by_breakdown(self):
         significance_options = SignificanceChoices.values
+        if self.is_csv:
+            return self.experiments.filter(significance__in=significance_options).values_list("id", flat=True)
 
         results = []
-        experiment_ids = []
         for sig_option in significance_options:
             experiments_for_option = (
                 self.experiments.filter(significance=sig_option).distinct()  # .values_list("id", flat=True)
             )
             option_experiment_ids = experiments_for_option.values_list("id", flat=True)
-            if self.is_csv:
-                experiment_ids += option_experiment_ids
-            else:
-                subquery = self.get_query(experiments_for_option)
-
-                subquery_by_breakdown = (
-                    subquery.order_by("-experiment_count")
-                    .filter(experiment_count__gt=self.min_number_of_experiments)
-                    .exclude(key__isnull=True)
-                    .annotate(data=JSONObject(key=F("key"), value=F("experiment_count")))
-                    .values_list("data", flat=True)
-                )
+            subquery = self.get_query(experiments_for_option)
+
+            subquery_by_breakdown = (
+                subquery.order_by("-experiment_count")
+                .filter(experiment_count__gt=self.min_number_of_experiments)
+                .exclude(key__isnull=True)
+                .annotate(data=JSONObject(key=F("key"), value=F("experiment_count")))
+                .values_list("data", flat=True)
+            )
 
-                if len(subquery_by_breakdown) > 0:
-                    series = list(subquery_by_breakdown)
-                    # total_value = self.accumulate_total_from_series(series)
-                    total_value = len(set(option_experiment_ids))
-                    result = dict(series=series, series_name=sig_option, value=total_value)
-                    results.append(result)
-        if self.is_csv:
-            return set(experiment_ids)
+            if len(subquery_by_breakdown) > 0:
+                series = list(subquery_by_breakdown)
+                # total_value = self.accumulate_total_from_series(series)
+                total_value = len(set(option_experiment_ids))
+                result = dict(series=series, series_name=sig_option, value=total_value)
+                results.append(result)
 
         return results
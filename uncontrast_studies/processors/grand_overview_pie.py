@@ -1,5 +1,3 @@
-import itertools
-
 from django.db.models import QuerySet, F, Count, Value, When, Case, Q, Exists, OuterRef
 from django.db.models.fields import CharField
 
@@ -44,8 +42,7 @@ class GrandOverviewPieGraphDataProcessor(BaseProcessor):
 
     def _aggregate_query_by_breakdown(self, experiments: QuerySet[UnConExperiment]):
         if self.is_csv:
-            ids = experiments.values_list("id", flat=True)
-            return set(list(itertools.chain.from_iterable(ids)))
+            return experiments.values_list("id", flat=True)
 
         """
         Discussion: Unlike most, we don't have "two" levels of grouping here 
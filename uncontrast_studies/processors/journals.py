@@ -28,8 +28,7 @@ class JournalsGraphDataProcessor(BaseProcessor):
 
     def aggregate(self, queryset):
         if self.is_csv:
-            ids = queryset.values_list("id", flat=True)
-            return set(ids)
+            return queryset.values_list("id", flat=True)
         # having "values" before annotate with count results in a "select *, count(1) from .. GROUP BY
 
         return (
@@ -41,8 +41,7 @@ class NationOfConsciousnessDataProcessor(BaseProcessor):
     def aggregate(self, queryset):
         # having "values" before annotate with count results in a "select *, count(1) from .. GROUP BY
         if self.is_csv:
-            ids = queryset.values_list("id", flat=True)
-            return set(ids)
+            return queryset.values_list("id", flat=True)
 
         countries_total = (
             queryset.values("country")
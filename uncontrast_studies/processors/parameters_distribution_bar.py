@@ -1,5 +1,3 @@
-import itertools
-
 from django.contrib.postgres.expressions import ArraySubquery
 from django.db.models import QuerySet, OuterRef, F, Func, Count, Case, When, Q, Value, CharField, Exists
 from django.db.models.functions import JSONObject
@@ -280,10 +278,7 @@ class ParametersDistributionBarGraphDataProcessor(BaseProcessor):
         ids_subquery = by_significance.order_by("id").values_list("id")
 
         if self.is_csv:
-            ids = queryset.annotate(experiments=ArraySubquery(filtered_subquery.values_list("id"))).values_list(
-                "experiments", flat=True
-            )
-            return set(list(itertools.chain.from_iterable(ids)))
+            return self.get_csv_experiments_ids(queryset, filtered_subquery)
 
         qs = (
             queryset.values("series_name")
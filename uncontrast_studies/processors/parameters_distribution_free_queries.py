@@ -1,5 +1,3 @@
-import itertools
-
 from django.contrib.postgres.expressions import ArraySubquery
 from django.db.models import Func, F, Count, QuerySet, OuterRef, Case, When, Value, Q, CharField, Exists
 
@@ -382,10 +380,7 @@ class ParametersDistributionFreeQueriesDataProcessor(BaseProcessor):
         # Hopefully this is generic enough to be reused
 
         if self.is_csv:
-            ids = queryset.annotate(experiments=ArraySubquery(filtered_subquery.values_list("id"))).values_list(
-                "experiments", flat=True
-            )
-            return set(list(itertools.chain.from_iterable(ids)))
+            return self.get_csv_experiments_ids(queryset, filtered_subquery)
 
         annotated_subquery = filtered_subquery.annotate(experiment_count=Count("id", distinct=True))
 
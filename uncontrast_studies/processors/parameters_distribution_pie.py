@@ -1,5 +1,3 @@
-import itertools
-
 from django.contrib.postgres.expressions import ArraySubquery
 from django.db.models import QuerySet, OuterRef, F, Func, Count, Q, CharField, Value, When, Case, Exists
 from django.db.models.functions import JSONObject
@@ -261,10 +259,7 @@ class ParametersDistributionPieGraphDataProcessor(BaseProcessor):
         option_subquery = filtered_subquery.values("significance").annotate(experiment_count=Count("id", distinct=True))
 
         if self.is_csv:
-            ids = queryset.annotate(experiments=ArraySubquery(filtered_subquery.values_list("id"))).values_list(
-                "experiments", flat=True
-            )
-            return set(list(itertools.chain.from_iterable(ids)))
+            return self.get_csv_experiments_ids(queryset, filtered_subquery)
 
         subquery = (
             option_subquery.order_by("-experiment_count")
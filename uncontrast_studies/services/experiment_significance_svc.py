@@ -0,0 +1,26 @@
+import threading
+from typing import Iterable
+
+from django.db import transaction
+
+_pending = threading.local()
+
+
+def schedule_experiments_significance_refresh(experiment_ids: Iterable[int]):
+    """
+    Refresh the experiments significance once the current transaction commits
+    Importing an experiment saves each of its findings, the ids are collected so each experiment is refreshed once
+    """
+    pending = _pending.__dict__.setdefault("experiment_ids", set())
+    pending.update(experiment_ids)
+    transaction.on_commit(_refresh_pending_experiments_significance)
+
+
+def _refresh_pending_experiments_significance():
+    from configuration.models import DatasetVersion
+    from uncontrast_studies.models import UnConExperiment
+
+    experiment_ids = _pending.__dict__.pop("experiment_ids", set())
+    if experiment_ids and UnConExperiment.refresh_experiments_significance(experiment_ids):
+        # the update skips the signals, and the findings' own bump was committed before it
+        DatasetVersion.bump()
@@ -47,9 +47,26 @@ from uncontrast_studies.parsers.sample_parser import resolve_uncon_sample
 from uncontrast_studies.parsers.finding_parser import resolve_uncon_findings
 
 ExperimentDuplicate = namedtuple("ExperimentDuplicateTuple", ["key", "id"])
+UnConParsedExperiment = namedtuple(
+    "UnConParsedExperiment",
+    [
+        "paradigm",
+        "task_types",
+        "sample",
+        "stimuli",
+        "is_target_stimuli",
+        "is_target_same_as_prime",
+        "suppression_methods",
+        "processing_domains",
+        "findings",
+        "consciousness_measures",
+    ],
+)
 
 
-def create_uncon_experiment(item: dict, index):
+def create_uncon_experiment(
+    item: dict, paradigm_data, findings_notes: str = None, consciousness_measures_notes: str = None
+):
     try:
         if item["DOI"] != "missing":
             study = Study.objects.get(DOI=item["DOI"])
@@ -58,7 +75,6 @@ def create_uncon_experiment(item: dict, index):
     except ObjectDoesNotExist:
         raise ProblemInStudyExistingDataException()
 
-    paradigm_data = resolve_uncon_paradigm(item, index)
     main_paradigm = UnConMainParadigm.objects.get(name=paradigm_data.main)
     paradigm = UnConSpecificParadigm.objects.get(main=main_paradigm, name=paradigm_data.specific)
 
@@ -66,6 +82,8 @@ def create_uncon_experiment(item: dict, index):
         study=study,
         type=ExperimentTypeChoices.BEHAVIORAL,
         paradigm=paradigm,
+        experiment_findings_notes=findings_notes,
+        consciousness_measures_notes=consciousness_measures_notes,
     )
 
     return experiment
@@ -117,18 +135,66 @@ def create_target_stimulus(experiment, suppressed_stimulus, stimulus_data, is_ta
     )
 
 
-def process_uncon_experiment(item: dict):
+def parse_uncon_experiment(item: dict) -> UnConParsedExperiment:
+    """
+    Resolves and validates a row without touching the database, so rows can be parsed in worker processes
+    """
     experiment_index = item["exp"]
-    experiment = create_uncon_experiment(item=item, index=experiment_index)
+    paradigm = resolve_uncon_paradigm(item=item, index=experiment_index)
+    task_types = resolve_uncon_task_type(item=item, index=experiment_index)
+    sample = resolve_uncon_sample(item=item, index=experiment_index)
+
+    # stimuli, paired with their target stimulus (if any)
+    resolved_prime_stimuli = resolve_uncon_prime_stimuli(item=item, index=experiment_index)
+    is_target_stimuli, is_target_same_as_prime = resolve_uncon_stimuli_metadata(item=item, index=experiment_index)
+    if is_target_stimuli:
+        resolved_target_stimuli = resolve_uncon_target_stimuli(item=item, index=experiment_index)
+        if is_target_same_as_prime and is_target_duplicate(item=item):
+            stimuli = [(prime_data, prime_data) for prime_data in resolved_prime_stimuli]
+        elif len(resolved_prime_stimuli) == len(resolved_target_stimuli) and not is_target_same_as_prime:
+            stimuli = list(zip(resolved_prime_stimuli, resolved_target_stimuli))
+        else:
+            raise IncoherentStimuliDataError(
+                f"target supposed to be same as prime stimulus, but it's different; index {experiment_index}"
+            )
+    else:
+        stimuli = [(prime_data, None) for prime_data in resolved_prime_stimuli]
+
+    return UnConParsedExperiment(
+        paradigm=paradigm,
+        task_types=task_types,
+        sample=sample,
+        stimuli=stimuli,
+        is_target_stimuli=is_target_stimuli,
+        is_target_same_as_prime=is_target_same_as_prime,
+        suppression_methods=resolve_uncon_suppression_method(item=item, index=experiment_index),
+        processing_domains=resolve_uncon_processing_domains(item=item, index=experiment_index),
+        findings=resolve_uncon_findings(item=item, index=experiment_index),
+        consciousness_measures=resolve_consciousness_measures(item=item, index=experiment_index),
+    )
+
+
+def store_uncon_experiment(item: dict, parsed_experiment: UnConParsedExperiment):
+    findings_notes = "".join(f"{finding.notes}; " for finding in parsed_experiment.findings if finding.notes)
+    consciousness_measures_notes = "".join(
+        f"{consciousness_measure.notes}; "
+        for consciousness_measure in parsed_experiment.consciousness_measures
+        if consciousness_measure.notes
+    )
+    experiment = create_uncon_experiment(
+        item=item,
+        paradigm_data=parsed_experiment.paradigm,
+        findings_notes=findings_notes or None,
+        consciousness_measures_notes=consciousness_measures_notes or None,
+    )
 
     # tasks
-    task_types = resolve_uncon_task_type(item=item, index=experiment_index)
-    for task_type in task_types:
+    for task_type in parsed_experiment.task_types:
         task = UnConTaskType.objects.get(name=task_type)
         UnConTask.objects.create(experiment=experiment, type=task)
 
     # samples
-    sample = resolve_uncon_sample(item=item, index=experiment_index)
+    sample = parsed_experiment.sample
     UnConSample.objects.create(
         experiment=experiment,
         type=sample.sample_type,
@@ -138,31 +204,15 @@ def process_uncon_experiment(item: dict):
     )
 
     # stimuli
-    resolved_prime_stimuli = resolve_uncon_prime_stimuli(item=item, index=experiment_index)
-    is_target_stimuli, is_target_same_as_prime = resolve_uncon_stimuli_metadata(item=item, index=experiment_index)
-    if is_target_stimuli:
-        resolved_target_stimuli = resolve_uncon_target_stimuli(item=item, index=experiment_index)
-        if is_target_same_as_prime and is_target_duplicate(item=item):
-            for prime_data in resolved_prime_stimuli:
-                suppressed_stimulus = create_prime_stimulus(experiment, prime_data, is_target_stimuli)
-                create_target_stimulus(experiment, suppressed_stimulus, prime_data, is_target_same_as_prime)
-        elif len(resolved_prime_stimuli) == len(resolved_target_stimuli) and not is_target_same_as_prime:
-            for idx in range(len(resolved_prime_stimuli)):
-                suppressed_stimulus = create_prime_stimulus(experiment, resolved_prime_stimuli[idx], is_target_stimuli)
-                create_target_stimulus(
-                    experiment, suppressed_stimulus, resolved_target_stimuli[idx], is_target_same_as_prime
-                )
-        else:
-            raise IncoherentStimuliDataError(
-                f"target supposed to be same as prime stimulus, but it's different; index {experiment_index}"
+    for prime_data, target_data in parsed_experiment.stimuli:
+        suppressed_stimulus = create_prime_stimulus(experiment, prime_data, parsed_experiment.is_target_stimuli)
+        if target_data is not None:
+            create_target_stimulus(
+                experiment, suppressed_stimulus, target_data, parsed_experiment.is_target_same_as_prime
             )
-    else:
-        for prime_data in resolved_prime_stimuli:
-            create_prime_stimulus(experiment, prime_data, is_target_stimuli)
 
     # suppression_methods
-    suppression_method_data = resolve_uncon_suppression_method(item=item, index=experiment_index)
-    for line in suppression_method_data:
+    for line in parsed_experiment.suppression_methods:
         main = UnConSuppressionMethodType.objects.get(name=line.main)
         if line.specific is None:
             UnConSuppressionMethod.objects.create(experiment=experiment, type=main, sub_type=None)
@@ -171,14 +221,12 @@ def process_uncon_experiment(item: dict):
             UnConSuppressionMethod.objects.create(experiment=experiment, type=main, sub_type=specific)
 
     # processing domains
-    processing_domain_data = resolve_uncon_processing_domains(item=item, index=experiment_index)
-    for processing_domain in processing_domain_data:
+    for processing_domain in parsed_experiment.processing_domains:
         main_domain = UnConProcessingMainDomain.objects.get(name=processing_domain)
         UnConProcessingDomain.objects.create(experiment=experiment, main=main_domain)
 
     # findings
-    finding_data = resolve_uncon_findings(item=item, index=experiment_index)
-    for finding in finding_data:
+    for finding in parsed_experiment.findings:
         outcome = UnConOutcome.objects.get(name=finding.outcome)
         UnConFinding.objects.create(
             experiment=experiment,
@@ -187,12 +235,9 @@ def process_uncon_experiment(item: dict):
             is_important=finding.is_important,
             number_of_trials=finding.number_of_trials,
         )
-        if finding.notes:
-            experiment.experiment_findings_notes.add(f"{finding.notes}; ")
 
     # consciousness measures
-    consciousness_measures_data = resolve_consciousness_measures(item=item, index=experiment_index)
-    for consciousness_measure in consciousness_measures_data:
+    for consciousness_measure in parsed_experiment.consciousness_measures:
         phase = UnConsciousnessMeasurePhase.objects.get(name=consciousness_measure.phase)
         main_type = UnConsciousnessMeasureType.objects.get(name=consciousness_measure.type)
         if consciousness_measure.sub_type:
@@ -210,7 +255,9 @@ def process_uncon_experiment(item: dict):
             is_performance_above_chance=consciousness_measure.is_performance_above_chance,
             is_trial_excluded_based_on_measure=consciousness_measure.is_trial_excluded_based_on_measure,
         )
-        if consciousness_measure.notes:
-            experiment.consciousness_measures_notes.add(f"{consciousness_measure.notes}; ")
 
     return experiment
+
+
+def process_uncon_experiment(item: dict):
+    return store_uncon_experiment(item, parse_uncon_experiment(item))
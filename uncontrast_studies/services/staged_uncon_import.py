@@ -0,0 +1,392 @@
+import logging
+from collections import namedtuple, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from django.db import transaction, connections, models, DatabaseError
+from simple_history.utils import bulk_create_with_history
+
+from configuration.models import DatasetVersion
+from contrast_api.choices import ExperimentTypeChoices
+
+from contrast_api.data_migration_functionality.errors import (
+    MissingStimulusCategoryError,
+    SampleTypeError,
+    InvalidConsciousnessMeasureDataError,
+    StimulusDurationError,
+    ParadigmError,
+    TaskTypeError,
+    ProcessingDomainError,
+    StimulusModalityError,
+    StimulusModeOfPresentationError,
+    StimulusMetadataError,
+    SampleSizeError,
+    SuppressionMethodError,
+    FindingError,
+    IncoherentStimuliDataError,
+    NumericListError,
+    MissingValueInStimuliError,
+)
+from contrast_api.data_migration_functionality.studies_parsing_helpers import ProblemInStudyExistingDataException
+from studies.models import Study
+from uncontrast_studies.models import (
+    UnConExperiment,
+    UnConSpecificParadigm,
+    UnConMainParadigm,
+    UnConTask,
+    UnConTaskType,
+    UnConSample,
+    UnConSuppressedStimulus,
+    UnConTargetStimulus,
+    UnConStimulusCategory,
+    UnConStimulusSubCategory,
+    UnConModalityType,
+    UnConSuppressionMethod,
+    UnConSuppressionMethodType,
+    UnConSuppressionMethodSubType,
+    UnConProcessingDomain,
+    UnConProcessingMainDomain,
+    UnConFinding,
+    UnConOutcome,
+    UnConsciousnessMeasure,
+    UnConsciousnessMeasurePhase,
+    UnConsciousnessMeasureType,
+    UnConsciousnessMeasureSubType,
+)
+from uncontrast_studies.services.process_uncon_experiment import parse_uncon_experiment
+
+logger = logging.getLogger(__name__)
+
+# row errors, the errors log they are reported to, and the log message (None for errors that aren't logged)
+ROW_ERRORS = [
+    (ParadigmError, "invalid_paradigm_data_log", "has invalid paradigm data"),
+    (TaskTypeError, "invalid_task_data_log", "has invalid task data"),
+    (ProcessingDomainError, "invalid_processing_domain_data_log", "has invalid processing domain data"),
+    (SuppressionMethodError, "invalid_suppression_method_data_log", "has invalid suppression method data"),
+    (IncoherentStimuliDataError, "incoherent_stimuli_data_log", "has incoherent stimulus data"),
+    (StimulusModeOfPresentationError, "invalid_stimuli_presentation_mode_data_log", "has invalid stimulus MoP data"),
+    (StimulusMetadataError, "invalid_stimuli_metadata_log", "has invalid stimulus metadata"),
+    (StimulusDurationError, "stimuli_numeric_data_log", "has invalid stimulus numeric data"),
+    (StimulusModalityError, "invalid_stimuli_modality_data_log", "has invalid stimulus modality data"),
+    (
+        (MissingStimulusCategoryError, MissingValueInStimuliError),
+        "stimuli_missing_object_data_log",
+        "did not find matching stimulus category or sub-category",
+    ),
+    (SampleTypeError, "sample_type_errors_log", "has invalid sample type data"),
+    (SampleSizeError, "sample_size_errors_log", "has invalid sample size data"),
+    (FindingError, "invalid_finding_data_log", "has invalid finding data"),
+    (ProblemInStudyExistingDataException, "invalid_study_metadata_log", "has invalid study metadata"),
+    (
+        InvalidConsciousnessMeasureDataError,
+        "invalid_consciousness_measure_data_log",
+        "is problematic regarding to consciousness measure data",
+    ),
+    (NumericListError, "invalid_numeric_data_log", None),
+]
+
+ROW_ERRORS_CLASSES = tuple(
+    error_class
+    for error_classes, log_name, message in ROW_ERRORS
+    for error_class in (error_classes if isinstance(error_classes, tuple) else (error_classes,))
+)
+
+# results cross process boundaries, so errors are reported by their log name and text rather than as exceptions
+ParsedRow = namedtuple("ParsedRow", ["index", "item", "parsed_experiment", "log_name", "error"])
+
+
+def get_failed_row(index: int, item: dict, error: Exception) -> ParsedRow:
+    for error_classes, log_name, message in ROW_ERRORS:
+        if isinstance(error, error_classes):
+            return ParsedRow(index, item, None, log_name, f"{message}: {error}" if message else None)
+
+
+def parse_row(index: int, item: dict) -> ParsedRow:
+    try:
+        return ParsedRow(index, item, parse_uncon_experiment(item), None, None)
+    except ROW_ERRORS_CLASSES as error:
+        return get_failed_row(index, item, error)
+
+
+def parse_rows_chunk(indexed_items: list[tuple[int, dict]]) -> list[ParsedRow]:
+    return [parse_row(index, item) for index, item in indexed_items]
+
+
+def parse_rows(items: list[dict], workers: int = 1, chunk_size: int = 50) -> list[ParsedRow]:
+    """
+    Parses and validates the rows (1-based indexed), over a process pool when more than one worker is asked for
+    """
+    indexed_items = list(enumerate(items, start=1))
+    if workers <= 1:
+        return parse_rows_chunk(indexed_items)
+
+    chunks = [indexed_items[start : start + chunk_size] for start in range(0, len(indexed_items), chunk_size)]
+    parsed_rows = []
+    # forked workers must not share the parent's database connections
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map keeps the chunks order, so rows are reported in the spreadsheet order
+        for parsed_chunk in executor.map(parse_rows_chunk, chunks):
+            parsed_rows.extend(parsed_chunk)
+    return parsed_rows
+
+
+def log_parsed_row_error(parsed_row: ParsedRow, errors_logs: dict):
+    errors_logs[parsed_row.log_name].append(parsed_row.item)
+    if parsed_row.error:
+        logger.error(f"row #{parsed_row.index} {parsed_row.error}")
+
+
+class UnConLookupTables:
+    """
+    All the lookup tables a parsed row is resolved against, loaded once for the whole store stage
+    A missing key plays the part of ObjectDoesNotExist in the row by row store
+    """
+
+    def __init__(self):
+        self.studies = {study.DOI: study for study in Study.objects.all()}
+        self.main_paradigms = {item.name: item for item in UnConMainParadigm.objects.all()}
+        self.specific_paradigms = {(item.name, item.main_id): item for item in UnConSpecificParadigm.objects.all()}
+        self.task_types = {item.name: item for item in UnConTaskType.objects.all()}
+        self.stimulus_categories = {item.name: item for item in UnConStimulusCategory.objects.all()}
+        self.stimulus_sub_categories = {
+            (item.name, item.parent_id): item for item in UnConStimulusSubCategory.objects.all()
+        }
+        self.modality_types = {item.name: item for item in UnConModalityType.objects.all()}
+        self.suppression_method_types = {item.name: item for item in UnConSuppressionMethodType.objects.all()}
+        self.suppression_method_sub_types = {
+            (item.name, item.parent_id): item for item in UnConSuppressionMethodSubType.objects.all()
+        }
+        self.processing_main_domains = {item.name: item for item in UnConProcessingMainDomain.objects.all()}
+        self.outcomes = {item.name: item for item in UnConOutcome.objects.all()}
+        self.consciousness_measure_phases = {item.name: item for item in UnConsciousnessMeasurePhase.objects.all()}
+        self.consciousness_measure_types = {item.name: item for item in UnConsciousnessMeasureType.objects.all()}
+        self.consciousness_measure_sub_types = {
+            (item.name, item.type_id): item for item in UnConsciousnessMeasureSubType.objects.all()
+        }
+
+
+def get_lookup(table: dict, key, model):
+    try:
+        return table[key]
+    except KeyError:
+        raise model.DoesNotExist(f"{model.__name__} {key} does not exist")
+
+
+@dataclass
+class UnConExperimentDTO:
+    parsed_row: ParsedRow
+    experiment: UnConExperiment
+    # tasks, sample, suppression methods, processing domains, findings and consciousness measures
+    related: List[models.Model] = field(default_factory=list)
+    stimuli: List[Tuple[UnConSuppressedStimulus, Optional[UnConTargetStimulus]]] = field(default_factory=list)
+
+
+def build_uncon_experiment(parsed_row: ParsedRow, lookups: UnConLookupTables) -> UnConExperimentDTO:
+    """
+    The unsaved instances store_uncon_experiment creates for the row, resolved against the lookup tables
+    """
+    item, parsed_experiment = parsed_row.item, parsed_row.parsed_experiment
+    try:
+        study = lookups.studies[item["DOI"] if item["DOI"] != "missing" else item["StudyID"]]
+    except KeyError:
+        raise ProblemInStudyExistingDataException()
+    main_paradigm = get_lookup(lookups.main_paradigms, parsed_experiment.paradigm.main, UnConMainParadigm)
+    findings_notes = "".join(f"{finding.notes}; " for finding in parsed_experiment.findings if finding.notes)
+    consciousness_measures_notes = "".join(
+        f"{consciousness_measure.notes}; "
+        for consciousness_measure in parsed_experiment.consciousness_measures
+        if consciousness_measure.notes
+    )
+    dto = UnConExperimentDTO(
+        parsed_row=parsed_row,
+        experiment=UnConExperiment(
+            study=study,
+            type=ExperimentTypeChoices.BEHAVIORAL,
+            paradigm=get_lookup(
+                lookups.specific_paradigms,
+                (parsed_experiment.paradigm.specific, main_paradigm.id),
+                UnConSpecificParadigm,
+            ),
+            experiment_findings_notes=findings_notes or None,
+            consciousness_measures_notes=consciousness_measures_notes or None,
+        ),
+    )
+
+    for task_type in parsed_experiment.task_types:
+        dto.related.append(UnConTask(type=get_lookup(lookups.task_types, task_type, UnConTaskType)))
+
+    sample = parsed_experiment.sample
+    dto.related.append(
+        UnConSample(
+            type=sample.sample_type,
+            size_included=sample.included_size,
+            size_total=sample.total_size,
+            size_excluded=sample.excluded_size or 0,
+        )
+    )
+
+    for prime_data, target_data in parsed_experiment.stimuli:
+        category = get_lookup(lookups.stimulus_categories, prime_data.category, UnConStimulusCategory)
+        try:
+            modality = lookups.modality_types[prime_data.modality]
+        except KeyError:
+            raise StimulusModalityError()
+        suppressed_stimulus = UnConSuppressedStimulus(
+            category=category,
+            sub_category=get_lookup(
+                lookups.stimulus_sub_categories, (prime_data.sub_category, category.id), UnConStimulusSubCategory
+            )
+            if prime_data.sub_category
+            else None,
+            modality=modality,
+            mode_of_presentation=prime_data.mode_of_presentation,
+            duration=prime_data.duration,
+            soa=prime_data.soa,
+            number_of_stimuli=prime_data.number_of_stimuli,
+            is_target_stimulus=parsed_experiment.is_target_stimuli,
+        )
+        target_stimulus = None
+        if target_data is not None:
+            category = get_lookup(lookups.stimulus_categories, target_data.category, UnConStimulusCategory)
+            target_stimulus = UnConTargetStimulus(
+                is_target_same_as_suppressed_stimulus=parsed_experiment.is_target_same_as_prime,
+                category=category,
+                sub_category=get_lookup(
+                    lookups.stimulus_sub_categories, (target_data.sub_category, category.id), UnConStimulusSubCategory
+                )
+                if target_data.sub_category
+                else None,
+                modality=get_lookup(lookups.modality_types, target_data.modality, UnConModalityType),
+                number_of_stimuli=target_data.number_of_stimuli,
+            )
+        dto.stimuli.append((suppressed_stimulus, target_stimulus))
+
+    for line in parsed_experiment.suppression_methods:
+        main = get_lookup(lookups.suppression_method_types, line.main, UnConSuppressionMethodType)
+        sub_type = None
+        if line.specific is not None:
+            sub_type = get_lookup(
+                lookups.suppression_method_sub_types, (line.specific, main.id), UnConSuppressionMethodSubType
+            )
+        dto.related.append(UnConSuppressionMethod(type=main, sub_type=sub_type))
+
+    for processing_domain in parsed_experiment.processing_domains:
+        main_domain = get_lookup(lookups.processing_main_domains, processing_domain, UnConProcessingMainDomain)
+        dto.related.append(UnConProcessingDomain(main=main_domain))
+
+    for finding in parsed_experiment.findings:
+        dto.related.append(
+            UnConFinding(
+                outcome=get_lookup(lookups.outcomes, finding.outcome, UnConOutcome),
+                is_significant=finding.is_significant,
+                is_important=finding.is_important,
+                number_of_trials=finding.number_of_trials,
+            )
+        )
+
+    for consciousness_measure in parsed_experiment.consciousness_measures:
+        main_type = get_lookup(
+            lookups.consciousness_measure_types, consciousness_measure.type, UnConsciousnessMeasureType
+        )
+        sub_type = None
+        if consciousness_measure.sub_type:
+            sub_type = get_lookup(
+                lookups.consciousness_measure_sub_types,
+                (consciousness_measure.sub_type, main_type.id),
+                UnConsciousnessMeasureSubType,
+            )
+        dto.related.append(
+            UnConsciousnessMeasure(
+                phase=get_lookup(
+                    lookups.consciousness_measure_phases, consciousness_measure.phase, UnConsciousnessMeasurePhase
+                ),
+                type=main_type,
+                sub_type=sub_type,
+                number_of_trials=consciousness_measure.number_of_trials,
+                number_of_participants_in_awareness_test=consciousness_measure.number_of_awareness_participants,
+                is_cm_same_participants_as_task=consciousness_measure.is_cm_pax_same_as_task,
+                is_performance_above_chance=consciousness_measure.is_performance_above_chance,
+                is_trial_excluded_based_on_measure=consciousness_measure.is_trial_excluded_based_on_measure,
+            )
+        )
+
+    return dto
+
+
+@transaction.atomic
+def persist_uncon_rows(dtos: List[UnConExperimentDTO]) -> List[int]:
+    """
+    Writes a batch of built rows with a bulk insert per model, history rows included
+    Signals don't fire for bulk inserts, see store_parsed_rows
+    """
+    for dto in dtos:
+        # a batch that failed is retried row by row, without the ids of its rolled back inserts
+        dto.experiment.pk = None
+    experiments = bulk_create_with_history([dto.experiment for dto in dtos], UnConExperiment)
+
+    related = defaultdict(list)
+    suppressed_stimuli = []
+    for dto, experiment in zip(dtos, experiments):
+        dto.experiment = experiment
+        for instance in dto.related:
+            instance.pk = None
+            instance.experiment = experiment
+            related[type(instance)].append(instance)
+        for suppressed_stimulus, target_stimulus in dto.stimuli:
+            suppressed_stimulus.pk = None
+            suppressed_stimulus.experiment = experiment
+            suppressed_stimuli.append(suppressed_stimulus)
+    for model, instances in related.items():
+        bulk_create_with_history(instances, model)
+    bulk_create_with_history(suppressed_stimuli, UnConSuppressedStimulus)
+
+    target_stimuli = []
+    for dto in dtos:
+        for suppressed_stimulus, target_stimulus in dto.stimuli:
+            if target_stimulus is not None:
+                target_stimulus.pk = None
+                target_stimulus.experiment = dto.experiment
+                target_stimulus.suppressed_stimulus = suppressed_stimulus
+                target_stimuli.append(target_stimulus)
+    bulk_create_with_history(target_stimuli, UnConTargetStimulus)
+
+    return [dto.experiment.id for dto in dtos]
+
+
+def store_parsed_rows(parsed_rows: list[ParsedRow], errors_logs: dict, success_logs: dict, batch_size: int = 100):
+    """
+    Stores the validated rows with a bulk insert per model and batch, after resolving them against the lookup tables
+    A row failing on its lookups (e.g. an unknown study) is logged before the insert, and a batch failing in the
+    database is retried row by row, so only its failing rows are left out
+    """
+    lookups = UnConLookupTables()
+    experiment_ids = []
+    for start in range(0, len(parsed_rows), batch_size):
+        dtos = []
+        for parsed_row in parsed_rows[start : start + batch_size]:
+            try:
+                dtos.append(build_uncon_experiment(parsed_row, lookups))
+            except ROW_ERRORS_CLASSES as error:
+                log_parsed_row_error(get_failed_row(parsed_row.index, parsed_row.item, error), errors_logs)
+
+        try:
+            experiment_ids.extend(persist_uncon_rows(dtos))
+            stored_dtos = dtos
+        except DatabaseError:
+            stored_dtos = []
+            for dto in dtos:
+                try:
+                    experiment_ids.extend(persist_uncon_rows([dto]))
+                    stored_dtos.append(dto)
+                except DatabaseError:
+                    errors_logs["persistence_error_log"].append(dto.parsed_row.item)
+                    logger.exception(f"row #{dto.parsed_row.index} failed to be stored")
+        success_logs["experiments"].extend(dto.parsed_row.item for dto in stored_dtos)
+        print(f"rows {start + 1}-{min(start + batch_size, len(parsed_rows))} of {len(parsed_rows)} stored")
+
+    # signals don't fire for bulk inserts
+    for start in range(0, len(experiment_ids), batch_size):
+        UnConExperiment.refresh_experiments_significance(experiment_ids[start : start + batch_size])
+    DatasetVersion.bump()
@@ -0,0 +1,203 @@
+import random
+from collections import defaultdict
+from typing import List
+
+from django.db import transaction
+from simple_history.utils import bulk_create_with_history
+
+from configuration.models import DatasetVersion
+from contrast_api.choices import StudyTypeChoices, ExperimentTypeChoices, UnConSampleChoices, PresentationModeChoices
+from studies.services.synthetic_corpus_svc import generate_synthetic_studies, skewed_choice, fan_out
+from uncontrast_studies.models import (
+    UnConExperiment,
+    UnConSpecificParadigm,
+    UnConsciousnessMeasure,
+    UnConsciousnessMeasurePhase,
+    UnConsciousnessMeasureType,
+    UnConsciousnessMeasureSubType,
+    UnConFinding,
+    UnConOutcome,
+    UnConProcessingDomain,
+    UnConProcessingMainDomain,
+    UnConSample,
+    UnConModalityType,
+    UnConStimulusCategory,
+    UnConStimulusSubCategory,
+    UnConSuppressedStimulus,
+    UnConTargetStimulus,
+    UnConSuppressionMethod,
+    UnConSuppressionMethodSubType,
+    UnConSuppressionMethodType,
+    UnConTask,
+    UnConTaskType,
+)
+
+
+class UnConConfiguration:
+    """
+    The configuration entities the synthetic experiments refer to, as created by the migrations
+    """
+
+    def __init__(self):
+        self.paradigms = list(UnConSpecificParadigm.objects.all())
+        self.consciousness_measure_phases = list(UnConsciousnessMeasurePhase.objects.all())
+        # both is synthetic, not to be used directly
+        self.consciousness_measure_types = list(UnConsciousnessMeasureType.objects.exclude(name="Both"))
+        self.consciousness_measure_sub_types = defaultdict(list)
+        for sub_type in UnConsciousnessMeasureSubType.objects.all():
+            self.consciousness_measure_sub_types[sub_type.type_id].append(sub_type)
+        self.outcomes = list(UnConOutcome.objects.all())
+        self.processing_domains = list(UnConProcessingMainDomain.objects.all())
+        self.modality_types = list(UnConModalityType.objects.all())
+        self.stimulus_categories = list(UnConStimulusCategory.objects.all())
+        self.stimulus_sub_categories = defaultdict(list)
+        for sub_category in UnConStimulusSubCategory.objects.all():
+            self.stimulus_sub_categories[sub_category.parent_id].append(sub_category)
+        self.suppression_methods = list(UnConSuppressionMethodType.objects.all())
+        self.suppression_method_sub_types = defaultdict(list)
+        for sub_type in UnConSuppressionMethodSubType.objects.all():
+            self.suppression_method_sub_types[sub_type.parent_id].append(sub_type)
+        self.task_types = list(UnConTaskType.objects.all())
+
+
+def choose_sub_type(rng: random.Random, sub_types: list):
+    return rng.choice(sub_types) if sub_types and rng.random() < 0.7 else None
+
+
+def generate_stimulus_fields(rng: random.Random, configuration: UnConConfiguration) -> dict:
+    category = skewed_choice(rng, configuration.stimulus_categories)
+    return dict(
+        category=category,
+        sub_category=choose_sub_type(rng, configuration.stimulus_sub_categories[category.id]),
+        modality=skewed_choice(rng, configuration.modality_types),
+    )
+
+
+@transaction.atomic
+def persist_uncon_experiments(
+    rng: random.Random, studies: list, count: int, configuration: UnConConfiguration
+) -> List[int]:
+    experiments = bulk_create_with_history(
+        [
+            UnConExperiment(
+                study=rng.choice(studies),
+                type=rng.choice(ExperimentTypeChoices.values),
+                paradigm=skewed_choice(rng, configuration.paradigms),
+            )
+            for _ in range(count)
+        ],
+        UnConExperiment,
+    )
+
+    related = defaultdict(list)
+    suppressed_stimuli = []
+    for experiment in experiments:
+        for _ in range(fan_out(rng, 1, 2)):
+            measure_type = rng.choice(configuration.consciousness_measure_types)
+            related[UnConsciousnessMeasure].append(
+                UnConsciousnessMeasure(
+                    experiment=experiment,
+                    phase=rng.choice(configuration.consciousness_measure_phases),
+                    type=measure_type,
+                    sub_type=choose_sub_type(rng, configuration.consciousness_measure_sub_types[measure_type.id]),
+                    number_of_trials=rng.randrange(20, 400),
+                    number_of_participants_in_awareness_test=rng.randrange(5, 60),
+                    is_cm_same_participants_as_task=rng.random() < 0.8,
+                    is_performance_above_chance=rng.choice([None, True, False]),
+                    is_trial_excluded_based_on_measure=rng.random() < 0.3,
+                )
+            )
+        for _ in range(fan_out(rng, 1, 4)):
+            related[UnConFinding].append(
+                UnConFinding(
+                    experiment=experiment,
+                    outcome=skewed_choice(rng, configuration.outcomes),
+                    is_significant=rng.random() < 0.6,
+                    is_important=rng.random() < 0.8,
+                    number_of_trials=rng.randrange(1, 500),
+                )
+            )
+        domains_count = fan_out(rng, 1, min(2, len(configuration.processing_domains)))
+        related[UnConProcessingDomain].extend(
+            UnConProcessingDomain(experiment=experiment, main=main)
+            for main in rng.sample(configuration.processing_domains, domains_count)
+        )
+        size_total = rng.randrange(8, 120)
+        size_excluded = rng.randrange(0, size_total // 4 + 1)
+        related[UnConSample].append(
+            UnConSample(
+                experiment=experiment,
+                type=skewed_choice(rng, UnConSampleChoices.values),
+                size_total=size_total,
+                size_included=size_total - size_excluded,
+                size_excluded=size_excluded,
+            )
+        )
+        for _ in range(fan_out(rng, 1, 2)):
+            method = skewed_choice(rng, configuration.suppression_methods)
+            related[UnConSuppressionMethod].append(
+                UnConSuppressionMethod(
+                    experiment=experiment,
+                    type=method,
+                    sub_type=choose_sub_type(rng, configuration.suppression_method_sub_types[method.id]),
+                )
+            )
+        related[UnConTask].extend(
+            UnConTask(experiment=experiment, type=skewed_choice(rng, configuration.task_types))
+            for _ in range(fan_out(rng, 1, 2))
+        )
+        for _ in range(fan_out(rng, 1, 2)):
+            suppressed_stimuli.append(
+                UnConSuppressedStimulus(
+                    experiment=experiment,
+                    is_target_stimulus=rng.random() < 0.7,
+                    mode_of_presentation=rng.choice(PresentationModeChoices.values),
+                    duration=rng.randrange(10, 500),
+                    soa=rng.randrange(0, 1000),
+                    number_of_stimuli=rng.randrange(1, 200),
+                    **generate_stimulus_fields(rng, configuration),
+                )
+            )
+
+    for model, instances in related.items():
+        bulk_create_with_history(instances, model)
+    suppressed_stimuli = bulk_create_with_history(suppressed_stimuli, UnConSuppressedStimulus)
+    bulk_create_with_history(
+        [
+            UnConTargetStimulus(
+                experiment_id=suppressed_stimulus.experiment_id,
+                suppressed_stimulus=suppressed_stimulus,
+                is_target_same_as_suppressed_stimulus=rng.random() < 0.3,
+                number_of_stimuli=rng.randrange(1, 200),
+                **generate_stimulus_fields(rng, configuration),
+            )
+            for suppressed_stimulus in suppressed_stimuli
+            if suppressed_stimulus.is_target_stimulus
+        ],
+        UnConTargetStimulus,
+    )
+    return [experiment.id for experiment in experiments]
+
+
+def generate_uncon_corpus(experiments_count: int, seed: int = 0, batch_size: int = 500, report=print) -> List[int]:
+    """
+    Creates approved synthetic studies with experiments_count UnConTrust experiments (about 3 per study), each with a
+    realistic fan out of findings, stimuli, measures and suppression methods, with a bulk insert per model
+    """
+    rng = random.Random(seed)
+    configuration = UnConConfiguration()
+    studies = generate_synthetic_studies(
+        rng, max(experiments_count // 3, 1), StudyTypeChoices.UNCONSCIOUSNESS, run_key=f"uncontrast.{seed}"
+    )
+
+    experiment_ids = []
+    for start in range(0, experiments_count, batch_size):
+        count = min(batch_size, experiments_count - start)
+        batch_experiment_ids = persist_uncon_experiments(rng, studies, count, configuration)
+        # signals don't fire for bulk inserts
+        UnConExperiment.refresh_experiments_significance(batch_experiment_ids)
+        experiment_ids.extend(batch_experiment_ids)
+        report(f"{len(experiment_ids)} of {experiments_count} uncontrast experiments generated")
+
+    DatasetVersion.bump()
+    return experiment_ids
@@ -1,3 +1,5 @@
+import pickle
+
 from contrast_api.tests.base import BaseTestCase
 from uncontrast_studies.parsers.consciousness_measure_parser import resolve_consciousness_measures
 from uncontrast_studies.parsers.finding_parser import resolve_uncon_findings
@@ -16,6 +18,7 @@ from uncontrast_studies.parsers.uncon_data_parsers import (
     resolve_uncon_processing_domains,
     clean_list_from_data,
 )
+from uncontrast_studies.services.staged_uncon_import import parse_row
 
 
 # Create your tests here.
@@ -69,6 +72,17 @@ class UnContrastDataMigrationParsersTestCase(BaseTestCase):
         self.assertEqual(res.main, "Attention allocation")
         self.assertEqual(res.specific, "Attention allocation")
 
+    def test_parsed_rows_can_cross_process_boundaries(self):
+        paradigm = resolve_uncon_paradigm(
+            item={"Paradigms Main paradigm": "Priming", "Paradigms Specific paradigm": "Semantic"}, index="1"
+        )
+        self.assertEqual(pickle.loads(pickle.dumps(paradigm)), paradigm)
+
+        invalid_item = {"exp": "1", "Paradigms Main paradigm": "Not a paradigm", "Paradigms Specific paradigm": ""}
+        parsed_row = pickle.loads(pickle.dumps(parse_row(index=1, item=invalid_item)))
+        self.assertIsNone(parsed_row.parsed_experiment)
+        self.assertEqual(parsed_row.log_name, "invalid_paradigm_data_log")
+
     def test_task_parser(self):
         item_1 = {"Tasks Type": "Free viewing"}
         item_2 = {"Tasks Type": "Lexical categorization; Go/No go"}
@@ -0,0 +1,49 @@
+from contrast_api.choices import StudyTypeChoices, SignificanceChoices
+from uncontrast_studies.models import UnConExperiment, UnConOutcome
+from uncontrast_studies.tests.base import UnContrastBaseTestCase
+
+
+class ExperimentSignificanceTestCase(UnContrastBaseTestCase):
+    def _given_experiment_with_findings(self, findings_significance, **kwargs):
+        study = self.given_study_exists(type=StudyTypeChoices.UNCONSCIOUSNESS)
+        main_paradigm = self.given_uncon_main_paradigm_exists("main_paradigm")
+        specific_paradigm = self.given_uncon_specific_paradigm_exists("specific_paradigm", main=main_paradigm)
+        outcome, created = UnConOutcome.objects.get_or_create(name="Reaction time")
+        findings = [
+            dict(outcome=outcome, is_significant=is_significant, is_important=is_important)
+            for is_significant, is_important in findings_significance
+        ]
+        return self.given_uncon_experiment_exists_for_study(
+            study, paradigm=specific_paradigm, findings=findings, **kwargs
+        )
+
+    def test_significance_is_refreshed_once_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            experiment = self._given_experiment_with_findings([(True, True), (True, True), (False, False)])
+            experiment.refresh_from_db()
+            self.assertEqual(experiment.significance, SignificanceChoices.MIXED)  # the default, until commit
+        history_count = experiment.history.count()
+
+        for callback in callbacks:
+            callback()
+        experiment.refresh_from_db()
+        self.assertEqual(experiment.significance, SignificanceChoices.POSITIVE)
+        self.assertEqual(experiment.history.count(), history_count)
+
+    def test_refresh_all_experiments_significance(self):
+        positive = self._given_experiment_with_findings([(True, True), (False, False)])
+        negative = self._given_experiment_with_findings([(False, True)], experiment_findings_notes="negative")
+        without_important_findings = self._given_experiment_with_findings(
+            [(False, False)], experiment_findings_notes="no important findings"
+        )
+
+        updated = UnConExperiment.refresh_experiments_significance()
+        self.assertEqual(updated, 3)
+        self.assertEqual(
+            dict(UnConExperiment.objects.values_list("id", "significance")),
+            {
+                positive.id: SignificanceChoices.POSITIVE,
+                negative.id: SignificanceChoices.NEGATIVE,
+                without_important_findings.id: SignificanceChoices.POSITIVE,
+            },
+        )
@@ -0,0 +1,94 @@
+from collections import defaultdict
+
+from contrast_api.choices import UnConSampleChoices, PresentationModeChoices
+from uncontrast_studies.models import UnConExperiment, UnConOutcome, UnConSample, UnConTargetStimulus
+from uncontrast_studies.parsers.consciousness_measure_parser import UnConResolvedConMeasure
+from uncontrast_studies.parsers.finding_parser import UnConResolvedFinding
+from uncontrast_studies.parsers.sample_parser import UnConResolvedSample
+from uncontrast_studies.parsers.stimulus_parser import UnconResolvedStimulusData
+from uncontrast_studies.parsers.suppression_method_parser import UnconResolvedSuppressionMethodData
+from uncontrast_studies.parsers.uncon_data_parsers import UnconResolvedParadigmData
+from uncontrast_studies.services.process_uncon_experiment import UnConParsedExperiment
+from uncontrast_studies.services.staged_uncon_import import ParsedRow, store_parsed_rows
+from uncontrast_studies.tests.base import UnContrastBaseTestCase
+
+
+class UnContrastStagedImportTestCase(UnContrastBaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.study = self.given_study_exists(DOI="10.1000/staged")
+        main_paradigm = self.given_uncon_main_paradigm_exists("Priming")
+        self.given_uncon_specific_paradigm_exists("Semantic", main=main_paradigm)
+        self.given_uncon_task_type_exists("Free viewing")
+        self.given_uncon_stimulus_category_type_exists("Words")
+        self.given_uncon_stimulus_modality_type_exists("Visual")
+        suppression_method = self.given_uncon_suppression_method_type_exists("Masking")
+        self.given_uncon_suppression_method_sub_type_exists("Backward pattern masking", parent=suppression_method)
+        self.given_uncon_processing_main_domain_exists("Semantic")
+        UnConOutcome.objects.get_or_create(name="Reaction time")
+        self.given_unconsciousness_measure_phase_exists("Post-experiment")
+        self.given_unconsciousness_measure_category_type_exists("Objective")
+
+    def given_parsed_row(self, index: int, doi: str, sample_type: str = UnConSampleChoices.HEALTHY_ADULTS) -> ParsedRow:
+        stimulus = UnconResolvedStimulusData("Words", None, "Visual", PresentationModeChoices.SUBLIMINAL, 30, 50, 1)
+        parsed_experiment = UnConParsedExperiment(
+            paradigm=UnconResolvedParadigmData("Priming", "Semantic"),
+            task_types=["Free viewing"],
+            sample=UnConResolvedSample(sample_type, 20, 18, 2),
+            stimuli=[(stimulus, stimulus)],
+            is_target_stimuli=True,
+            is_target_same_as_prime=True,
+            suppression_methods=[UnconResolvedSuppressionMethodData("Masking", "Backward pattern masking")],
+            processing_domains=["Semantic"],
+            findings=[UnConResolvedFinding("Reaction time", True, True, 100, "a note")],
+            consciousness_measures=[
+                UnConResolvedConMeasure("Post-experiment", "Objective", None, 40, 18, True, False, False, None)
+            ],
+        )
+        return ParsedRow(index, {"DOI": doi, "StudyID": "missing", "exp": index}, parsed_experiment, None, None)
+
+    def when_parsed_rows_are_stored(self, parsed_rows: list, batch_size: int = 100):
+        errors_logs = defaultdict(list)
+        success_logs = {"experiments": []}
+        store_parsed_rows(parsed_rows, errors_logs, success_logs, batch_size=batch_size)
+        return errors_logs, success_logs
+
+    def test_valid_rows_are_stored_with_their_related_data(self):
+        errors_logs, success_logs = self.when_parsed_rows_are_stored(
+            [self.given_parsed_row(1, self.study.DOI), self.given_parsed_row(2, self.study.DOI)]
+        )
+
+        self.assertEqual(len(success_logs["experiments"]), 2)
+        experiments = UnConExperiment.objects.filter(study=self.study)
+        self.assertEqual(experiments.count(), 2)
+        for experiment in experiments:
+            self.assertEqual(experiment.experiment_findings_notes, "a note; ")
+            self.assertEqual(experiment.tasks.count(), 1)
+            self.assertEqual(experiment.suppression_methods.get().sub_type.name, "Backward pattern masking")
+            self.assertEqual(experiment.findings.get().outcome.name, "Reaction time")
+            self.assertEqual(experiment.history.count(), 1)
+        target_stimulus = UnConTargetStimulus.objects.filter(experiment=experiments.first()).get()
+        self.assertEqual(target_stimulus.suppressed_stimulus.experiment_id, experiments.first().id)
+
+    def test_a_row_of_an_unknown_study_is_logged(self):
+        errors_logs, success_logs = self.when_parsed_rows_are_stored(
+            [self.given_parsed_row(1, "10.1000/unknown"), self.given_parsed_row(2, self.study.DOI)]
+        )
+
+        self.assertEqual(len(errors_logs["invalid_study_metadata_log"]), 1)
+        self.assertEqual(len(success_logs["experiments"]), 1)
+        self.assertEqual(UnConExperiment.objects.filter(study=self.study).count(), 1)
+
+    def test_a_batch_failing_in_the_database_is_retried_row_by_row(self):
+        # longer than the sample type column, so the batch insert fails in the database
+        failing_row = self.given_parsed_row(2, self.study.DOI, sample_type="x" * 31)
+
+        with self.assertLogs("uncontrast_studies.services.staged_uncon_import", level="ERROR"):
+            errors_logs, success_logs = self.when_parsed_rows_are_stored(
+                [self.given_parsed_row(1, self.study.DOI), failing_row, self.given_parsed_row(3, self.study.DOI)]
+            )
+
+        self.assertEqual(errors_logs["persistence_error_log"], [failing_row.item])
+        self.assertEqual(len(success_logs["experiments"]), 2)
+        self.assertEqual(UnConExperiment.objects.filter(study=self.study).count(), 2)
+        self.assertEqual(UnConSample.objects.filter(experiment__study=self.study).count(), 2)
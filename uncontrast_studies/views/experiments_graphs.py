@@ -1,4 +1,3 @@
-from django.http import HttpResponse
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
 from rest_framework.decorators import action
@@ -33,6 +32,12 @@ from uncontrast_studies.open_api_parameters import (
     breakdown_parameter_with_significance,
 )
 from contrast_api.open_api_parameters import is_csv
+from contrast_api.technical_services.csv_export import create_csv_streaming_response
+from contrast_api.technical_services.conditional_get import dataset_conditional_get, get_request_dataset_version
+from contrast_api.technical_services.graph_profiler import is_profiling_requested, profile_graph
+from contrast_api.technical_services.graphs_cache import GraphsCacheService
+from contrast_api.technical_services.telemetry import measure_phase, evaluate_graph_data
+from contrast_api.utils import cast_as_boolean
 from uncontrast_studies.processors.distribution_of_effects_across_parameters import (
     DistributionOfEffectsAcrossParametersGraphDataProcessor,
 )
@@ -70,6 +75,7 @@ class UnConExperimentsGraphsViewSet(GenericViewSet):
         study__approval_status=ApprovalChoices.APPROVED
     )
 
+    graphs_cache = GraphsCacheService(namespace="uncontrast")
     filterset_class = UnConExperimentFilter
     graph_serializers = {
         "nations_of_consciousness": NationOfConsciousnessBySignificanceGraphSerializer,
@@ -243,36 +249,53 @@ class UnConExperimentsGraphsViewSet(GenericViewSet):
         kwargs.setdefault("context", self.get_serializer_context())
         return serializer_class(instance=data, *args, **kwargs)
 
+    @dataset_conditional_get
     def graph(self, request, graph_type, many=True, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
         graph_data_processor = self.graph_processors.get(graph_type)
         if graph_data_processor is None:
             raise GraphProcessNotRegisteredException(graph_type)
 
+        is_csv_request = cast_as_boolean(request.query_params.get("is_csv", False))
+        if not is_csv_request and is_profiling_requested(request):
+            # staff only, bypasses the graphs cache so every statement of the processor is run and explained
+            queryset = self.filter_queryset(self.get_queryset())
+            profile = profile_graph(self, graph_type, graph_data_processor, queryset, request.query_params, many=many)
+            return Response(profile, status=status.HTTP_200_OK)
+
+        cache_key = None
+        if not is_csv_request:
+            cache_key = self.graphs_cache.build_key(
+                graph_type, request.query_params, get_request_dataset_version(request).version
+            )
+            cached_data = self.graphs_cache.get(cache_key)
+            if cached_data is not None:
+                return Response(cached_data, status=status.HTTP_200_OK)
+
+        queryset = self.filter_queryset(self.get_queryset())
         graph_processor = graph_data_processor(queryset, **request.query_params)
-        graph_data = graph_processor.process()
+        with measure_phase("processor_time"):
+            graph_data = graph_processor.process()
+            if not graph_processor.is_csv:
+                graph_data = evaluate_graph_data(graph_data)
         if not graph_processor.is_csv:
             serializer = self.get_serializer_by_graph_type(graph_type, data=graph_data, many=many)
+            with measure_phase("serializer_time"):
+                data = serializer.data
+            if cache_key is not None:
+                self.graphs_cache.set(cache_key, data)
 
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return Response(data, status=status.HTTP_200_OK)
         else:
             """
             we manipulate the data for csv inside the processor to return a flattened list, 
             Here we select from Experiment with all relevant prefetching and select_related for relations
-            And pass it through the import-export custom resource we've defined
+            And stream it through the import-export custom resource we've defined, batch by batch
             """
             flattened_ids = graph_data
-            dataset = FullUnConExperimentResource().export(
-                queryset=UnConExperiment.objects.related().filter(id__in=flattened_ids)
-            )
-            response = HttpResponse(
-                dataset.csv,
-                content_type="text/csv",
-                headers={"Content-Disposition": 'attachment; filename="export.csv"'},
+            return create_csv_streaming_response(
+                FullUnConExperimentResource(), queryset=UnConExperiment.objects.related().filter(id__in=flattened_ids)
             )
 
-            return response
-
 
 class GraphProcessNotRegisteredException(Exception):
     pass